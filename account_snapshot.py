@@ -0,0 +1,236 @@
+"""
+Trade Mirroring System - Account Snapshots
+One concurrent sweep of positions, orders and holdings for the master and
+every follower account, shared by all readers until the next sweep
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import config
+from latency_metrics import get_latency_recorder
+
+logger = logging.getLogger(__name__)
+
+POSITIONS = 'positions'
+ORDERS = 'orders'
+HOLDINGS = 'holdings'
+KINDS = (POSITIONS, ORDERS, HOLDINGS)
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """
+    Broker state of all accounts from one sweep
+    Fetches that missed the sweep deadline or failed (the client returned
+    None) carry the previous sweep's data and are listed in `stale` as
+    (account_id, kind)
+    """
+    sweep_id: int
+    taken_at: float  # time.time() when the sweep started
+    duration_ms: float
+    master_account_id: str
+    follower_accounts: Dict[str, str]  # follower_id -> broker account_id
+    positions: Dict[str, List] = field(default_factory=dict)
+    orders: Dict[str, List] = field(default_factory=dict)
+    holdings: Dict[str, List] = field(default_factory=dict)
+    latency_ms: Dict[str, Dict[str, float]] = field(default_factory=dict)  # account_id -> kind -> ms
+    stale: FrozenSet[Tuple[str, str]] = frozenset()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.taken_at
+
+    @property
+    def complete(self) -> bool:
+        return not self.stale
+
+    def positions_for(self, account_id: str) -> List:
+        return self.positions.get(account_id, [])
+
+    def orders_for(self, account_id: str) -> List:
+        return self.orders.get(account_id, [])
+
+    def holdings_for(self, account_id: str) -> List:
+        return self.holdings.get(account_id, [])
+
+    def follower_positions(self, follower_id: str) -> List:
+        return self.positions_for(self.follower_accounts.get(follower_id, ''))
+
+    def has(self, account_id: str, kind: str) -> bool:
+        """Fetched in this sweep (not carried over)"""
+        return account_id in getattr(self, kind) and (account_id, kind) not in self.stale
+
+
+class AccountSnapshotService:
+    """
+    Account Snapshot Service
+    Fans every (account, kind) fetch out on a thread pool and waits for all of
+    them under one shared deadline. A fetch still running from an earlier
+    sweep is not started again; its account keeps the previous data until it
+    finishes. Readers get the latest snapshot without touching the broker
+    """
+
+    def __init__(self, api_client, db_manager, master_account_id: str, deadline: float = None,
+                 interval: float = None, max_workers: int = None, kinds: Tuple[str, ...] = None):
+        self.api_client = api_client
+        self.db = db_manager
+        self.master_account_id = master_account_id
+        self.deadline = deadline or config.SNAPSHOT_DEADLINE
+        self.interval = interval or config.SNAPSHOT_INTERVAL
+        self.kinds = kinds or config.SNAPSHOT_KINDS
+        self.latency = get_latency_recorder()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or config.SNAPSHOT_WORKERS,
+                                            thread_name_prefix="AccountSnapshot")
+        self._fetchers: Dict[str, Callable] = {
+            POSITIONS: api_client.get_positions,
+            ORDERS: api_client.get_orders,
+            HOLDINGS: api_client.get_holdings,
+        }
+        self._snapshot: Optional[AccountSnapshot] = None
+        self._inflight: Dict[Tuple[str, str], object] = {}
+        self._listeners: List[Callable[[AccountSnapshot], None]] = []
+        self._sweep_lock = threading.Lock()  # one sweep at a time; concurrent callers share it
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.sweeps = 0
+
+    def add_listener(self, callback: Callable[[AccountSnapshot], None]):
+        """Called with every new snapshot (on the sweeping thread)"""
+        self._listeners.append(callback)
+
+    def current(self) -> Optional[AccountSnapshot]:
+        """Latest snapshot, or None before the first sweep"""
+        return self._snapshot
+
+    def latest(self, max_age: float = None) -> AccountSnapshot:
+        """Latest snapshot, sweeping first if there is none or it is older than max_age"""
+        max_age = self.interval if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot and snapshot.age <= max_age:
+            return snapshot
+        with self._sweep_lock:
+            # Another caller may have finished a sweep while this one waited
+            snapshot = self._snapshot
+            if snapshot and snapshot.age <= max_age:
+                return snapshot
+            return self._sweep()
+
+    def sweep(self) -> AccountSnapshot:
+        """Fetch all accounts now and publish the result"""
+        with self._sweep_lock:
+            return self._sweep()
+
+    def _accounts(self) -> Dict[str, str]:
+        followers = self.db.get_all_followers(self.master_account_id)
+        return {f['follower_id']: f['account_id'] for f in followers if f['account_id']}
+
+    def _fetch(self, kind: str, account_id: str):
+        start = time.perf_counter_ns()
+        result = self._fetchers[kind](account_id)
+        elapsed = time.perf_counter_ns() - start
+        self.latency.record(f"snapshot_{kind}", elapsed)
+        return result, elapsed / 1e6
+
+    def _sweep(self) -> AccountSnapshot:
+        started = time.time()
+        start_ns = time.perf_counter_ns()
+        follower_accounts = self._accounts()
+        accounts = [self.master_account_id] + sorted(set(follower_accounts.values()) - {self.master_account_id})
+
+        previous = self._snapshot
+        data: Dict[str, Dict[str, List]] = {kind: {} for kind in KINDS}
+        latency_ms: Dict[str, Dict[str, float]] = {account_id: {} for account_id in accounts}
+        stale = set()
+
+        futures = {}
+        for account_id in accounts:
+            for kind in self.kinds:
+                key = (account_id, kind)
+                running = self._inflight.get(key)
+                if running is not None and not running.done():
+                    stale.add(key)
+                    continue
+                future = self._executor.submit(self._fetch, kind, account_id)
+                self._inflight[key] = future
+                futures[future] = key
+
+        wait(futures, timeout=self.deadline)
+        for future, key in futures.items():
+            account_id, kind = key
+            if not future.done():
+                stale.add(key)
+                continue
+            try:
+                result, latency_ms[account_id][kind] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching {kind} for {account_id}: {str(e)}")
+                stale.add(key)
+                continue
+            if result is None:
+                # Client reported a failed request; an empty list would read as a flat account
+                stale.add(key)
+                continue
+            data[kind][account_id] = result
+
+        # Late or failed fetches keep what the previous sweep had
+        for account_id, kind in stale:
+            if previous and account_id in getattr(previous, kind):
+                data[kind][account_id] = getattr(previous, kind)[account_id]
+
+        self.sweeps += 1
+        snapshot = AccountSnapshot(
+            sweep_id=self.sweeps,
+            taken_at=started,
+            duration_ms=(time.perf_counter_ns() - start_ns) / 1e6,
+            master_account_id=self.master_account_id,
+            follower_accounts=follower_accounts,
+            positions=data[POSITIONS],
+            orders=data[ORDERS],
+            holdings=data[HOLDINGS],
+            latency_ms=latency_ms,
+            stale=frozenset(stale),
+        )
+        self._snapshot = snapshot
+        self.latency.record('snapshot_sweep', time.perf_counter_ns() - start_ns)
+        if stale:
+            logger.warning(f"Snapshot {snapshot.sweep_id}: {len(stale)} of {len(accounts) * len(self.kinds)} "
+                           f"fetches missed the {self.deadline}s deadline or failed")
+
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Error in snapshot listener: {str(e)}")
+        return snapshot
+
+    def start(self):
+        """Sweep every `interval` seconds on a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="AccountSnapshotService", daemon=True)
+        self._thread.start()
+        logger.info("✓ Account snapshot service started")
+
+    def stop(self):
+        """Stop background sweeps"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.deadline + 5)
+        self._executor.shutdown(wait=False)
+        logger.info("✓ Account snapshot service stopped")
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Error sweeping account snapshots: {str(e)}")
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
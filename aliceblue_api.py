@@ -1,14 +1,20 @@
 import os
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Optional, Dict, List
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import asyncio
 from aiohttp import ClientSession
+from latency_metrics import get_latency_recorder
+from models import Order, Position
+from profiler import get_profiler
+from serialization import get_serializer
+import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -18,12 +24,33 @@ class AliceBlueAPIClient:
     Handles all API communication with AliceBlue platform
     """
 
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, base_url: str = None):
         self.api_key = api_key
         self.api_secret = api_secret
-        self.base_url = "https://aliceblueonline.com/api/"
+        self.base_url = base_url or config.ALICEBLUE_API_ENDPOINT
         self.session = None
         self.access_token = None
+        self.latency = get_latency_recorder()
+        self.serializer = get_serializer()
+        # Pooled keep-alive connections; the session carries the auth header so calls never rebuild it
+        self.http = self._new_session(config.HTTP_POOL_SIZE)
+        # Follower accounts with their own session token get their own pooled session
+        self.account_sessions: Dict[str, requests.Session] = {}
+
+    def _new_session(self, pool_size: int, token: str = None) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Content-Type'] = 'application/json'
+        if token:
+            session.headers['Authorization'] = f"Bearer {token}"
+        session.hooks['response'].append(get_profiler().http_hook(self.base_url))
+        return session
+
+    def _session(self, account_id: str) -> requests.Session:
+        """The account's own session when it has a token, else the master session"""
+        return self.account_sessions.get(account_id, self.http)
 
     async def initialize(self):
         """Initialize async session"""
@@ -45,11 +72,11 @@ class AliceBlueAPIClient:
                 "apikey": self.api_key,
                 "apisecret": self.api_secret
             }
-            response = requests.post(auth_url, json=payload, timeout=30)
+            response = self.http.post(auth_url, data=self.serializer.dumps(payload), timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
-                self.access_token = data.get('access_token', data.get('token'))
+                data = self.serializer.loads(response.content)
+                self.set_access_token(data.get('access_token', data.get('token')))
                 logger.info("✓ Authentication successful")
                 return True
             else:
@@ -63,11 +90,10 @@ class AliceBlueAPIClient:
         """Get master account details"""
         try:
             url = f"{self.base_url}account/{account_id}"
-            headers = self._get_headers()
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session(account_id).get(url, timeout=30)
             
             if response.status_code == 200:
-                return response.json()
+                return self.serializer.loads(response.content)
             else:
                 logger.error(f"Failed to get account details: {response.text}")
                 return None
@@ -75,58 +101,63 @@ class AliceBlueAPIClient:
             logger.error(f"Error getting account details: {str(e)}")
             return None
 
-    def get_positions(self, account_id: str) -> List[Dict]:
-        """Get current positions for master account"""
+    def get_positions(self, account_id: str) -> Optional[List[Position]]:
+        """Get current positions for master account (None if the request failed)"""
         try:
             url = f"{self.base_url}positions/{account_id}"
-            headers = self._get_headers()
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session(account_id).get(url, timeout=30)
             
             if response.status_code == 200:
-                return response.json().get('positions', [])
+                return self.serializer.decode_models(response.content, 'positions', Position)
             else:
                 logger.error(f"Failed to get positions: {response.text}")
-                return []
+                return None
         except Exception as e:
             logger.error(f"Error getting positions: {str(e)}")
-            return []
+            return None
 
-    def get_orders(self, account_id: str, status: str = "all") -> List[Dict]:
-        """Get orders history"""
+    def get_orders(self, account_id: str, status: str = "all") -> Optional[List[Order]]:
+        """Get orders history (None if the request failed)"""
         try:
             url = f"{self.base_url}orders/{account_id}?status={status}"
-            headers = self._get_headers()
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session(account_id).get(url, timeout=30)
             
             if response.status_code == 200:
-                return response.json().get('orders', [])
+                return self.serializer.decode_models(response.content, 'orders', Order)
             else:
                 logger.error(f"Failed to get orders: {response.text}")
-                return []
+                return None
         except Exception as e:
             logger.error(f"Error getting orders: {str(e)}")
-            return []
+            return None
 
-    def place_order(self, account_id: str, order_params: Dict) -> Optional[Dict]:
+    def place_order(self, account_id: str, order_params: Dict) -> Optional[Order]:
         """
         Place an order on follower account
         
         Args:
             account_id: Follower account ID
-            order_params: Order parameters {symbol, side, quantity, price, order_type, etc}
+            order_params: Order (or dict) {symbol, side, quantity, price, order_type, etc}
         """
         try:
             url = f"{self.base_url}orders/place"
-            headers = self._get_headers()
             payload = {
                 "account_id": account_id,
                 **order_params
             }
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            send_start = time.perf_counter_ns()
+            response = self._session(account_id).post(url, data=self.serializer.dumps(payload), timeout=30)
+            total_ns = time.perf_counter_ns() - send_start
+
+            # elapsed covers request sent → response headers (broker ack), the rest is client-side send overhead
+            ack_ns = int(response.elapsed.total_seconds() * 1e9)
+            self.latency.record('broker_ack', ack_ns)
+            self.latency.record('http_send', max(total_ns - ack_ns, 0))
             
             if response.status_code in [200, 201]:
-                logger.info(f"✓ Order placed: {order_params['symbol']}")
-                return response.json()
+                logger.info("✓ Order placed: %s", order_params['symbol'],
+                            extra={'event': 'order_placed', 'account_id': account_id})
+                return Order.from_api(self.serializer.loads(response.content))
             else:
                 logger.error(f"Failed to place order: {response.text}")
                 return None
@@ -134,20 +165,19 @@ class AliceBlueAPIClient:
             logger.error(f"Error placing order: {str(e)}")
             return None
 
-    def modify_order(self, account_id: str, order_id: str, modifications: Dict) -> Optional[Dict]:
+    def modify_order(self, account_id: str, order_id: str, modifications: Dict) -> Optional[Order]:
         """Modify existing order"""
         try:
             url = f"{self.base_url}orders/{order_id}/modify"
-            headers = self._get_headers()
             payload = {
                 "account_id": account_id,
                 **modifications
             }
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._session(account_id).post(url, data=self.serializer.dumps(payload), timeout=30)
             
             if response.status_code in [200, 201]:
-                logger.info(f"✓ Order modified: {order_id}")
-                return response.json()
+                logger.info("✓ Order modified: %s", order_id, extra={'event': 'order_modified'})
+                return Order.from_api(self.serializer.loads(response.content))
             else:
                 logger.error(f"Failed to modify order: {response.text}")
                 return None
@@ -159,12 +189,11 @@ class AliceBlueAPIClient:
         """Cancel an order"""
         try:
             url = f"{self.base_url}orders/{order_id}/cancel"
-            headers = self._get_headers()
             payload = {"account_id": account_id}
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._session(account_id).post(url, data=self.serializer.dumps(payload), timeout=30)
             
             if response.status_code in [200, 201]:
-                logger.info(f"✓ Order cancelled: {order_id}")
+                logger.info("✓ Order cancelled: %s", order_id, extra={'event': 'order_cancelled'})
                 return True
             else:
                 logger.error(f"Failed to cancel order: {response.text}")
@@ -173,25 +202,48 @@ class AliceBlueAPIClient:
             logger.error(f"Error cancelling order: {str(e)}")
             return False
 
-    def get_holdings(self, account_id: str) -> List[Dict]:
-        """Get account holdings/portfolio"""
+    def get_holdings(self, account_id: str) -> Optional[List[Dict]]:
+        """Get account holdings/portfolio (None if the request failed)"""
         try:
             url = f"{self.base_url}holdings/{account_id}"
-            headers = self._get_headers()
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session(account_id).get(url, timeout=30)
             
             if response.status_code == 200:
-                return response.json().get('holdings', [])
+                return self.serializer.loads(response.content).get('holdings', [])
             else:
                 logger.error(f"Failed to get holdings: {response.text}")
-                return []
+                return None
         except Exception as e:
             logger.error(f"Error getting holdings: {str(e)}")
-            return []
-
-    def _get_headers(self) -> Dict:
-        """Get headers with authentication token"""
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+            return None
+
+    def set_access_token(self, token: Optional[str]):
+        """Use a session token (from authenticate or the credential vault) for all further calls"""
+        self.access_token = token
+        if token:
+            self.http.headers['Authorization'] = f"Bearer {token}"
+        else:
+            self.http.headers.pop('Authorization', None)
+
+    def set_account_token(self, account_id: str, token: Optional[str]):
+        """Send calls for one (follower) account with its own token over its own pooled session"""
+        # Child orders of one account go out on up to ORDER_WORKER_THREADS workers at once
+        pool_size = max(config.HTTP_ACCOUNT_POOL_SIZE, config.ORDER_WORKER_THREADS)
+        if token:
+            old_session = self.account_sessions.get(account_id)
+            self.account_sessions[account_id] = self._new_session(pool_size, token)
+        else:
+            old_session = self.account_sessions.pop(account_id, None)
+        # Closed only once swapped out: in-flight calls may still hold it
+        if old_session:
+            old_session.close()
+
+    def logout(self, account_id: str = None):
+        """Drop session tokens and close pooled connections (one account's, or all)"""
+        if account_id is not None:
+            self.set_account_token(account_id, None)
+            return
+        for account in list(self.account_sessions):
+            self.set_account_token(account, None)
+        self.set_access_token(None)
+        self.http.close()
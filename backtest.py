@@ -0,0 +1,291 @@
+"""
+Trade Mirroring System - Copy-Trading Backtest
+Replays a master's historical order stream against every follower at once
+"""
+
+import argparse
+import csv
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+import config
+from database import DatabaseManager
+from pnl_engine import side_sign
+
+logger = logging.getLogger(__name__)
+
+BLOCK_REASONS = ('daily_loss', 'exposure', 'account_cap')
+
+
+def _timestamp(value) -> np.datetime64:
+    if isinstance(value, datetime):
+        return np.datetime64(value, 'ms')
+    return np.datetime64(datetime.fromisoformat(str(value).strip()), 'ms')
+
+
+class Backtester:
+    """
+    Copy-Trading Backtester
+    Mirrors each master order to all followers in one vectorized step: the
+    book is a followers × symbols NumPy array, quantities follow
+    lot_multiplier exactly as the engine sizes them, and the risk_management
+    limits decide what is blocked. Every master order fills at its price
+    (or the last known price for market orders); MODIFY and CANCEL events
+    are ignored. Between orders the book is marked to market against the
+    forward-filled price history in one matrix product, which gives each
+    follower's equity curve at every order and price timestamp
+
+    Risk rules (a limit of 0 or None is disabled):
+        daily_loss_limit         block while equity is this far below the day's opening equity
+        max_exposure_per_symbol  block trades that grow the open symbol position beyond this value
+        per_account_cap          block single orders worth more than this
+    """
+
+    def __init__(self, db_manager: DatabaseManager, master_account_id: str):
+        self.db = db_manager
+        self.master_account_id = master_account_id
+
+    # ---- inputs ------------------------------------------------------------
+
+    def load_followers(self, overrides: Dict[str, Dict] = None) -> List[Dict]:
+        """
+        Followers with their multiplier, capital and risk limits
+        overrides: {follower_id: {lot_multiplier/daily_loss_limit/...: value}}
+        to try alternative settings without touching the database
+        """
+        limits = self.db.get_risk_limits(self.master_account_id)
+        followers = []
+        for follower in self.db.get_all_followers(self.master_account_id):
+            follower_id = follower['follower_id']
+            risk = limits.get(follower_id, {})
+            settings = {
+                'follower_id': follower_id,
+                'account_name': follower['account_name'],
+                'lot_multiplier': follower['lot_multiplier'] or 1.0,
+                'capital': follower['investment_amount'] or 0,
+                'daily_loss_limit': risk.get('daily_loss_limit') or 0,
+                'max_exposure_per_symbol': risk.get('max_exposure_per_symbol') or 0,
+                'per_account_cap': risk.get('per_account_cap') or 0,
+            }
+            settings.update((overrides or {}).get(follower_id, {}))
+            followers.append(settings)
+        return followers
+
+    def load_orders_from_trades(self, start: str = None, end: str = None) -> List[Dict]:
+        """Master order stream reconstructed from the trades table"""
+        return self.db.get_master_orders(self.master_account_id, start, end)
+
+    @staticmethod
+    def load_orders_csv(filename: str, start: datetime = None) -> List[Dict]:
+        """
+        Master orders from CSV with a timestamp column, or the replay
+        benchmark format (offset_ms, action) offset from start (default now)
+        """
+        start = np.datetime64(start or datetime.now(), 'ms')
+        orders = []
+        with open(filename, newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('action', 'PLACE').upper() != 'PLACE':
+                    continue
+                if row.get('timestamp'):
+                    timestamp = _timestamp(row['timestamp'])
+                else:
+                    timestamp = start + np.timedelta64(int(row['offset_ms']), 'ms')
+                orders.append({
+                    'order_id': row.get('order_id'),
+                    'timestamp': timestamp,
+                    'symbol': row['symbol'],
+                    'side': row['side'],
+                    'quantity': float(row['quantity']),
+                    'price': float(row['price'] or 0),
+                    'order_type': row.get('order_type', 'MARKET'),
+                })
+        return orders
+
+    @staticmethod
+    def load_prices_csv(filename: str) -> List[Dict]:
+        """Price history from CSV with timestamp, symbol and price (or ltp/close) columns"""
+        prices = []
+        with open(filename, newline='') as f:
+            for row in csv.DictReader(f):
+                price = row.get('price') or row.get('ltp') or row.get('close')
+                prices.append({'timestamp': _timestamp(row['timestamp']), 'symbol': row['symbol'],
+                               'price': float(price)})
+        return prices
+
+    # ---- simulation ----------------------------------------------------------
+
+    def run(self, orders: List[Dict], prices: List[Dict] = None, overrides: Dict[str, Dict] = None) -> Dict:
+        """
+        Simulate mirroring orders to every follower
+        Returns: {'times', 'symbols', 'equity' (times × followers), 'followers': {follower_id: summary}}
+        """
+        followers = self.load_followers(overrides)
+        if not followers or not orders:
+            logger.warning("Backtest needs at least one follower and one master order")
+            return {'times': np.array([], dtype='datetime64[ms]'), 'symbols': [],
+                    'equity': np.zeros((0, len(followers))), 'followers': {}}
+        prices = prices or []
+        orders = sorted(orders, key=lambda order: _timestamp(order['timestamp']))
+
+        multiplier = np.array([f['lot_multiplier'] for f in followers], dtype=float)
+        capital = np.array([f['capital'] for f in followers], dtype=float)
+        loss_limit = np.array([f['daily_loss_limit'] or 0 for f in followers], dtype=float)
+        exposure_limit = np.array([f['max_exposure_per_symbol'] or 0 for f in followers], dtype=float)
+        account_cap = np.array([f['per_account_cap'] or 0 for f in followers], dtype=float)
+
+        symbols = sorted({o['symbol'] for o in orders} | {p['symbol'] for p in prices})
+        column = {symbol: i for i, symbol in enumerate(symbols)}
+        order_times = np.array([_timestamp(o['timestamp']) for o in orders], dtype='datetime64[ms]')
+        price_times = np.array([p['timestamp'] for p in prices], dtype='datetime64[ms]')
+        times = np.unique(np.concatenate([order_times, price_times]))
+        days = times.astype('datetime64[D]')
+        order_rows = np.searchsorted(times, order_times)
+
+        marks = self._price_matrix(times, symbols, column, prices, orders, order_rows)
+
+        positions = np.zeros((len(followers), len(symbols)))
+        cash = np.zeros(len(followers))
+        equity = np.empty((len(times), len(followers)))
+        trades = np.zeros(len(followers), dtype=int)
+        blocked = {reason: np.zeros(len(followers), dtype=int) for reason in BLOCK_REASONS}
+        day_open = capital.copy()
+        current_day = days[0]
+        marked = 0  # equity rows before this index are final
+
+        for order, row in zip(orders, order_rows):
+            if row > marked:
+                equity[marked:row] = capital + cash + marks[marked:row] @ positions.T
+                marked = row
+            if days[row] != current_day:
+                current_day = days[row]
+                first = np.searchsorted(days, current_day)
+                day_open = equity[first - 1] if first else capital.copy()
+
+            col = column[order['symbol']]
+            fill_price = order.get('price') or marks[row, col]
+            quantity = np.floor(np.maximum(float(order['quantity']) * multiplier, 1))
+            signed = side_sign(order['side']) * quantity
+
+            current = capital + cash + positions @ marks[row]
+            held = positions[:, col]
+            projected = np.abs(held + signed)
+
+            over_loss = (loss_limit > 0) & (day_open - current >= loss_limit)
+            over_exposure = ((exposure_limit > 0) & (projected > np.abs(held))
+                             & (projected * fill_price > exposure_limit) & ~over_loss)
+            over_cap = (account_cap > 0) & (quantity * fill_price > account_cap) & ~over_loss & ~over_exposure
+            allowed = ~(over_loss | over_exposure | over_cap)
+
+            for reason, mask in zip(BLOCK_REASONS, (over_loss, over_exposure, over_cap)):
+                blocked[reason] += mask
+            fill = np.where(allowed, signed, 0)
+            positions[:, col] += fill
+            cash -= fill * fill_price
+            trades += allowed
+
+        equity[marked:] = capital + cash + marks[marked:] @ positions.T
+
+        peak = np.maximum.accumulate(equity, axis=0)
+        drawdown = peak - equity
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown_pct = np.where(peak > 0, drawdown / peak * 100, 0)
+
+        summaries = {}
+        for j, follower in enumerate(followers):
+            summaries[follower['follower_id']] = {
+                **follower,
+                'trades': int(trades[j]),
+                'blocked': {reason: int(blocked[reason][j]) for reason in BLOCK_REASONS},
+                'blocked_total': int(sum(blocked[reason][j] for reason in BLOCK_REASONS)),
+                'final_pnl': float(equity[-1, j] - capital[j]),
+                'max_drawdown': float(drawdown[:, j].max()),
+                'max_drawdown_pct': float(drawdown_pct[:, j].max()),
+                'equity_curve': equity[:, j],
+            }
+
+        logger.info(f"✓ Backtest complete: {len(orders)} master orders × {len(followers)} followers")
+        return {'times': times, 'symbols': symbols, 'equity': equity, 'followers': summaries}
+
+    @staticmethod
+    def _price_matrix(times: np.ndarray, symbols: List[str], column: Dict[str, int], prices: List[Dict],
+                      orders: List[Dict], order_rows: np.ndarray) -> np.ndarray:
+        """times × symbols marks: price history, gaps filled by order prices, then forward-filled"""
+        marks = np.full((len(times), len(symbols)), np.nan)
+        for order, row in zip(orders, order_rows):
+            if order.get('price'):
+                marks[row, column[order['symbol']]] = order['price']
+        if prices:
+            rows = np.searchsorted(times, np.array([p['timestamp'] for p in prices], dtype='datetime64[ms]'))
+            cols = np.array([column[p['symbol']] for p in prices])
+            marks[rows, cols] = [p['price'] for p in prices]
+
+        # Forward fill: index of the last known row per column
+        known = np.where(np.isnan(marks), 0, np.arange(len(times))[:, None])
+        np.maximum.accumulate(known, axis=0, out=known)
+        marks = marks[known, np.arange(len(symbols))]
+        return np.nan_to_num(marks)  # symbols not priced yet carry no position
+
+
+def export_equity_curves(result: Dict, filename: str) -> bool:
+    """Write one row per timestamp with an equity column per follower"""
+    try:
+        follower_ids = list(result['followers'])
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', *follower_ids])
+            for timestamp, row in zip(result['times'], result['equity']):
+                writer.writerow([str(timestamp), *(f"{value:.2f}" for value in row)])
+        logger.info(f"✓ Equity curves exported to {filename}")
+        return True
+    except Exception as e:
+        logger.error(f"Error exporting equity curves: {str(e)}")
+        return False
+
+
+def _parse_overrides(values: List[str]) -> Dict[str, Dict]:
+    """FOLLOWER_ID:key=value → {follower_id: {key: float(value)}}"""
+    overrides = {}
+    for value in values or []:
+        follower_id, setting = value.split(':', 1)
+        key, number = setting.split('=', 1)
+        overrides.setdefault(follower_id, {})[key] = float(number)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest copy-trading outcomes per follower")
+    parser.add_argument('--master', required=True, help="master account ID")
+    parser.add_argument('--db', default=config.DATABASE_PATH, help="database path")
+    parser.add_argument('--orders', help="master order CSV (default: reconstruct from the trades table)")
+    parser.add_argument('--prices', help="price history CSV (timestamp, symbol, price)")
+    parser.add_argument('--start', help="first entry_time when reading the trades table")
+    parser.add_argument('--end', help="entry_time upper bound when reading the trades table")
+    parser.add_argument('--set', action='append', metavar='FOLLOWER:KEY=VALUE',
+                        help="override a follower setting, e.g. F1:lot_multiplier=1.5 (repeatable)")
+    parser.add_argument('--output', help="write equity curves to CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    backtester = Backtester(DatabaseManager(args.db), args.master)
+    if args.orders:
+        orders = backtester.load_orders_csv(args.orders)
+    else:
+        orders = backtester.load_orders_from_trades(args.start, args.end)
+    prices = backtester.load_prices_csv(args.prices) if args.prices else None
+    result = backtester.run(orders, prices, _parse_overrides(args.set))
+
+    print(f"{'follower':<24} {'mult':>5} {'trades':>7} {'blocked':>8} {'P&L':>12} {'max DD':>12} {'DD %':>7}")
+    for follower_id, summary in result['followers'].items():
+        print(f"{follower_id:<24} {summary['lot_multiplier']:>5.2f} {summary['trades']:>7} "
+              f"{summary['blocked_total']:>8} {summary['final_pnl']:>12.2f} "
+              f"{summary['max_drawdown']:>12.2f} {summary['max_drawdown_pct']:>7.2f}")
+    if args.output:
+        export_equity_curves(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Trade Mirroring System - Fake AliceBlue Server
+Local stub of the AliceBlue REST endpoints used by AliceBlueAPIClient,
+with configurable latency, error rate and per-account throttling
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class FakeBrokerState:
+    """In-memory order books shared by all request handler threads"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 throttle_rps: float = 0, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rps = throttle_rps
+        self.random = random.Random(seed)
+        self.orders: Dict[str, Dict[str, Dict]] = {}
+        self.positions: Dict[str, Dict[str, Dict]] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.throttled_count = 0
+        self.error_count = 0
+        self._throttles: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+    def delay(self):
+        """Simulated network + broker processing latency"""
+        if self.latency_ms or self.jitter_ms:
+            with self._lock:
+                jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+            return failed
+
+    def is_throttled(self, account_id: str) -> bool:
+        if not self.throttle_rps:
+            return False
+        with self._lock:
+            limiter = self._throttles.setdefault(account_id, RateLimiter(self.throttle_rps))
+        throttled = not limiter.acquire(timeout=0)
+        if throttled:
+            with self._lock:
+                self.throttled_count += 1
+        return throttled
+
+    def place_order(self, payload: Dict) -> Dict:
+        order_id = uuid.uuid4().hex[:16]
+        account_id = str(payload.get('account_id'))
+        quantity = payload.get('quantity', 0)
+        order = {
+            'order_id': order_id,
+            'symbol': payload.get('symbol'),
+            'side': payload.get('side'),
+            'quantity': quantity,
+            'filled_quantity': quantity,
+            'price': payload.get('price', 0),
+            'order_type': payload.get('order_type'),
+            'order_tag': payload.get('order_tag'),
+            'status': 'complete',
+        }
+        with self._lock:
+            self.orders.setdefault(account_id, {})[order_id] = order
+            position = self.positions.setdefault(account_id, {}).setdefault(
+                order['symbol'], {'symbol': order['symbol'], 'quantity': 0, 'price': order['price']}
+            )
+            sign = 1 if str(order['side']).upper() == 'BUY' else -1
+            position['quantity'] += sign * quantity
+        return {'order_id': order_id, 'status': 'complete'}
+
+    def modify_order(self, order_id: str, payload: Dict) -> Optional[Dict]:
+        with self._lock:
+            order = self.orders.get(str(payload.get('account_id')), {}).get(order_id)
+            if order is None:
+                return None
+            for key in ('quantity', 'price', 'order_type'):
+                if key in payload:
+                    order[key] = payload[key]
+            return {'order_id': order_id, 'status': order['status']}
+
+    def cancel_order(self, order_id: str, payload: Dict) -> bool:
+        with self._lock:
+            order = self.orders.get(str(payload.get('account_id')), {}).get(order_id)
+            if order is None:
+                return False
+            if order['status'] != 'complete':
+                order['status'] = 'cancelled'
+            return True
+
+    def get_orders(self, account_id: str) -> List[Dict]:
+        with self._lock:
+            return [dict(order) for order in self.orders.get(account_id, {}).values()]
+
+    def get_positions(self, account_id: str) -> List[Dict]:
+        with self._lock:
+            return [dict(position) for position in self.positions.get(account_id, {}).values()]
+
+
+class FakeAliceBlueHandler(BaseHTTPRequestHandler):
+    """Routes the subset of /api/ endpoints used by AliceBlueAPIClient"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    state: FakeBrokerState = None
+
+    ROUTES = [
+        ('POST', re.compile(r'^/api/authenticate$'), 'authenticate'),
+        ('POST', re.compile(r'^/api/orders/place$'), 'place_order'),
+        ('POST', re.compile(r'^/api/orders/(?P<order_id>[^/]+)/modify$'), 'modify_order'),
+        ('POST', re.compile(r'^/api/orders/(?P<order_id>[^/]+)/cancel$'), 'cancel_order'),
+        ('GET', re.compile(r'^/api/orders/(?P<account_id>[^/]+)$'), 'get_orders'),
+        ('GET', re.compile(r'^/api/positions/(?P<account_id>[^/]+)$'), 'get_positions'),
+        ('GET', re.compile(r'^/api/holdings/(?P<account_id>[^/]+)$'), 'get_holdings'),
+        ('GET', re.compile(r'^/api/account/(?P<account_id>[^/]+)$'), 'get_account'),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str):
+        path = urlparse(self.path).path
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(path) if route_method == method else None
+            if match:
+                break
+        else:
+            self._send(404, {'error': 'not found'})
+            return
+
+        payload = self._read_json() if method == 'POST' else {}
+        params = match.groupdict()
+        account_id = params.get('account_id') or str(payload.get('account_id', ''))
+
+        self.state.count(name)
+        self.state.delay()
+
+        if name != 'authenticate' and self.state.is_throttled(account_id):
+            self._send(429, {'error': 'rate limit exceeded'})
+            return
+        if self.state.should_fail():
+            self._send(500, {'error': 'simulated broker error'})
+            return
+
+        if name == 'authenticate':
+            self._send(200, {'access_token': uuid.uuid4().hex})
+        elif name == 'place_order':
+            self._send(200, self.state.place_order(payload))
+        elif name == 'modify_order':
+            result = self.state.modify_order(params['order_id'], payload)
+            self._send(200 if result else 404, result or {'error': 'unknown order'})
+        elif name == 'cancel_order':
+            cancelled = self.state.cancel_order(params['order_id'], payload)
+            self._send(200 if cancelled else 404, {'cancelled': cancelled})
+        elif name == 'get_orders':
+            self._send(200, {'orders': self.state.get_orders(account_id)})
+        elif name == 'get_positions':
+            self._send(200, {'positions': self.state.get_positions(account_id)})
+        elif name == 'get_holdings':
+            self._send(200, {'holdings': []})
+        elif name == 'get_account':
+            self._send(200, {'account_id': account_id, 'status': 'active'})
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, body: Dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeAliceBlueServer:
+    """
+    Fake AliceBlue Server
+    Runs a threaded HTTP server on localhost in a background thread
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, **state_options):
+        self.state = FakeBrokerState(**state_options)
+        handler = type('BoundFakeAliceBlueHandler', (FakeAliceBlueHandler,), {'state': self.state})
+        # The default listen backlog of 5 drops connections under concurrent sweeps (1s SYN retry)
+        server_cls = type('FakeAliceBlueHTTPServer', (ThreadingHTTPServer,), {'request_queue_size': 128})
+        self.httpd = server_cls((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self) -> 'FakeAliceBlueServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="FakeAliceBlue", daemon=True)
+        self._thread.start()
+        logger.info(f"✓ Fake AliceBlue server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local fake AliceBlue API server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--jitter-ms', type=float, default=5)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--throttle-rps', type=float, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeAliceBlueServer(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                 error_rate=args.error_rate, throttle_rps=args.throttle_rps)
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,113 @@
+"""
+Trade Mirroring System - JSON Benchmark
+Parse time per call for recorded broker responses (data/orders_response.json,
+data/positions_response.json) with each available serializer: full decode as
+response.json() does, and decode plus field extraction into the models as
+AliceBlueAPIClient does. Also times encoding an order payload
+
+Usage:
+    python benchmarks/json_benchmark.py
+    python benchmarks/json_benchmark.py --payload orders:my_orderbook.json --number 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Dict, List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from models import Order, Position
+from serialization import SERIALIZERS
+
+DATA_DIR = os.path.join(BENCHMARK_DIR, 'data')
+PAYLOADS = {
+    'orders': os.path.join(DATA_DIR, 'orders_response.json'),
+    'positions': os.path.join(DATA_DIR, 'positions_response.json'),
+}
+MODELS = {'orders': Order, 'positions': Position}
+
+ORDER_PAYLOAD = {
+    'account_id': 'AB123456', 'symbol': 'NIFTY26OCT25000CE', 'side': 'BUY', 'quantity': 75,
+    'price': 182.35, 'order_type': 'LIMIT', 'order_tag': '5f0c6a1e9b2d4c7f8e3a1b6d9c0e2f4a',
+}
+
+
+def available_serializers() -> Dict:
+    serializers = {}
+    for name, serializer_cls in SERIALIZERS.items():
+        try:
+            serializers[name] = serializer_cls()
+        except ImportError:
+            print(f"({name} not installed, skipped)")
+    return serializers
+
+
+def per_call_us(fn, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(payloads: Dict[str, str], number: int) -> List[Dict]:
+    serializers = available_serializers()
+    rows = []
+    for key, path in payloads.items():
+        with open(path, 'rb') as f:
+            content = f.read()
+        model_cls = MODELS.get(key)
+        items = len(json.loads(content).get(key) or [])
+        # What requests' response.json() does for a UTF-8 body
+        rows.append({'payload': key, 'items': items, 'bytes': len(content), 'serializer': 'response.json()',
+                     'decode_us': per_call_us(lambda: json.loads(content.decode('utf-8')), number),
+                     'models_us': None})
+        for name, serializer in serializers.items():
+            rows.append({
+                'payload': key, 'items': items, 'bytes': len(content), 'serializer': name,
+                'decode_us': per_call_us(lambda: serializer.loads(content), number),
+                'models_us': (per_call_us(lambda: serializer.decode_models(content, key, model_cls), number)
+                              if model_cls else None),
+            })
+
+    encode_number = number * 100
+    rows.append({'payload': 'place_order body', 'items': 1, 'bytes': len(json.dumps(ORDER_PAYLOAD)),
+                 'serializer': 'requests json=', 'models_us': None,
+                 'decode_us': per_call_us(lambda: json.dumps(ORDER_PAYLOAD, allow_nan=False).encode('utf-8'),
+                                          encode_number)})
+    for name, serializer in serializers.items():
+        rows.append({'payload': 'place_order body', 'items': 1, 'bytes': len(serializer.dumps(ORDER_PAYLOAD)),
+                     'serializer': name, 'models_us': None,
+                     'decode_us': per_call_us(lambda: serializer.dumps(ORDER_PAYLOAD), encode_number)})
+    return rows
+
+
+def print_results(rows: List[Dict]):
+    print(f"{'payload':<18} {'items':>6} {'KB':>7} {'serializer':<16} {'parse µs':>10} {'+models µs':>11}")
+    print("-" * 73)
+    for row in rows:
+        models = f"{row['models_us']:>11.1f}" if row['models_us'] is not None else f"{'-':>11}"
+        label = 'encode µs' if row['payload'] == 'place_order body' else ''
+        print(f"{row['payload']:<18} {row['items']:>6} {row['bytes'] / 1024:>7.1f} {row['serializer']:<16} "
+              f"{row['decode_us']:>10.1f} {models} {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark broker JSON decoding")
+    parser.add_argument('--payload', action='append', default=[],
+                        help="KEY:FILE recorded response whose list sits under KEY (orders, positions, ...)")
+    parser.add_argument('--number', type=int, default=100, help="calls per timing run")
+    parser.add_argument('--output', help="write results to JSON")
+    args = parser.parse_args()
+
+    payloads = dict(item.split(':', 1) for item in args.payload) if args.payload else PAYLOADS
+    rows = run(payloads, args.number)
+    print_results(rows)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Trade Mirroring System - Models Benchmark
+Compares dict rows (dict(sqlite3.Row) / raw JSON dicts) with the slotted
+models in models.py: memory per record, fetch throughput through the row
+factory, field access in a hot loop and broker payload parsing
+
+Usage:
+    python benchmarks/models_benchmark.py
+    python benchmarks/models_benchmark.py --rows 200000 --output models.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from database import DatabaseManager
+from models import Order, Position, Trade, row_factory
+
+SYMBOLS = ['RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK', 'SBIN', 'ITC', 'LT']
+
+
+def build_database(rows: int) -> str:
+    """Temporary trades database with `rows` trades spread over 100 followers"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix='models_bench_'), 'trades.db')
+    DatabaseManager(db_path)
+    rng = random.Random(7)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO trades (master_account_id, follower_account_id, symbol, side, quantity, price, order_type,
+                            order_id, follower_order_id, master_order_id, status, filled_quantity, pnl)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        ('BENCH_MASTER', f"F{i % 100}", rng.choice(SYMBOLS), rng.choice(['BUY', 'SELL']), rng.randint(1, 500),
+         round(rng.uniform(100, 4000), 2), 'MARKET', f"O{i}", f"O{i}", f"M{i // 100}", 'filled',
+         rng.randint(1, 500), round(rng.uniform(-500, 500), 2))
+        for i in range(rows)
+    ])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def fetch_dicts(db_path: str) -> List[Dict]:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = [dict(row) for row in conn.execute('SELECT * FROM trades')]
+    conn.close()
+    return rows
+
+
+def fetch_models(db_path: str) -> List[Trade]:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = row_factory(Trade)
+    rows = conn.execute('SELECT * FROM trades').fetchall()
+    conn.close()
+    return rows
+
+
+def measure(load: Callable[[], List]) -> Dict:
+    """Retained memory of building one result list"""
+    gc.collect()
+    tracemalloc.start()
+    rows = load()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'rows': rows, 'bytes': retained}
+
+
+def exposure_dicts(rows: List[Dict]) -> float:
+    return sum(row['quantity'] * row['price'] for row in rows if row['side'] == 'BUY')
+
+
+def exposure_models(rows: List[Trade]) -> float:
+    return sum(row.quantity * row.price for row in rows if row.side == 'BUY')
+
+
+def best_of(fn: Callable, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def broker_payloads(count: int) -> Dict[str, List[Dict]]:
+    """Synthetic get_orders / get_positions items with the extra fields brokers send"""
+    rng = random.Random(11)
+    orders = [{
+        'order_id': f"B{i}", 'symbol': rng.choice(SYMBOLS), 'side': rng.choice(['BUY', 'SELL']),
+        'quantity': rng.randint(1, 500), 'filled_qty': rng.randint(0, 500), 'price': rng.uniform(100, 4000),
+        'avg_price': rng.uniform(100, 4000), 'order_type': 'LIMIT', 'status': 'complete',
+        'exchange': 'NSE', 'product': 'MIS', 'validity': 'DAY', 'exchange_order_id': f"X{i}",
+        'order_timestamp': '2026-10-19 10:15:00', 'remarks': '', 'token': rng.randint(1000, 99999),
+    } for i in range(count)]
+    positions = [{
+        'symbol': symbol, 'side': 'BUY', 'quantity': rng.randint(1, 500), 'avg_price': rng.uniform(100, 4000),
+        'ltp': rng.uniform(100, 4000), 'exchange': 'NSE', 'product': 'MIS', 'realised_pnl': 0,
+        'unrealised_pnl': 0, 'buy_qty': 0, 'sell_qty': 0, 'token': rng.randint(1000, 99999),
+    } for symbol in SYMBOLS for _ in range(max(1, count // len(SYMBOLS)))]
+    return {'orders': orders, 'positions': positions}
+
+
+def run(rows: int) -> Dict:
+    db_path = build_database(rows)
+    dict_result = measure(lambda: fetch_dicts(db_path))
+    model_result = measure(lambda: fetch_models(db_path))
+    assert exposure_dicts(dict_result['rows']) == exposure_models(model_result['rows'])
+
+    results = {
+        'rows': rows,
+        # tracemalloc slows allocation-heavy code, so time the fetches separately
+        'fetch_s': {'dict': best_of(lambda: fetch_dicts(db_path), 3),
+                    'model': best_of(lambda: fetch_models(db_path), 3)},
+        'bytes_per_row': {'dict': dict_result['bytes'] / rows, 'model': model_result['bytes'] / rows},
+        'access_s': {
+            'dict': best_of(lambda: exposure_dicts(dict_result['rows'])),
+            'model': best_of(lambda: exposure_models(model_result['rows'])),
+        },
+    }
+
+    payloads = broker_payloads(min(rows, 5000))
+    results['parse_orders_bytes'] = {
+        'dict': measure(lambda: [dict(o) for o in payloads['orders']])['bytes'] / len(payloads['orders']),
+        'model': measure(lambda: [Order.from_api(o) for o in payloads['orders']])['bytes'] / len(payloads['orders']),
+    }
+    results['parse_positions_s'] = best_of(lambda: [Position.from_api(p) for p in payloads['positions']])
+    return results
+
+
+def print_results(results: Dict):
+    print(f"{results['rows']:,} trades")
+    print(f"{'':<24} {'dict':>12} {'model':>12} {'change':>9}")
+    for label, key, scale, unit in (('fetch', 'fetch_s', 1000, 'ms'), ('memory / row', 'bytes_per_row', 1, 'B'),
+                                    ('field access loop', 'access_s', 1000, 'ms'),
+                                    ('parsed order / item', 'parse_orders_bytes', 1, 'B')):
+        before, after = results[key]['dict'], results[key]['model']
+        change = (after - before) / before * 100 if before else 0
+        print(f"{label:<24} {before * scale:>10.1f}{unit:>2} {after * scale:>10.1f}{unit:>2} {change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict rows against slotted models")
+    parser.add_argument('--rows', type=int, default=100000, help="trades to fetch")
+    parser.add_argument('--output', help="write results to JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Trade Mirroring System - Replay Benchmark
+Replays a recorded master order sequence through TradeMirroringEngine
+against the local fake AliceBlue server and reports throughput,
+end-to-end latency percentiles and DB write rates
+
+Usage:
+    python benchmarks/replay_benchmark.py --followers 1,10,100,500
+    python benchmarks/replay_benchmark.py --latency-ms 30 --error-rate 0.01 --output results.json
+    python benchmarks/replay_benchmark.py --baseline results.json
+    python benchmarks/replay_benchmark.py --paper --followers 500 --seed 7
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.WARNING)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import config
+from fake_aliceblue_server import FakeAliceBlueServer
+from latency_metrics import get_latency_recorder
+from paper_broker import PaperTradingClient
+
+DEFAULT_ORDERS_FILE = os.path.join(BENCHMARK_DIR, 'data', 'master_orders.csv')
+MASTER_ACCOUNT_ID = "BENCH_MASTER"
+
+
+def load_master_orders(filename: str) -> List[Dict]:
+    """Load recorded master order events (PLACE / MODIFY / CANCEL)"""
+    events = []
+    with open(filename, newline='') as f:
+        for row in csv.DictReader(f):
+            event = {
+                'offset_ms': int(row['offset_ms']),
+                'action': row['action'].upper(),
+                'order_id': row['order_id'],
+                'symbol': row['symbol'],
+                'side': row['side'],
+                'order_type': row['order_type'],
+            }
+            if row['quantity']:
+                event['quantity'] = int(row['quantity'])
+            if row['price']:
+                event['price'] = float(row['price'])
+            events.append(event)
+    return events
+
+
+def count_rows(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        trades = conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0]
+        logs = conn.execute('SELECT COUNT(*) FROM trade_logs').fetchone()[0]
+        return trades + logs
+    finally:
+        conn.close()
+
+
+def placed_orders(server: Optional[FakeAliceBlueServer], paper_client=None) -> int:
+    """Follower orders submitted so far"""
+    if paper_client is not None:
+        return paper_client.order_count
+    return server.state.request_counts.get('place_order', 0)
+
+
+def run_scenario(server: Optional[FakeAliceBlueServer], events: List[Dict], follower_count: int,
+                 realtime: bool = False, paper_client=None) -> Dict:
+    """
+    Replay all events with follower_count followers and collect metrics
+    Orders go to the fake HTTP server, or straight to paper_client when given
+    """
+    from trade_mirroring_engine import TradeMirroringEngine
+
+    work_dir = tempfile.mkdtemp(prefix='mirror_bench_')
+    db_path = os.path.join(work_dir, 'trades.db')
+    config.LATENCY_METRICS_PATH = os.path.join(work_dir, 'latency_metrics.json')
+
+    engine = TradeMirroringEngine(MASTER_ACCOUNT_ID, "bench_api_key", "bench_api_secret", db_path=db_path,
+                                  base_url=server.base_url if server else None, api_client=paper_client)
+    engine.db.add_master_account(MASTER_ACCOUNT_ID, "Benchmark Master", "bench_api_key", "bench_api_secret")
+    multipliers = [0.5, 1.0, 1.5, 2.0, 3.0, 5.0]
+    for i in range(follower_count):
+        engine.db.add_follower_account(
+            f"{MASTER_ACCOUNT_ID}_FOLLOWER_{i}", f"Follower {i}", f"BENCH{i:04d}",
+            "bench_token", multipliers[i % len(multipliers)], MASTER_ACCOUNT_ID
+        )
+
+    if not engine.initialize():
+        raise RuntimeError("engine failed to authenticate against fake server")
+
+    recorder = get_latency_recorder()
+    recorder.reset()
+    place_calls_before = placed_orders(server, paper_client)
+    rows_before = count_rows(db_path)
+
+    start = time.perf_counter()
+    for event in events:
+        if realtime:
+            wait = start + event['offset_ms'] / 1000 - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+        if event['action'] == 'PLACE':
+            engine.mirror_trade({
+                'order_id': event['order_id'],
+                'symbol': event['symbol'],
+                'side': event['side'],
+                'quantity': event['quantity'],
+                'price': event.get('price', 0),
+                'order_type': event['order_type'],
+                'received_ns': time.perf_counter_ns(),
+            })
+        elif event['action'] == 'MODIFY':
+            engine.modify_trade(event['order_id'], {'price': event.get('price', 0)})
+        elif event['action'] == 'CANCEL':
+            engine.cancel_trade(event['order_id'])
+    elapsed = time.perf_counter() - start
+
+    engine.shutdown()
+
+    stages = recorder.stage_summary()
+    end_to_end = stages.get('end_to_end', {})
+    follower_ack = stages.get('follower_ack', {})
+    follower_orders = placed_orders(server, paper_client) - place_calls_before
+    rows_written = count_rows(db_path) - rows_before
+
+    return {
+        'followers': follower_count,
+        'master_events': len(events),
+        'follower_orders': follower_orders,
+        'elapsed_s': elapsed,
+        'orders_per_s': follower_orders / elapsed if elapsed else 0,
+        'e2e_p50_ms': end_to_end.get('p50_ms', 0),
+        'e2e_p95_ms': end_to_end.get('p95_ms', 0),
+        'e2e_p99_ms': end_to_end.get('p99_ms', 0),
+        'follower_ack_p99_ms': follower_ack.get('p99_ms', 0),
+        'db_rows_written': rows_written,
+        'db_writes_per_s': rows_written / elapsed if elapsed else 0,
+        'stages': stages,
+    }
+
+
+def print_results(results: List[Dict], baseline: Dict = None):
+    header = (f"{'followers':>9} {'orders':>7} {'elapsed s':>9} {'orders/s':>9} "
+              f"{'e2e p50':>9} {'e2e p95':>9} {'e2e p99':>9} {'db w/s':>8}")
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        print(f"{result['followers']:>9} {result['follower_orders']:>7} {result['elapsed_s']:>9.2f} "
+              f"{result['orders_per_s']:>9.1f} {result['e2e_p50_ms']:>9.1f} {result['e2e_p95_ms']:>9.1f} "
+              f"{result['e2e_p99_ms']:>9.1f} {result['db_writes_per_s']:>8.1f}")
+
+        base = (baseline or {}).get(str(result['followers']))
+        if base:
+            for key in ('orders_per_s', 'e2e_p50_ms', 'e2e_p99_ms', 'db_writes_per_s'):
+                if base.get(key):
+                    change = (result[key] - base[key]) / base[key] * 100
+                    print(f"{'':>9}   {key}: {base[key]:.1f} → {result[key]:.1f} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay master orders through the mirroring engine")
+    parser.add_argument('--orders', default=DEFAULT_ORDERS_FILE, help="recorded master order CSV")
+    parser.add_argument('--followers', default="1,10,100", help="comma separated follower counts (1-500)")
+    parser.add_argument('--latency-ms', type=float, default=20, help="mean broker latency")
+    parser.add_argument('--jitter-ms', type=float, default=5, help="broker latency jitter (±)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of calls answered with HTTP 500")
+    parser.add_argument('--throttle-rps', type=float, default=0, help="per-account broker rate limit (0 = off)")
+    parser.add_argument('--order-rate', type=float, default=None,
+                        help="engine per-account order rate (defaults to config.MAX_ORDERS_PER_SECOND)")
+    parser.add_argument('--realtime', action='store_true', help="honour recorded inter-order delays")
+    parser.add_argument('--output', help="write results to JSON (usable as a later --baseline)")
+    parser.add_argument('--baseline', help="compare against a previous --output file")
+    parser.add_argument('--paper', action='store_true',
+                        help="use the in-process paper broker instead of the fake HTTP server "
+                             "(--error-rate becomes the reject rate)")
+    parser.add_argument('--seed', type=int, default=config.PAPER_SEED, help="paper broker random seed")
+    args = parser.parse_args()
+
+    follower_counts = [int(n) for n in args.followers.split(',')]
+    if any(n < 1 or n > 500 for n in follower_counts):
+        parser.error("follower counts must be between 1 and 500")
+    if args.order_rate:
+        config.MAX_ORDERS_PER_SECOND = args.order_rate
+
+    events = load_master_orders(args.orders)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {str(r['followers']): r for r in json.load(f)['results']}
+
+    results = []
+    if args.paper:
+        rejected = 0
+        for follower_count in follower_counts:
+            client = PaperTradingClient(seed=args.seed, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                        reject_rate=args.error_rate)
+            results.append(run_scenario(None, events, follower_count, args.realtime, client))
+            rejected += sum(1 for orders in client.orders.values()
+                            for order in orders.values() if order['status'] == 'rejected')
+        print_results(results, baseline)
+        print(f"\npaper broker: {rejected} simulated rejects (seed {args.seed})")
+    else:
+        with FakeAliceBlueServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                 error_rate=args.error_rate, throttle_rps=args.throttle_rps) as server:
+            for follower_count in follower_counts:
+                results.append(run_scenario(server, events, follower_count, args.realtime))
+            throttled, errors = server.state.throttled_count, server.state.error_count
+        print_results(results, baseline)
+        print(f"\nbroker: {throttled} throttled, {errors} simulated errors")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,3 +30,115 @@ API_TIMEOUT = 30
 TRADE_UPDATE_INTERVAL = 1  # Real-time trade mirroring
 ACCOUNT_REFRESH_INTERVAL = 5
 POSITION_UPDATE_INTERVAL = 2
+
+# Order Slicing (exchange freeze quantities, in units per order)
+DEFAULT_FREEZE_QUANTITY = 1800
+FREEZE_QUANTITIES = {
+    'NIFTY': 1800,
+    'BANKNIFTY': 900,
+    'FINNIFTY': 1800,
+    'MIDCPNIFTY': 2800,
+}
+
+# Broker Order Rate Limits
+MAX_ORDERS_PER_SECOND = 10  # per follower account
+ORDER_WORKER_THREADS = 8
+
+# Order Status Tracking (in seconds)
+ORDER_STATUS_POLL_INTERVAL = 1
+ORDER_STATUS_MAX_POLL_INTERVAL = 30
+
+# Master -> follower order id map (master orders kept in memory)
+ORDER_ID_MAP_CACHE_SIZE = 10000
+
+# Latency Metrics
+LATENCY_METRICS_PATH = "./logs/latency_metrics.json"
+
+# Market Data ("simulated" drives LTPs from a local random-walk feed, "none" uses position snapshots only).
+# There is no broker websocket feed yet: live LTPs come only from position snapshots; a streaming
+# source plugs in as a MarketDataService feed (subscribe/unsubscribe/start/stop, calls on_ticks)
+MARKET_DATA_FEED = "none"
+MARKET_DATA_TICK_INTERVAL = 0.5  # seconds
+
+# Trade History Retention
+TRADE_RETENTION_DAYS = 90  # closed trades / logs older than this move to monthly archive DBs
+ARCHIVE_CHECK_INTERVAL = 900  # seconds between off-hours archival checks
+
+# Report Export
+EXPORT_FORMAT = "csv"  # "csv" or "parquet" (parquet requires pyarrow)
+EXPORT_CHUNK_SIZE = 5000  # rows fetched from SQLite per chunk
+
+# Market Calendar (exchange holidays on weekdays, 'YYYY-MM-DD'; update from the NSE holiday circular each year)
+MARKET_HOLIDAYS = [
+    '2026-01-26',  # Republic Day
+    '2026-05-01',  # Maharashtra Day
+    '2026-10-02',  # Gandhi Jayanti
+    '2026-12-25',  # Christmas
+]
+
+# Session Scheduler
+SESSION_PRE_OPEN_MINUTES = 15  # start-of-day jobs run this long before market open
+SESSION_CHECK_INTERVAL = 30  # seconds
+
+# Logging (records are queued and written by a background listener thread)
+LOG_LEVEL = "INFO"
+LOG_FILE = "app.log"  # JSON lines, in LOG_PATH
+LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate at this size or at midnight
+LOG_BACKUP_COUNT = 10
+LOG_QUEUE_SIZE = 10000  # records beyond this are dropped rather than blocking the caller
+LOG_RATE_LIMIT_BURST = 20  # identical messages allowed per window (errors are never limited)
+LOG_RATE_LIMIT_WINDOW = 10  # seconds
+
+# Event Bus
+EVENT_BUS_QUEUE_SIZE = 10000  # per priority lane
+EVENT_BUS_BATCH_SIZE = 500  # events handed to a batch subscriber per call
+EVENT_BUS_PUBLISH_TIMEOUT = 0.05  # seconds a publisher may wait on a full high/normal lane before dropping
+
+# UI Refresh Scheduler (base intervals come from POSITION_UPDATE_INTERVAL / ACCOUNT_REFRESH_INTERVAL)
+REFRESH_TICK_MS = 250
+REFRESH_SPEEDUP_FACTOR = 0.5  # interval multiplier while data keeps changing
+REFRESH_BACKOFF_FACTOR = 1.5  # interval growth per idle refresh
+REFRESH_MAX_BACKOFF = 6  # idle interval cap, as a multiple of the base interval
+
+# Broker Backend ("aliceblue" for the live API, "paper" for the in-memory simulated broker)
+BROKER_BACKEND = "aliceblue"
+
+# Paper Trading Simulation
+PAPER_SEED = 42
+PAPER_LATENCY_MS = 20  # simulated broker round trip
+PAPER_JITTER_MS = 10
+PAPER_REJECT_RATE = 0.01
+PAPER_PARTIAL_FILL_RATE = 0.2  # orders filled in 2-4 tranches
+PAPER_FILL_DELAY = 0.5  # seconds between acceptance and (each) fill
+
+# Follower Onboarding
+ONBOARDING_AUTH_WORKERS = 16  # concurrent logins during bulk import
+
+# Order Intent Journal (written next to the trades database)
+ORDER_JOURNAL_FILE = "order_journal.db"
+ORDER_JOURNAL_COMMIT_WINDOW_MS = 0  # extra wait to gather more orders into one fsync (0 = commit as soon as idle)
+
+# Broker API JSON ("auto" uses orjson when installed, else stdlib json; or "orjson" / "json")
+JSON_BACKEND = "auto"
+
+# Account Snapshots (positions/orders/holdings of all accounts in one concurrent sweep)
+SNAPSHOT_INTERVAL = 2  # seconds between background sweeps; also the freshness readers accept
+SNAPSHOT_DEADLINE = 3  # seconds a sweep waits for all fetches; late ones keep the previous data
+SNAPSHOT_WORKERS = 16
+SNAPSHOT_KINDS = ("positions", "orders", "holdings")
+
+# Credential Vault (API secrets and follower tokens encrypted at rest; key derived once at startup)
+CREDENTIAL_VAULT_ENABLED = True
+VAULT_KEY_FILE = "./data/vault.key"  # salt + local secret, created on first run (mode 600)
+VAULT_PASSPHRASE_ENV = "TRADE_MIRROR_VAULT_PASSPHRASE"  # when set, the key is derived from it instead
+VAULT_SCRYPT_N = 2 ** 15
+
+# Broker HTTP connection pool (per API client)
+HTTP_POOL_SIZE = 32
+HTTP_ACCOUNT_POOL_SIZE = 8  # per follower account with its own session token (at least ORDER_WORKER_THREADS)
+
+# Profiling (Performance tab; timing can also be switched on there at runtime)
+PROFILING_ENABLED = False  # record refresh callback, SQLite and broker HTTP timings from startup
+PROFILER_SQL_KEY_LENGTH = 80  # statements are grouped by their first N characters
+PROFILER_REPORT_LINES = 40  # functions shown from a cProfile capture
+PROFILE_DUMP_DIR = "./logs/profiles"
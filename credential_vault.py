@@ -0,0 +1,147 @@
+"""
+Trade Mirroring System - Credential Vault
+Encrypts broker secrets at rest and keeps decrypted ones in an in-memory
+session cache that is wiped on logout
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'enc:v1:'
+SALT_BYTES = 16
+SECRET_BYTES = 32
+NONCE_BYTES = 12
+
+
+def _wipe(buffer: bytearray):
+    """Overwrite a buffer in place"""
+    buffer[:] = bytes(len(buffer))
+
+
+class CredentialVault:
+    """
+    Credential Vault
+    The AES-256-GCM key is derived with scrypt once, at construction, from the
+    passphrase in config.VAULT_PASSPHRASE_ENV or else from the local secret in
+    the key file (created with mode 600 on first run, together with the salt).
+    Each value is bound to its column and account as associated data, so an
+    encrypted secret cannot be copied onto another row.
+    Secrets are decrypted on first use and cached per (field, account) in
+    bytearrays, together with the ciphertext they came from so a value
+    rewritten in the database is decrypted afresh; logout() and lock()
+    overwrite them. Strings handed out by
+    reveal() are immutable copies Python cannot wipe, so callers should pass
+    them straight on (e.g. to AliceBlueAPIClient) rather than keep them
+    """
+
+    def __init__(self, key_file: str = None, passphrase: str = None):
+        self.key_file = key_file or config.VAULT_KEY_FILE
+        salt, secret = self._load_key_file()
+        passphrase = passphrase or os.environ.get(config.VAULT_PASSPHRASE_ENV)
+        material = passphrase.encode('utf-8') if passphrase else secret
+        n = config.VAULT_SCRYPT_N
+        self._key = bytearray(hashlib.scrypt(material, salt=salt, n=n, r=8, p=1, maxmem=256 * n * 8 + 2 ** 20,
+                                             dklen=32))
+        self._aead = None
+        self._cache: Dict[Tuple[str, str], Tuple[str, bytearray]] = {}  # (field, account) -> (ciphertext, plaintext)
+        self._lock = threading.Lock()
+        logger.info("✓ Credential vault unlocked")
+
+    def _load_key_file(self) -> Tuple[bytes, bytes]:
+        """(salt, local secret), generating the key file on first run"""
+        try:
+            with open(self.key_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = os.urandom(SALT_BYTES + SECRET_BYTES)
+            os.makedirs(os.path.dirname(self.key_file) or '.', exist_ok=True)
+            fd = os.open(self.key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            logger.info(f"✓ Credential vault key file created: {self.key_file}")
+        if len(data) != SALT_BYTES + SECRET_BYTES:
+            raise ValueError(f"Invalid vault key file: {self.key_file}")
+        return data[:SALT_BYTES], data[SALT_BYTES:]
+
+    def _cipher(self):
+        if self._aead is None:
+            if self._key is None:
+                raise RuntimeError("Credential vault is locked")
+            try:
+                from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            except ImportError:
+                raise RuntimeError("Credential encryption requires cryptography (pip install cryptography)")
+            self._aead = AESGCM(bytes(self._key))
+        return self._aead
+
+    @staticmethod
+    def is_encrypted(value: Optional[str]) -> bool:
+        return bool(value) and value.startswith(PREFIX)
+
+    @staticmethod
+    def _context(field: str, account_id: str) -> bytes:
+        return f"{field}:{account_id}".encode('utf-8')
+
+    def encrypt(self, field: str, account_id: str, value: str) -> str:
+        """Encrypted form of value for the given column and account (already encrypted values pass through)"""
+        if not value or self.is_encrypted(value):
+            return value
+        nonce = os.urandom(NONCE_BYTES)
+        sealed = self._cipher().encrypt(nonce, value.encode('utf-8'), self._context(field, account_id))
+        return PREFIX + base64.urlsafe_b64encode(nonce + sealed).decode('ascii')
+
+    def reveal(self, field: str, account_id: str, value: str) -> Optional[str]:
+        """
+        Plaintext of a stored value, decrypted once per session and then served from the cache
+        Plaintext (not yet migrated) values pass through; None if decryption fails
+        """
+        if not self.is_encrypted(value):
+            return value
+        key = (field, account_id)
+        with self._lock:
+            entry = self._cache.get(key)
+            cached = entry[1] if entry and entry[0] == value else None
+            if cached is None:
+                if entry:
+                    _wipe(self._cache.pop(key)[1])  # stored value changed since it was cached
+                try:
+                    raw = base64.urlsafe_b64decode(value[len(PREFIX):])
+                    cached = bytearray(self._cipher().decrypt(raw[:NONCE_BYTES], raw[NONCE_BYTES:],
+                                                              self._context(field, account_id)))
+                except RuntimeError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error decrypting {field} for {account_id}: {type(e).__name__}")
+                    return None
+                self._cache[key] = (value, cached)
+            return cached.decode('utf-8')
+
+    def logout(self, account_id: str):
+        """Wipe and drop every cached secret of one account"""
+        with self._lock:
+            for key in [key for key in self._cache if key[1] == account_id]:
+                _wipe(self._cache.pop(key)[1])
+
+    def lock(self):
+        """Wipe all cached secrets and the key; the vault cannot be used afterwards"""
+        with self._lock:
+            for _, buffer in self._cache.values():
+                _wipe(buffer)
+            self._cache.clear()
+            if self._key is not None:
+                _wipe(self._key)
+            self._key = None
+            self._aead = None
+        logger.info("✓ Credential vault locked")
+
+    def cached_count(self) -> int:
+        with self._lock:
+            return len(self._cache)
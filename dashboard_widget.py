@@ -3,28 +3,77 @@ from PyQt5.QtWidgets import (
     QPushButton, QLabel, QLineEdit, QDoubleSpinBox, QDialog, QMessageBox,
     QTabWidget, QHeaderView, QSpinBox, QComboBox
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor, QFont
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
+import config
+from latency_metrics import get_latency_recorder
+from market_data import MarketDataService
+from pnl_engine import PortfolioPnLEngine, side_sign
+from position_book import FollowerPositionService
+from refresh_scheduler import RefreshScheduler
+from account_snapshot import AccountSnapshotService, POSITIONS
+from event_bus import Event, FillUpdated, OrderPlaced, PositionDrift, RiskBlocked
+
 logger = logging.getLogger(__name__)
 
 
 class TradeDisplayWidget(QWidget):
     """Dashboard showing live trade mirroring"""
 
-    def __init__(self, master_account_id: str, api_client, db_manager, risk_manager):
+    ticks_received = pyqtSignal(dict)
+    events_received = pyqtSignal(set)
+
+    def __init__(self, master_account_id: str, api_client, db_manager, risk_manager, market_data=None,
+                 position_service=None, event_bus=None, refresh_scheduler=None, snapshots=None):
         super().__init__()
         self.master_account_id = master_account_id
         self.api_client = api_client
         self.db = db_manager
         self.risk_mgr = risk_manager
+        self.market_data = market_data or MarketDataService()
+        self.pnl_engine = PortfolioPnLEngine(self.market_data.price_table)
+        # Follower books: shared with the engine when it runs in-process, otherwise rebuilt from the trades table
+        self.owns_position_service = position_service is None
+        self.position_service = position_service or FollowerPositionService(db_manager, master_account_id, self.pnl_engine)
+        # An owned service is loaded once here; afterwards fills arrive as bus events, or (without a bus)
+        # a changed trades view triggers one background reload instead of a rebuild on every refresh
+        self._books_executor = None
+        self._books_reload = None
+        if self.owns_position_service:
+            self.position_service.load_from_trades()
+            self._books_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DashboardBooks")
+        # Broker positions come from the shared account sweep (the engine's when in-process); without an
+        # engine the positions refresh sweeps on demand, so it stays gated on tab visibility and market hours
+        self.owns_snapshots = snapshots is None
+        self.snapshots = snapshots or AccountSnapshotService(api_client, db_manager, master_account_id,
+                                                             kinds=(POSITIONS,))
         self.followers = []
         self.current_positions = {}
+        self.position_rows = {}
+        self.latency = get_latency_recorder()
+        self.event_bus = event_bus
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler(self)
+        self._trades_fingerprint = None
+        self._positions_fingerprint = None
         self.init_ui()
         self.setup_timers()
 
+        # With an in-process engine, refresh on its events instead of polling the trades table
+        if self.event_bus:
+            self.refresh_scheduler.remove_task('dashboard.trades')
+            self.events_received.connect(self.on_events)
+            self.event_bus.subscribe(Event, self.forward_events, batch=True)
+            if self.owns_position_service:
+                self.event_bus.subscribe(FillUpdated, self.apply_fill_events, batch=True)
+
+        # Ticks arrive on the feed thread; the signal hands them to the UI thread
+        self.ticks_received.connect(self.apply_ticks)
+        self.market_data.add_listener(self.ticks_received.emit)
+
     def init_ui(self):
         layout = QVBoxLayout()
 
@@ -65,6 +114,11 @@ class TradeDisplayWidget(QWidget):
         self.init_risk_tab()
         self.tabs.addTab(self.risk_widget, "Risk Status")
 
+        # Tab 4: Mirror Latency
+        self.latency_widget = QWidget()
+        self.init_latency_tab()
+        self.tabs.addTab(self.latency_widget, "Latency")
+
         layout.addWidget(self.tabs)
 
         # Control buttons
@@ -91,18 +145,33 @@ class TradeDisplayWidget(QWidget):
         self.positions_table = QTableWidget()
         self.positions_table.setColumnCount(9)
         self.positions_table.setHorizontalHeaderLabels([
-            "Symbol", "Side", "Qty (Master)", "Qty (Follower)", "Price",
+            "Symbol", "Side", "Qty (Master)", "Qty (Followers)", "Price",
             "LTP", "P&L", "Status", "Last Update"
         ])
         self.positions_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.positions_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.positions_table.itemSelectionChanged.connect(self.update_follower_breakdown)
         layout.addWidget(self.positions_table)
 
+        # Per-follower breakdown of the selected master position (from cached books)
+        self.breakdown_label = QLabel("Follower Breakdown: select a position")
+        layout.addWidget(self.breakdown_label)
+        self.breakdown_table = QTableWidget()
+        self.breakdown_table.setColumnCount(6)
+        self.breakdown_table.setHorizontalHeaderLabels([
+            "Follower", "Multiplier", "Expected Qty", "Actual Qty", "Difference", "Avg Price"
+        ])
+        self.breakdown_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.breakdown_table)
+
         # Statistics
         stats_layout = QHBoxLayout()
         self.positions_count_label = QLabel("Open Positions: 0")
         self.total_pnl_label = QLabel("Total P&L: ₹0")
+        self.followers_pnl_label = QLabel("Followers P&L: ₹0")
         stats_layout.addWidget(self.positions_count_label)
         stats_layout.addWidget(self.total_pnl_label)
+        stats_layout.addWidget(self.followers_pnl_label)
         stats_layout.addStretch()
         layout.addLayout(stats_layout)
 
@@ -145,10 +214,10 @@ class TradeDisplayWidget(QWidget):
 
         # Risk alerts table
         self.risk_table = QTableWidget()
-        self.risk_table.setColumnCount(5)
+        self.risk_table.setColumnCount(7)
         self.risk_table.setHorizontalHeaderLabels([
             "Follower Account", "Daily Loss Limit", "Current Loss",
-            "Exposure Cap", "Status"
+            "Exposure Cap", "Trades Today", "Exposure Today", "Status"
         ])
         self.risk_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.risk_table)
@@ -165,22 +234,73 @@ class TradeDisplayWidget(QWidget):
 
         self.risk_widget.setLayout(layout)
 
+    def init_latency_tab(self):
+        """Initialize mirror path latency tab"""
+        layout = QVBoxLayout()
+
+        # Per-stage latency table
+        layout.addWidget(QLabel("Mirror Path Stages (ms):"))
+        self.latency_table = QTableWidget()
+        self.latency_table.setColumnCount(6)
+        self.latency_table.setHorizontalHeaderLabels([
+            "Stage", "Count", "p50", "p95", "p99", "Max"
+        ])
+        self.latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.latency_table)
+
+        # Per-follower master fill → follower ack latency
+        layout.addWidget(QLabel("Master Fill → Follower Ack (ms):"))
+        self.follower_latency_table = QTableWidget()
+        self.follower_latency_table.setColumnCount(5)
+        self.follower_latency_table.setHorizontalHeaderLabels([
+            "Follower", "Count", "p50", "p95", "p99"
+        ])
+        self.follower_latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.follower_latency_table)
+
+        export_layout = QHBoxLayout()
+        export_btn = QPushButton("📥 Export Metrics")
+        export_btn.clicked.connect(self.export_latency_metrics)
+        export_layout.addWidget(export_btn)
+        export_layout.addStretch()
+        layout.addLayout(export_layout)
+
+        self.latency_widget.setLayout(layout)
+
     def setup_timers(self):
-        """Setup auto-refresh timers"""
-        # Positions update timer (1 second)
-        self.positions_timer = QTimer()
-        self.positions_timer.timeout.connect(self.update_positions)
-        self.positions_timer.start(1000)
-
-        # Trades update timer (2 seconds)
-        self.trades_timer = QTimer()
-        self.trades_timer.timeout.connect(self.refresh_trades)
-        self.trades_timer.start(2000)
-
-        # Risk status timer (5 seconds)
-        self.risk_timer = QTimer()
-        self.risk_timer.timeout.connect(self.update_risk_status)
-        self.risk_timer.start(5000)
+        """Register refreshes with the scheduler (each gated on its tab being visible)"""
+        self.refresh_scheduler.add_task('dashboard.positions', self.update_positions,
+                                        config.POSITION_UPDATE_INTERVAL, self.positions_widget)
+        self.refresh_scheduler.add_task('dashboard.trades', self.refresh_trades,
+                                        config.POSITION_UPDATE_INTERVAL, self.trades_widget)
+        self.refresh_scheduler.add_task('dashboard.risk', self.update_risk_status,
+                                        config.ACCOUNT_REFRESH_INTERVAL, self.risk_widget)
+        self.refresh_scheduler.add_task('dashboard.latency', self.update_latency_stats,
+                                        config.ACCOUNT_REFRESH_INTERVAL, self.latency_widget,
+                                        market_hours_only=False)
+
+    def apply_fill_events(self, events: list):
+        """Bus subscriber (bus thread): apply fills to the follower books this widget owns"""
+        for e in events:
+            self.position_service.apply_fill({'follower_id': e.follower_id, 'symbol': e.symbol, 'side': e.side,
+                                              'quantity': e.quantity, 'price': e.price})
+
+    def reload_books(self):
+        """Rebuild owned follower books from the trades table on a worker thread (one at a time)"""
+        if self._books_executor is None or (self._books_reload and not self._books_reload.done()):
+            return
+        self._books_reload = self._books_executor.submit(self.position_service.load_from_trades)
+
+    def forward_events(self, events: list):
+        """Bus subscriber (bus thread): forward the batch's event types to the UI thread"""
+        self.events_received.emit({type(event) for event in events})
+
+    def on_events(self, event_types: set):
+        """Refresh only the views affected by a batch of engine events"""
+        if event_types & {OrderPlaced, FillUpdated}:
+            self.refresh_trades()
+        if event_types & {RiskBlocked, PositionDrift}:
+            self.update_risk_status()
 
     def update_positions(self):
         """Update live positions from API"""
@@ -188,29 +308,65 @@ class TradeDisplayWidget(QWidget):
             self.followers = self.db.get_all_followers(self.master_account_id)
             if not self.followers:
                 self.positions_table.setRowCount(0)
-                return
-
-            # Get master positions
-            positions = self.api_client.get_positions(self.master_account_id)
+                return False
+
+            # Master positions from the latest sweep; skip the rebuild when neither they nor the follower books changed
+            snapshot = self.snapshots.latest() if self.owns_snapshots else self.snapshots.current()
+            if snapshot is None:
+                return False
+            positions = snapshot.positions_for(self.master_account_id)
+            fingerprint = (
+                tuple((p.get('symbol'), p.get('side'), p.get('quantity'), p.get('price'), p.get('ltp'))
+                      for p in positions),
+                tuple(f['follower_id'] for f in self.followers),
+                self.position_service.version,
+            )
+            if fingerprint == self._positions_fingerprint:
+                return False
+            self._positions_fingerprint = fingerprint
             self.positions_table.setRowCount(len(positions))
 
+            # Keep the feed subscribed to every symbol held by the master or any follower
+            self.market_data.seed_prices({p.get('symbol', ''): p.get('ltp', p.get('price', 0)) for p in positions})
+            self.market_data.update_subscriptions(
+                [p.get('symbol', '') for p in positions],
+                self.db.get_traded_symbols(self.master_account_id)
+            )
+
+            # Load master book into the P&L engine and value it in one pass
+            self.pnl_engine.clear_account(self.master_account_id)
+            for position in positions:
+                self.pnl_engine.set_position(
+                    self.master_account_id,
+                    position.get('symbol', ''),
+                    position.get('side', ''),
+                    position.get('quantity', 0),
+                    position.get('price', 0)
+                )
+            pnl_result = self.pnl_engine.compute()
+            master_row = self.pnl_engine.account_index(self.master_account_id)
+
+            self.current_positions = {}
+            self.position_rows = {}
             total_pnl = 0
             for row, position in enumerate(positions):
                 symbol = position.get('symbol', '')
                 side = position.get('side', '')
                 qty = position.get('quantity', 0)
                 price = position.get('price', 0)
-                ltp = position.get('ltp', price)
-                pnl = (ltp - price) * qty
+                ltp = self.market_data.get_ltp(symbol, position.get('ltp', price))
+                pnl = float(pnl_result['unrealized'][master_row, self.pnl_engine.symbol_index(symbol)])
 
                 total_pnl += pnl
+                self.current_positions[symbol] = position
+                self.position_rows[symbol] = row
 
                 self.positions_table.setItem(row, 0, QTableWidgetItem(symbol))
                 self.positions_table.setItem(row, 1, QTableWidgetItem(side))
                 self.positions_table.setItem(row, 2, QTableWidgetItem(str(qty)))
 
-                # Calculate follower quantity
-                follower_qty = qty * self.followers[0].get('lot_multiplier', 1) if self.followers else qty
+                # Actual follower quantity from cached books (signed like the master side)
+                follower_qty = self.position_service.total_quantity(symbol) * side_sign(side)
                 self.positions_table.setItem(row, 3, QTableWidgetItem(str(int(follower_qty))))
                 self.positions_table.setItem(row, 4, QTableWidgetItem(f"₹{price:.2f}"))
                 self.positions_table.setItem(row, 5, QTableWidgetItem(f"₹{ltp:.2f}"))
@@ -229,37 +385,124 @@ class TradeDisplayWidget(QWidget):
 
             self.positions_count_label.setText(f"Open Positions: {len(positions)}")
             self.total_pnl_label.setText(f"Total P&L: ₹{total_pnl:,.2f}")
+            self.update_followers_pnl(pnl_result)
+            self.update_follower_breakdown()
+            return True
 
         except Exception as e:
             logger.error(f"Error updating positions: {str(e)}")
 
+    def apply_ticks(self, ticks: dict):
+        """Mark open positions to market with pushed LTP changes"""
+        try:
+            if not any(symbol in self.position_rows for symbol in ticks):
+                return
+
+            pnl_result = self.pnl_engine.compute()
+            master_row = self.pnl_engine.account_index(self.master_account_id)
+
+            for symbol, ltp in ticks.items():
+                row = self.position_rows.get(symbol)
+                if row is None:
+                    continue
+                pnl = float(pnl_result['unrealized'][master_row, self.pnl_engine.symbol_index(symbol)])
+
+                self.positions_table.setItem(row, 5, QTableWidgetItem(f"₹{ltp:.2f}"))
+                pnl_item = QTableWidgetItem(f"₹{pnl:,.2f}")
+                if pnl > 0:
+                    pnl_item.setBackground(QColor(144, 238, 144))
+                elif pnl < 0:
+                    pnl_item.setBackground(QColor(255, 200, 200))
+                self.positions_table.setItem(row, 6, pnl_item)
+
+            total_pnl = float(pnl_result['unrealized'][master_row].sum())
+            self.total_pnl_label.setText(f"Total P&L: ₹{total_pnl:,.2f}")
+            self.update_followers_pnl(pnl_result)
+
+        except Exception as e:
+            logger.error(f"Error applying ticks: {str(e)}")
+
+    def update_followers_pnl(self, pnl_result):
+        """Show combined marked-to-market P&L of all follower books"""
+        totals = self.pnl_engine.account_totals(pnl_result)
+        followers_pnl = sum(t['total'] for account_id, t in totals.items() if account_id != self.master_account_id)
+        self.followers_pnl_label.setText(f"Followers P&L: ₹{followers_pnl:,.2f}")
+
+    def update_follower_breakdown(self):
+        """Expand the selected master position into every follower's actual vs expected quantity"""
+        try:
+            row = self.positions_table.currentRow()
+            symbol_item = self.positions_table.item(row, 0) if row >= 0 else None
+            position = self.current_positions.get(symbol_item.text()) if symbol_item else None
+            if not position:
+                self.breakdown_table.setRowCount(0)
+                return
+
+            symbol = position.get('symbol', '')
+            master_qty = position.get('quantity', 0)
+            if master_qty > 0:
+                master_qty *= side_sign(position.get('side', ''))
+            rows = self.position_service.breakdown(symbol, master_qty, self.followers)
+
+            self.breakdown_label.setText(f"Follower Breakdown: {symbol} (master {master_qty:g})")
+            self.breakdown_table.setRowCount(len(rows))
+            for r, entry in enumerate(rows):
+                self.breakdown_table.setItem(r, 0, QTableWidgetItem(entry['account_name']))
+                self.breakdown_table.setItem(r, 1, QTableWidgetItem(f"{entry['lot_multiplier']}x"))
+                self.breakdown_table.setItem(r, 2, QTableWidgetItem(f"{entry['expected']:g}"))
+                self.breakdown_table.setItem(r, 3, QTableWidgetItem(f"{entry['actual']:g}"))
+                diff_item = QTableWidgetItem(f"{entry['difference']:+g}")
+                if entry['difference']:
+                    diff_item.setBackground(QColor(255, 200, 124))
+                self.breakdown_table.setItem(r, 4, diff_item)
+                self.breakdown_table.setItem(r, 5, QTableWidgetItem(f"₹{entry['avg_price']:.2f}"))
+
+        except Exception as e:
+            logger.error(f"Error updating follower breakdown: {str(e)}")
+
     def refresh_trades(self):
-        """Refresh recent trades display"""
+        """Refresh recent trades display; returns whether anything changed"""
         try:
             if not self.followers:
-                return
+                self.followers = self.db.get_all_followers(self.master_account_id)
+            if not self.followers:
+                return False
 
-            # Get trades for all followers
+            # Get orders for all followers (sliced child orders aggregated into their parent)
             all_trades = []
             for follower in self.followers:
-                trades = self.db.get_recent_trades(follower['follower_id'], limit=20)
+                trades = self.db.get_recent_orders(follower['follower_id'], limit=20)
                 all_trades.extend(trades)
 
             all_trades.sort(key=lambda x: x.get('entry_time', ''), reverse=True)
             all_trades = all_trades[:50]
 
+            fingerprint = tuple(
+                (t.get('entry_time'), t.get('symbol'), t.get('status'), t.get('fill_percentage'), t.get('pnl'))
+                for t in all_trades
+            )
+            if fingerprint == self._trades_fingerprint:
+                return False
+            self._trades_fingerprint = fingerprint
+            if not self.event_bus:
+                self.reload_books()  # new orders or fills in the trades table
+
             self.trades_table.setRowCount(len(all_trades))
 
             for row, trade in enumerate(all_trades):
                 self.trades_table.setItem(row, 0, QTableWidgetItem(str(trade.get('entry_time', ''))))
                 self.trades_table.setItem(row, 1, QTableWidgetItem(trade.get('symbol', '')))
                 self.trades_table.setItem(row, 2, QTableWidgetItem(trade.get('side', '')))
-                self.trades_table.setItem(row, 3, QTableWidgetItem(str(trade.get('quantity', 0))))
+                qty_text = str(trade.get('quantity', 0))
+                if trade.get('child_count', 1) > 1:
+                    qty_text += f" ({trade['child_count']} slices)"
+                self.trades_table.setItem(row, 3, QTableWidgetItem(qty_text))
                 self.trades_table.setItem(row, 4, QTableWidgetItem(f"₹{trade.get('price', 0):.2f}"))
                 self.trades_table.setItem(row, 5, QTableWidgetItem(str(trade.get('follower_account_id', ''))))
                 self.trades_table.setItem(row, 6, QTableWidgetItem(trade.get('status', '')))
-                self.trades_table.setItem(row, 7, QTableWidgetItem(f"{trade.get('fill_percentage', 0):.1f}%"))
+                self.trades_table.setItem(row, 7, QTableWidgetItem(f"{trade.get('fill_percentage') or 0:.1f}%"))
                 self.trades_table.setItem(row, 8, QTableWidgetItem(f"₹{trade.get('pnl', 0):,.2f}"))
+            return True
 
         except Exception as e:
             logger.error(f"Error refreshing trades: {str(e)}")
@@ -267,13 +510,17 @@ class TradeDisplayWidget(QWidget):
     def update_risk_status(self):
         """Update risk management status"""
         try:
+            if not self.followers:
+                self.followers = self.db.get_all_followers(self.master_account_id)
             if not self.followers:
                 return
 
             self.risk_table.setRowCount(len(self.followers))
+            daily_stats = self.db.get_daily_stats(self.master_account_id)
 
             for row, follower in enumerate(self.followers):
                 risk_summary = self.risk_mgr.get_risk_summary(follower['follower_id'])
+                stats = daily_stats.get(follower['follower_id'], {})
 
                 self.risk_table.setItem(row, 0, QTableWidgetItem(follower['account_name']))
                 self.risk_table.setItem(row, 1, QTableWidgetItem(f"₹{risk_summary['daily_loss_limit']}"))
@@ -285,25 +532,65 @@ class TradeDisplayWidget(QWidget):
                 self.risk_table.setItem(row, 2, loss_item)
 
                 self.risk_table.setItem(row, 3, QTableWidgetItem("₹100,000"))
+                self.risk_table.setItem(row, 4, QTableWidgetItem(str(stats.get('trade_count', 0))))
+                self.risk_table.setItem(row, 5, QTableWidgetItem(f"₹{stats.get('exposure', 0):,.2f}"))
 
                 # Status
                 status = "🟢 Safe" if abs(current_loss) < float(risk_summary['daily_loss_limit']) else "🔴 Alert"
                 status_item = QTableWidgetItem(status)
-                self.risk_table.setItem(row, 4, status_item)
+                self.risk_table.setItem(row, 6, status_item)
 
         except Exception as e:
             logger.error(f"Error updating risk status: {str(e)}")
 
+    def update_latency_stats(self):
+        """Update mirror path latency histograms"""
+        try:
+            stages = self.latency.stage_summary()
+            self.latency_table.setRowCount(len(stages))
+            for row, (stage, summary) in enumerate(stages.items()):
+                self.latency_table.setItem(row, 0, QTableWidgetItem(stage))
+                self.latency_table.setItem(row, 1, QTableWidgetItem(str(summary['count'])))
+                self.latency_table.setItem(row, 2, QTableWidgetItem(f"{summary['p50_ms']:.2f}"))
+                self.latency_table.setItem(row, 3, QTableWidgetItem(f"{summary['p95_ms']:.2f}"))
+                self.latency_table.setItem(row, 4, QTableWidgetItem(f"{summary['p99_ms']:.2f}"))
+                self.latency_table.setItem(row, 5, QTableWidgetItem(f"{summary['max_ms']:.2f}"))
+
+            follower_names = {f['follower_id']: f['account_name'] for f in self.followers}
+            followers = self.latency.follower_summary('follower_ack')
+            self.follower_latency_table.setRowCount(len(followers))
+            for row, (follower_id, summary) in enumerate(sorted(followers.items())):
+                self.follower_latency_table.setItem(row, 0, QTableWidgetItem(follower_names.get(follower_id, follower_id)))
+                self.follower_latency_table.setItem(row, 1, QTableWidgetItem(str(summary['count'])))
+                self.follower_latency_table.setItem(row, 2, QTableWidgetItem(f"{summary['p50_ms']:.2f}"))
+                self.follower_latency_table.setItem(row, 3, QTableWidgetItem(f"{summary['p95_ms']:.2f}"))
+                self.follower_latency_table.setItem(row, 4, QTableWidgetItem(f"{summary['p99_ms']:.2f}"))
+
+        except Exception as e:
+            logger.error(f"Error updating latency stats: {str(e)}")
+
+    def export_latency_metrics(self):
+        """Export latency histograms to JSON and Prometheus text files"""
+        try:
+            json_path = config.LATENCY_METRICS_PATH
+            prom_path = json_path.rsplit('.', 1)[0] + '.prom'
+            if not self.latency.export_json(json_path):
+                raise RuntimeError("could not write metrics file")
+            with open(prom_path, 'w') as f:
+                f.write(self.latency.to_prometheus())
+            QMessageBox.information(self, "Export", f"✓ Metrics exported to:\n{json_path}\n{prom_path}")
+        except Exception as e:
+            logger.error(f"Error exporting latency metrics: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Export failed: {str(e)}")
+
     def pause_mirroring(self):
         """Pause trade mirroring"""
-        self.positions_timer.stop()
-        self.trades_timer.stop()
+        self.refresh_scheduler.pause('dashboard.positions', 'dashboard.trades')
         QMessageBox.information(self, "Paused", "Trade mirroring paused!")
 
     def resume_mirroring(self):
         """Resume trade mirroring"""
-        self.positions_timer.start()
-        self.trades_timer.start()
+        self.refresh_scheduler.resume('dashboard.positions', 'dashboard.trades')
         QMessageBox.information(self, "Resumed", "Trade mirroring resumed!")
 
     def refresh_data(self):
@@ -312,3 +599,14 @@ class TradeDisplayWidget(QWidget):
         self.refresh_trades()
         self.update_risk_status()
         QMessageBox.information(self, "Refreshed", "Data refreshed successfully!")
+
+    def shutdown(self):
+        """Stop the snapshot service and book reloads this widget owns (an engine's are stopped by the engine)"""
+        if self.owns_snapshots:
+            self.snapshots.stop()
+        if self._books_executor:
+            self._books_executor.shutdown(wait=False)
+
+    def closeEvent(self, event):
+        self.shutdown()
+        super().closeEvent(event)
@@ -1,11 +1,22 @@
 import sqlite3
 import json
+import os
+import glob
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from models import Follower, Trade, row_factory
+from profiler import connection_factory
+
 logger = logging.getLogger(__name__)
 
+# Bumped when the rollup triggers change; older databases get them recreated and the rollups rebuilt
+ROLLUP_VERSION = 3
+ROLLUP_TRIGGERS = ('trg_followers_insert_rollup', 'trg_followers_delete_rollup', 'trg_followers_update_rollup',
+                   'trg_trades_insert_rollup', 'trg_trades_pnl_rollup', 'trg_trades_unfilled_rollup',
+                   'trg_trades_quantity_rollup')
+
 
 class DatabaseManager:
     """
@@ -13,13 +24,26 @@ class DatabaseManager:
     Handles all data persistence
     """
 
-    def __init__(self, db_path: str = "./data/trades.db"):
+    def __init__(self, db_path: str = "./data/trades.db", archive_dir: str = None, vault=None):
         self.db_path = db_path
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(db_path) or '.', 'archive')
+        # With a CredentialVault, API keys/secrets and follower tokens are stored encrypted
+        self.vault = vault
         self._init_database()
 
+    def _seal(self, field: str, account_id: str, value: str) -> str:
+        return self.vault.encrypt(field, account_id, value) if self.vault else value
+
+    def _reveal(self, field: str, account_id: str, value: str) -> Optional[str]:
+        return self.vault.reveal(field, account_id, value) if self.vault else value
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; statements on it are timed while profiling is enabled"""
+        return sqlite3.connect(self.db_path, factory=connection_factory())
+
     def _init_database(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         # Master Account Table
@@ -69,6 +93,8 @@ class DatabaseManager:
                 order_type TEXT NOT NULL,
                 order_id TEXT UNIQUE,
                 follower_order_id TEXT,
+                master_order_id TEXT,
+                parent_order_id TEXT,
                 status TEXT DEFAULT 'pending',
                 fill_percentage REAL DEFAULT 0,
                 filled_quantity REAL DEFAULT 0,
@@ -112,19 +138,206 @@ class DatabaseManager:
             )
         ''')
 
+        # End-of-day Position Snapshots
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS position_snapshots (
+                snapshot_date DATE NOT NULL,
+                master_account_id TEXT NOT NULL,
+                follower_id TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                quantity REAL NOT NULL,
+                avg_price REAL DEFAULT 0,
+                PRIMARY KEY (snapshot_date, follower_id, symbol)
+            )
+        ''')
+
+        self._migrate_schema(cursor)
+        self._init_rollups(cursor)
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_parent_order ON trades(parent_order_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_master_order ON trades(master_order_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(master_account_id, status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_master_time ON trades(master_account_id, entry_time)')
+
         conn.commit()
         conn.close()
         logger.info("✓ Database initialized successfully")
 
+    def _migrate_schema(self, cursor):
+        """Add columns introduced after the initial schema to existing databases"""
+        cursor.execute('PRAGMA table_info(trades)')
+        trade_columns = {row[1] for row in cursor.fetchall()}
+
+        if 'parent_order_id' not in trade_columns:
+            cursor.execute('ALTER TABLE trades ADD COLUMN parent_order_id TEXT')
+        if 'master_order_id' not in trade_columns:
+            cursor.execute('ALTER TABLE trades ADD COLUMN master_order_id TEXT')
+
+    def _init_rollups(self, cursor):
+        """
+        Create rollup tables and the triggers that keep them current
+        Summary views read these instead of scanning follower_accounts / trades;
+        archival deletes do not fire a trigger, so history totals survive it.
+        entry_time is stored in UTC; trades are bucketed by their local (IST)
+        trading day
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'master_rollups'")
+        needs_backfill = cursor.fetchone() is None
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < ROLLUP_VERSION:
+            for trigger in ROLLUP_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            needs_backfill = True
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS master_rollups (
+                master_account_id TEXT PRIMARY KEY,
+                follower_count INTEGER DEFAULT 0,
+                total_investment REAL DEFAULT 0,
+                total_profit REAL DEFAULT 0,
+                trade_count INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS follower_daily_stats (
+                follower_id TEXT NOT NULL,
+                trade_date DATE NOT NULL,
+                master_account_id TEXT NOT NULL,
+                trade_count INTEGER DEFAULT 0,
+                exposure REAL DEFAULT 0,
+                realized_pnl REAL DEFAULT 0,
+                PRIMARY KEY (follower_id, trade_date)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_follower_daily_stats_master
+            ON follower_daily_stats(master_account_id, trade_date)
+        ''')
+
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS trg_followers_insert_rollup AFTER INSERT ON follower_accounts
+            BEGIN
+                INSERT INTO master_rollups (master_account_id, follower_count, total_investment, total_profit)
+                VALUES (NEW.master_account_id, 1, NEW.investment_amount, NEW.profit_amount)
+                ON CONFLICT(master_account_id) DO UPDATE SET
+                    follower_count = follower_count + 1,
+                    total_investment = total_investment + excluded.total_investment,
+                    total_profit = total_profit + excluded.total_profit;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_followers_delete_rollup AFTER DELETE ON follower_accounts
+            BEGIN
+                UPDATE master_rollups SET
+                    follower_count = follower_count - 1,
+                    total_investment = total_investment - OLD.investment_amount,
+                    total_profit = total_profit - OLD.profit_amount
+                WHERE master_account_id = OLD.master_account_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_followers_update_rollup
+            AFTER UPDATE OF investment_amount, profit_amount, master_account_id ON follower_accounts
+            BEGIN
+                UPDATE master_rollups SET
+                    follower_count = follower_count - 1,
+                    total_investment = total_investment - OLD.investment_amount,
+                    total_profit = total_profit - OLD.profit_amount
+                WHERE master_account_id = OLD.master_account_id;
+                INSERT INTO master_rollups (master_account_id, follower_count, total_investment, total_profit)
+                VALUES (NEW.master_account_id, 1, NEW.investment_amount, NEW.profit_amount)
+                ON CONFLICT(master_account_id) DO UPDATE SET
+                    follower_count = follower_count + 1,
+                    total_investment = total_investment + excluded.total_investment,
+                    total_profit = total_profit + excluded.total_profit;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_trades_insert_rollup AFTER INSERT ON trades
+            BEGIN
+                INSERT INTO follower_daily_stats
+                    (follower_id, trade_date, master_account_id, trade_count, exposure, realized_pnl)
+                VALUES (NEW.follower_account_id, date(NEW.entry_time, 'localtime'), NEW.master_account_id, 1,
+                        NEW.quantity * NEW.price, COALESCE(NEW.pnl, 0))
+                ON CONFLICT(follower_id, trade_date) DO UPDATE SET
+                    trade_count = trade_count + 1,
+                    exposure = exposure + excluded.exposure,
+                    realized_pnl = realized_pnl + excluded.realized_pnl;
+                INSERT INTO master_rollups (master_account_id, trade_count) VALUES (NEW.master_account_id, 1)
+                ON CONFLICT(master_account_id) DO UPDATE SET trade_count = trade_count + 1;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_trades_pnl_rollup AFTER UPDATE OF pnl ON trades
+            BEGIN
+                UPDATE follower_daily_stats
+                SET realized_pnl = realized_pnl + COALESCE(NEW.pnl, 0) - COALESCE(OLD.pnl, 0)
+                WHERE follower_id = OLD.follower_account_id AND trade_date = date(OLD.entry_time, 'localtime');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_trades_unfilled_rollup AFTER UPDATE OF status ON trades
+            WHEN NEW.status IN ('rejected', 'cancelled') AND OLD.status NOT IN ('rejected', 'cancelled')
+            BEGIN
+                UPDATE follower_daily_stats
+                SET exposure = exposure - (OLD.quantity - COALESCE(NEW.filled_quantity, 0)) * OLD.price
+                WHERE follower_id = OLD.follower_account_id AND trade_date = date(OLD.entry_time, 'localtime');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_trades_quantity_rollup AFTER UPDATE OF quantity ON trades
+            WHEN NEW.status NOT IN ('rejected', 'cancelled')
+            BEGIN
+                UPDATE follower_daily_stats
+                SET exposure = exposure + (NEW.quantity - OLD.quantity) * NEW.price
+                WHERE follower_id = OLD.follower_account_id AND trade_date = date(OLD.entry_time, 'localtime');
+            END;
+        ''')
+
+        if needs_backfill:
+            self._rebuild_rollups(cursor)
+        cursor.execute(f'PRAGMA user_version = {ROLLUP_VERSION}')
+
+    def _rebuild_rollups(self, cursor):
+        """Recompute rollup tables from follower_accounts and trades"""
+        cursor.execute('DELETE FROM master_rollups')
+        cursor.execute('DELETE FROM follower_daily_stats')
+        cursor.execute('''
+            INSERT INTO master_rollups (master_account_id, follower_count, total_investment, total_profit)
+            SELECT master_account_id, COUNT(*), SUM(investment_amount), SUM(profit_amount)
+            FROM follower_accounts GROUP BY master_account_id
+        ''')
+        cursor.execute('''
+            INSERT INTO follower_daily_stats
+                (follower_id, trade_date, master_account_id, trade_count, exposure, realized_pnl)
+            SELECT follower_account_id, date(entry_time, 'localtime'), MAX(master_account_id), COUNT(*),
+                   SUM(CASE WHEN status IN ('rejected', 'cancelled')
+                            THEN COALESCE(filled_quantity, 0) ELSE quantity END * price),
+                   SUM(COALESCE(pnl, 0))
+            FROM trades GROUP BY follower_account_id, date(entry_time, 'localtime')
+        ''')
+        cursor.execute('''
+            INSERT INTO master_rollups (master_account_id, trade_count)
+            SELECT master_account_id, COUNT(*) FROM trades WHERE true GROUP BY master_account_id
+            ON CONFLICT(master_account_id) DO UPDATE SET trade_count = excluded.trade_count
+        ''')
+
+    def rebuild_rollups(self) -> bool:
+        """Recompute all rollups (e.g. after manual edits to the database)"""
+        try:
+            conn = self._connect()
+            self._rebuild_rollups(conn.cursor())
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error rebuilding rollups: {str(e)}")
+            return False
+
     def add_master_account(self, account_id: str, account_name: str, api_key: str, api_secret: str) -> bool:
         """Add master account to database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO master_accounts (account_id, account_name, api_key, api_secret, status)
                 VALUES (?, ?, ?, ?, 'active')
-            ''', (account_id, account_name, api_key, api_secret))
+            ''', (account_id, account_name, self._seal('master_accounts.api_key', account_id, api_key),
+                  self._seal('master_accounts.api_secret', account_id, api_secret)))
             conn.commit()
             conn.close()
             logger.info(f"✓ Master account added: {account_name}")
@@ -140,13 +353,15 @@ class DatabaseManager:
                             follower_token: str, lot_multiplier: float, master_account_id: str) -> bool:
         """Add follower account"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO follower_accounts 
                 (follower_id, account_name, account_id, follower_token, lot_multiplier, master_account_id)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (follower_id, account_name, account_id, follower_token, lot_multiplier, master_account_id))
+            ''', (follower_id, account_name, account_id,
+                  self._seal('follower_accounts.follower_token', follower_id, follower_token),
+                  lot_multiplier, master_account_id))
             conn.commit()
             conn.close()
             logger.info(f"✓ Follower account added: {account_name}")
@@ -158,10 +373,58 @@ class DatabaseManager:
             logger.error(f"Error adding follower: {str(e)}")
             return False
 
+    def upsert_followers(self, master_account_id: str, followers: List[Dict]) -> bool:
+        """
+        Insert or update followers and their risk_management rows in one transaction
+        followers: [{follower_id, account_name, account_id, follower_token, lot_multiplier,
+                     investment_amount, daily_loss_limit, max_exposure_per_symbol, per_account_cap}]
+        Returns: False (nothing written) if any row fails
+        """
+        if not followers:
+            return True
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany('''
+                        INSERT INTO follower_accounts
+                        (follower_id, account_name, account_id, follower_token, lot_multiplier,
+                         investment_amount, master_account_id)
+                        VALUES (:follower_id, :account_name, :account_id, :follower_token, :lot_multiplier,
+                                :investment_amount, :master_account_id)
+                        ON CONFLICT(follower_id) DO UPDATE SET
+                            account_name = excluded.account_name,
+                            follower_token = excluded.follower_token,
+                            lot_multiplier = excluded.lot_multiplier,
+                            investment_amount = excluded.investment_amount,
+                            updated_at = CURRENT_TIMESTAMP
+                    ''', [{**f, 'master_account_id': master_account_id,
+                           'follower_token': self._seal('follower_accounts.follower_token', f['follower_id'],
+                                                        f['follower_token'])}
+                          for f in followers])
+                    conn.executemany('''
+                        INSERT INTO risk_management
+                        (account_id, daily_loss_limit, max_exposure_per_symbol, lot_multiplier, per_account_cap)
+                        VALUES (:follower_id, :daily_loss_limit, :max_exposure_per_symbol, :lot_multiplier,
+                                :per_account_cap)
+                        ON CONFLICT(account_id) DO UPDATE SET
+                            daily_loss_limit = excluded.daily_loss_limit,
+                            max_exposure_per_symbol = excluded.max_exposure_per_symbol,
+                            lot_multiplier = excluded.lot_multiplier,
+                            per_account_cap = excluded.per_account_cap
+                    ''', followers)
+            finally:
+                conn.close()
+            logger.info(f"✓ {len(followers)} follower accounts saved")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving followers: {str(e)}")
+            return False
+
     def remove_follower_account(self, follower_id: str) -> bool:
         """Remove follower account"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             cursor.execute('DELETE FROM follower_accounts WHERE follower_id = ?', (follower_id,))
             conn.commit()
@@ -172,26 +435,85 @@ class DatabaseManager:
             logger.error(f"Error removing follower: {str(e)}")
             return False
 
-    def get_all_followers(self, master_account_id: str) -> List[Dict]:
+    def get_all_followers(self, master_account_id: str) -> List[Follower]:
         """Get all follower accounts for a master account"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self._connect()
+            conn.row_factory = row_factory(Follower)
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM follower_accounts WHERE master_account_id = ?
             ''', (master_account_id,))
             rows = cursor.fetchall()
             conn.close()
-            return [dict(row) for row in rows]
+            return rows
         except Exception as e:
             logger.error(f"Error fetching followers: {str(e)}")
             return []
 
+    def get_master_credentials(self, account_id: str) -> Optional[Tuple[str, str]]:
+        """(api_key, api_secret) of a master account, decrypted through the vault's session cache"""
+        account = self.get_master_account(account_id)
+        if not account:
+            return None
+        try:
+            api_key = self._reveal('master_accounts.api_key', account_id, account['api_key'])
+            api_secret = self._reveal('master_accounts.api_secret', account_id, account['api_secret'])
+        except Exception as e:
+            logger.error(f"Error decrypting master credentials: {str(e)}")
+            return None
+        return (api_key, api_secret) if api_key is not None and api_secret is not None else None
+
+    def get_follower_token(self, follower_id: str) -> Optional[str]:
+        """Decrypted follower session token"""
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT follower_token FROM follower_accounts WHERE follower_id = ?',
+                               (follower_id,)).fetchone()
+            conn.close()
+            return self._reveal('follower_accounts.follower_token', follower_id, row[0]) if row else None
+        except Exception as e:
+            logger.error(f"Error fetching follower token: {str(e)}")
+            return None
+
+    def encrypt_stored_credentials(self) -> int:
+        """Encrypt plaintext secrets stored before the vault was enabled; returns values encrypted"""
+        if not self.vault:
+            return 0
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    masters = conn.execute('SELECT account_id, api_key, api_secret FROM master_accounts').fetchall()
+                    master_updates = [
+                        (self._seal('master_accounts.api_key', account_id, api_key),
+                         self._seal('master_accounts.api_secret', account_id, api_secret), account_id)
+                        for account_id, api_key, api_secret in masters
+                        if not (self.vault.is_encrypted(api_key) and self.vault.is_encrypted(api_secret))
+                    ]
+                    conn.executemany('UPDATE master_accounts SET api_key = ?, api_secret = ? WHERE account_id = ?',
+                                     master_updates)
+                    followers = conn.execute('SELECT follower_id, follower_token FROM follower_accounts').fetchall()
+                    follower_updates = [
+                        (self._seal('follower_accounts.follower_token', follower_id, token), follower_id)
+                        for follower_id, token in followers if token and not self.vault.is_encrypted(token)
+                    ]
+                    conn.executemany('UPDATE follower_accounts SET follower_token = ? WHERE follower_id = ?',
+                                     follower_updates)
+            finally:
+                conn.close()
+            count = len(master_updates) + len(follower_updates)
+            if count:
+                logger.info(f"✓ Encrypted credentials of {count} accounts")
+            return count
+        except Exception as e:
+            logger.error(f"Error encrypting stored credentials: {str(e)}")
+            return 0
+
     def get_master_account(self, account_id: str) -> Optional[Dict]:
         """Get master account details"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM master_accounts WHERE account_id = ?', (account_id,))
@@ -203,28 +525,64 @@ class DatabaseManager:
             return None
 
     def record_trade(self, master_account_id: str, follower_account_id: str, symbol: str,
-                    side: str, quantity: float, price: float, order_type: str, order_id: str = None) -> bool:
-        """Record trade execution"""
+                    side: str, quantity: float, price: float, order_type: str, order_id: str = None,
+                    parent_order_id: str = None, master_order_id: str = None) -> bool:
+        """
+        Record trade execution
+
+        order_id is the follower's broker order id (also stored as follower_order_id),
+        master_order_id links it to the master order it mirrors and child orders of
+        a sliced order share a parent_order_id
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO trades 
-                (master_account_id, follower_account_id, symbol, side, quantity, price, order_type, order_id, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending')
-            ''', (master_account_id, follower_account_id, symbol, side, quantity, price, order_type, order_id))
+                (master_account_id, follower_account_id, symbol, side, quantity, price, order_type, order_id,
+                 follower_order_id, master_order_id, parent_order_id, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
+            ''', (master_account_id, follower_account_id, symbol, side, quantity, price, order_type, order_id,
+                  order_id, master_order_id, parent_order_id))
             conn.commit()
             conn.close()
-            logger.info(f"✓ Trade recorded: {symbol} {side} {quantity}")
+            logger.debug("✓ Trade recorded: %s %s %s", symbol, side, quantity)
             return True
         except Exception as e:
             logger.error(f"Error recording trade: {str(e)}")
             return False
 
+    def record_trades(self, trades: List[Dict]) -> bool:
+        """
+        Record many trade executions in one transaction
+        trades: dicts with the record_trade arguments as keys
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO trades
+                (master_account_id, follower_account_id, symbol, side, quantity, price, order_type, order_id,
+                 follower_order_id, master_order_id, parent_order_id, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
+            ''', [
+                (t['master_account_id'], t['follower_account_id'], t['symbol'], t['side'], t['quantity'],
+                 t['price'], t['order_type'], t.get('order_id'), t.get('order_id'), t.get('master_order_id'),
+                 t.get('parent_order_id'))
+                for t in trades
+            ])
+            conn.commit()
+            conn.close()
+            logger.debug("✓ Recorded %d trades", len(trades))
+            return True
+        except Exception as e:
+            logger.error(f"Error recording trades: {str(e)}")
+            return False
+
     def update_trade_status(self, order_id: str, status: str, fill_percentage: float = 0) -> bool:
         """Update trade status"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE trades SET status = ?, fill_percentage = ? WHERE order_id = ?
@@ -236,28 +594,421 @@ class DatabaseManager:
             logger.error(f"Error updating trade: {str(e)}")
             return False
 
-    def get_recent_trades(self, follower_id: str, limit: int = 50) -> List[Dict]:
-        """Get recent trades for a follower"""
+    def update_trade_statuses(self, updates: List[Dict]) -> bool:
+        """
+        Apply a batch of trade status/fill updates in a single transaction
+
+        updates: [{order_id, status, fill_percentage, filled_quantity}, ...]
+        """
+        if not updates:
+            return True
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE trades SET status = ?, fill_percentage = ?, filled_quantity = ? WHERE order_id = ?
+            ''', [(u['status'], u['fill_percentage'], u['filled_quantity'], u['order_id']) for u in updates])
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error updating trades: {str(e)}")
+            return False
+
+    def get_existing_order_ids(self, order_ids: List[str]) -> set:
+        """Subset of broker order ids already recorded in the trades table"""
+        found = set()
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            for i in range(0, len(order_ids), 500):
+                chunk = order_ids[i:i + 500]
+                cursor.execute(
+                    f"SELECT order_id FROM trades WHERE order_id IN ({', '.join('?' * len(chunk))})", chunk
+                )
+                found.update(row[0] for row in cursor.fetchall())
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error checking recorded orders: {str(e)}")
+        return found
+
+    def get_open_trades(self, master_account_id: str) -> List[Trade]:
+        """Get non-terminal trades with the broker account they were placed on"""
+        try:
+            conn = self._connect()
+            conn.row_factory = row_factory(Trade)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT t.order_id, t.quantity, t.status, t.fill_percentage, t.filled_quantity,
+                       t.follower_account_id, t.symbol, t.side, t.price, f.account_id
+                FROM trades t
+                JOIN follower_accounts f ON f.follower_id = t.follower_account_id
+                WHERE t.master_account_id = ? AND t.order_id IS NOT NULL
+                  AND t.status NOT IN ('filled', 'rejected', 'cancelled')
+            ''', (master_account_id,))
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
+        except Exception as e:
+            logger.error(f"Error fetching open trades: {str(e)}")
+            return []
+
+    def get_follower_orders(self, master_order_id: str) -> List[Dict]:
+        """Get all follower child orders mirroring a master order"""
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT t.follower_account_id AS follower_id, f.account_id, f.lot_multiplier,
+                       t.follower_order_id, t.symbol, t.side, t.quantity, t.price, t.order_type,
+                       t.parent_order_id, t.status, t.filled_quantity
+                FROM trades t
+                JOIN follower_accounts f ON f.follower_id = t.follower_account_id
+                WHERE t.master_order_id = ? AND t.follower_order_id IS NOT NULL
+                ORDER BY t.id
+            ''', (master_order_id,))
+            rows = cursor.fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error fetching follower orders: {str(e)}")
+            return []
+
+    def update_follower_order_quantity(self, follower_order_id: str, quantity: float) -> bool:
+        """Store the quantity of a follower child order after a modification"""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('UPDATE trades SET quantity = ? WHERE follower_order_id = ?',
+                           (quantity, follower_order_id))
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error updating follower order quantity: {str(e)}")
+            return False
+
+    def get_traded_symbols(self, master_account_id: str) -> List[str]:
+        """Get distinct symbols traded by the followers of a master account"""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT DISTINCT symbol FROM trades
+                WHERE master_account_id = ? AND status NOT IN ('rejected', 'cancelled')
+            ''', (master_account_id,))
+            rows = cursor.fetchall()
+            conn.close()
+            return [row[0] for row in rows]
+        except Exception as e:
+            logger.error(f"Error fetching traded symbols: {str(e)}")
+            return []
+
+    def get_follower_net_positions(self, master_account_id: str) -> List[Dict]:
+        """Get net filled quantity and average fill price per follower and symbol"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
+            cursor.execute('''
+                SELECT follower_account_id AS follower_id, symbol,
+                       SUM(CASE WHEN UPPER(side) = 'SELL' THEN -filled_quantity ELSE filled_quantity END) AS quantity,
+                       SUM(filled_quantity * price) / SUM(filled_quantity) AS avg_price
+                FROM trades
+                WHERE master_account_id = ? AND filled_quantity > 0
+                GROUP BY follower_account_id, symbol
+            ''', (master_account_id,))
+            rows = cursor.fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error fetching follower positions: {str(e)}")
+            return []
+
+    def get_recent_trades(self, follower_id: str, limit: int = 50, include_archived: bool = False) -> List[Trade]:
+        """Get recent trades for a follower (optionally continuing into archived months)"""
+        try:
+            conn = self._connect()
+            conn.row_factory = row_factory(Trade)
+            cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM trades WHERE follower_account_id = ?
                 ORDER BY entry_time DESC LIMIT ?
             ''', (follower_id, limit))
             rows = cursor.fetchall()
             conn.close()
-            return [dict(row) for row in rows]
+
+            # Walk archives newest month first until the limit is filled
+            if include_archived:
+                for archive_path in reversed(self.get_archive_files()):
+                    if len(rows) >= limit:
+                        break
+                    rows.extend(self._query_archive(
+                        archive_path,
+                        'SELECT * FROM trades WHERE follower_account_id = ? ORDER BY entry_time DESC LIMIT ?',
+                        (follower_id, limit - len(rows)),
+                        Trade
+                    ))
+            return rows
+        except Exception as e:
+            logger.error(f"Error fetching trades: {str(e)}")
+            return []
+
+    def get_trades_between(self, master_account_id: str, start: str, end: str,
+                           include_archived: bool = False) -> List[Trade]:
+        """
+        Get all trades of a master account with entry_time in [start, end)
+        start/end: ISO dates or timestamps, e.g. '2026-01-01'
+        """
+        query = '''
+            SELECT * FROM trades
+            WHERE master_account_id = ? AND entry_time >= ? AND entry_time < ?
+            ORDER BY entry_time
+        '''
+        params = (master_account_id, start, end)
+        try:
+            rows = []
+            if include_archived:
+                for archive_path in self.get_archive_files(start[:7], end[:7]):
+                    rows.extend(self._query_archive(archive_path, query, params, Trade))
+
+            conn = self._connect()
+            conn.row_factory = row_factory(Trade)
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows.extend(cursor.fetchall())
+            conn.close()
+            if include_archived:
+                rows.sort(key=lambda row: row['entry_time'] or '')
+            return rows
         except Exception as e:
             logger.error(f"Error fetching trades: {str(e)}")
             return []
 
+    def get_performance_summary(self, master_account_id: str, start: str = None, end: str = None,
+                                follower_id: str = None, include_archived: bool = False) -> Dict[str, Dict]:
+        """
+        Aggregate performance of every follower of a master in SQL
+        Win/loss counts, total/avg P&L and max drawdown (peak-to-trough of
+        cumulative P&L in entry order) plus a per-symbol breakdown
+        start/end: optional entry_time bounds [start, end)
+        Returns: {follower_id: report}
+        """
+        clauses, params = ['master_account_id = ?'], [master_account_id]
+        if follower_id:
+            clauses.append('follower_account_id = ?')
+            params.append(follower_id)
+        if start:
+            clauses.append('entry_time >= ?')
+            params.append(start)
+        if end:
+            clauses.append('entry_time < ?')
+            params.append(end)
+        where = ' AND '.join(clauses)
+
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            sources = ['main.trades']
+            if include_archived:
+                archives = self.get_archive_files(start[:7] if start else None, end[:7] if end else None)
+                for i, archive_path in enumerate(archives):
+                    cursor.execute(f"ATTACH DATABASE ? AS archive{i}", (archive_path,))
+                    sources.insert(i, f"archive{i}.trades")
+            columns = 'id, follower_account_id, symbol, COALESCE(pnl, 0) AS pnl, entry_time'
+            filtered = ' UNION ALL '.join(f"SELECT {columns} FROM {source} WHERE {where}" for source in sources)
+            all_params = tuple(params) * len(sources)
+
+            cursor.execute(f'''
+                WITH filtered AS ({filtered}),
+                equity AS (
+                    SELECT follower_account_id, pnl, entry_time, id,
+                           SUM(pnl) OVER w AS cumulative
+                    FROM filtered
+                    WINDOW w AS (PARTITION BY follower_account_id ORDER BY entry_time, id
+                                 ROWS UNBOUNDED PRECEDING)
+                ),
+                drawdown AS (
+                    SELECT follower_account_id, pnl, cumulative,
+                           MAX(0, MAX(cumulative) OVER (PARTITION BY follower_account_id
+                                                       ORDER BY entry_time, id
+                                                       ROWS UNBOUNDED PRECEDING)) - cumulative AS drawdown
+                    FROM equity
+                )
+                SELECT follower_account_id,
+                       COUNT(*) AS total_trades,
+                       SUM(pnl > 0) AS winning_trades,
+                       SUM(pnl < 0) AS losing_trades,
+                       SUM(pnl) AS total_pnl,
+                       AVG(pnl) AS avg_pnl,
+                       MAX(drawdown) AS max_drawdown
+                FROM drawdown
+                GROUP BY follower_account_id
+            ''', all_params)
+            reports = {}
+            for row in cursor.fetchall():
+                report = dict(row)
+                report['follower_id'] = report.pop('follower_account_id')
+                report['win_rate'] = report['winning_trades'] / report['total_trades'] * 100
+                report['symbols'] = {}
+                reports[report['follower_id']] = report
+
+            cursor.execute(f'''
+                SELECT follower_account_id, symbol,
+                       COUNT(*) AS total_trades,
+                       SUM(pnl > 0) AS winning_trades,
+                       SUM(pnl < 0) AS losing_trades,
+                       SUM(pnl) AS total_pnl,
+                       AVG(pnl) AS avg_pnl
+                FROM ({filtered})
+                GROUP BY follower_account_id, symbol
+            ''', all_params)
+            for row in cursor.fetchall():
+                breakdown = dict(row)
+                follower = breakdown.pop('follower_account_id')
+                breakdown['win_rate'] = breakdown['winning_trades'] / breakdown['total_trades'] * 100
+                reports[follower]['symbols'][breakdown.pop('symbol')] = breakdown
+
+            conn.close()
+            return reports
+        except Exception as e:
+            logger.error(f"Error computing performance summary: {str(e)}")
+            return {}
+
+    def get_master_orders(self, master_account_id: str, start: str = None, end: str = None) -> List[Dict]:
+        """
+        Reconstruct the master's order stream from mirrored trades
+        One row per master_order_id (earliest entry_time); the master quantity
+        is the follower quantity (summed over slices) divided back by the
+        lot_multiplier of the follower with the largest multiplier
+        Returns: [{order_id, timestamp, symbol, side, quantity, price, order_type}]
+        """
+        clauses = ["t.master_account_id = ?", "t.master_order_id IS NOT NULL", "t.status != 'rejected'"]
+        params = [master_account_id]
+        if start:
+            clauses.append('t.entry_time >= ?')
+            params.append(start)
+        if end:
+            clauses.append('t.entry_time < ?')
+            params.append(end)
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            # Bare columns next to MAX(lot_multiplier) come from the row holding the maximum
+            cursor.execute(f'''
+                SELECT master_order_id AS order_id, MIN(entry_time) AS timestamp, symbol, side,
+                       price, order_type, ROUND(follower_quantity / lot_multiplier) AS quantity,
+                       MAX(lot_multiplier) AS lot_multiplier
+                FROM (
+                    SELECT t.master_order_id, MIN(t.entry_time) AS entry_time, t.symbol, t.side,
+                           MAX(t.price) AS price, t.order_type, SUM(t.quantity) AS follower_quantity,
+                           COALESCE(NULLIF(f.lot_multiplier, 0), 1) AS lot_multiplier
+                    FROM trades t
+                    LEFT JOIN follower_accounts f ON f.follower_id = t.follower_account_id
+                    WHERE {' AND '.join(clauses)}
+                    GROUP BY t.master_order_id, t.follower_account_id
+                )
+                GROUP BY master_order_id
+                ORDER BY timestamp
+            ''', params)
+            rows = [dict(row) for row in cursor.fetchall()]
+            conn.close()
+            for row in rows:
+                row.pop('lot_multiplier')
+            return rows
+        except Exception as e:
+            logger.error(f"Error reconstructing master orders: {str(e)}")
+            return []
+
+    def get_risk_limits(self, master_account_id: str) -> Dict[str, Dict]:
+        """Configured risk_management rows of a master's followers: {follower_id: limits}"""
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT r.* FROM risk_management r
+                JOIN follower_accounts f ON f.follower_id = r.account_id
+                WHERE f.master_account_id = ?
+            ''', (master_account_id,))
+            rows = cursor.fetchall()
+            conn.close()
+            return {row['account_id']: dict(row) for row in rows}
+        except Exception as e:
+            logger.error(f"Error fetching risk limits: {str(e)}")
+            return {}
+
+    def get_archive_files(self, start_month: str = None, end_month: str = None) -> List[str]:
+        """
+        Monthly archive databases in chronological order
+        start_month/end_month: 'YYYY-MM' bounds (inclusive)
+        """
+        archives = []
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, 'trades_*.db'))):
+            month = os.path.basename(path)[len('trades_'):-len('.db')].replace('_', '-')
+            if start_month and month < start_month:
+                continue
+            if end_month and month > end_month:
+                continue
+            archives.append(path)
+        return archives
+
+    def _query_archive(self, archive_path: str, query: str, params: tuple, model_cls=None) -> List:
+        """Run a read-only query against one archive database (rows as model_cls, or dicts)"""
+        conn = sqlite3.connect(f"file:{archive_path}?mode=ro", uri=True)
+        conn.row_factory = row_factory(model_cls) if model_cls else sqlite3.Row
+        try:
+            rows = conn.execute(query, params).fetchall()
+            return rows if model_cls else [dict(row) for row in rows]
+        except sqlite3.OperationalError:
+            return []
+        finally:
+            conn.close()
+
+    def get_recent_orders(self, follower_id: str, limit: int = 50) -> List[Dict]:
+        """
+        Get recent orders for a follower with child orders of a sliced order
+        aggregated into their parent (quantity-weighted fill percentage)
+        """
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COALESCE(parent_order_id, order_id, 'T' || id) AS order_ref,
+                       MIN(entry_time) AS entry_time,
+                       symbol,
+                       side,
+                       follower_account_id,
+                       SUM(quantity) AS quantity,
+                       SUM(quantity * price) / SUM(quantity) AS price,
+                       SUM(quantity * fill_percentage) / SUM(quantity) AS fill_percentage,
+                       SUM(filled_quantity) AS filled_quantity,
+                       SUM(pnl) AS pnl,
+                       COUNT(*) AS child_count,
+                       CASE WHEN MIN(status) = MAX(status) THEN MIN(status)
+                            ELSE 'partially_filled' END AS status
+                FROM trades
+                WHERE follower_account_id = ?
+                GROUP BY order_ref
+                ORDER BY entry_time DESC LIMIT ?
+            ''', (follower_id, limit))
+            rows = cursor.fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error fetching orders: {str(e)}")
+            return []
+
     def log_trade_action(self, account_id: str, action: str, symbol: str = None,
                         quantity: float = None, price: float = None, reason: str = None) -> bool:
         """Log trade actions and interventions"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO trade_logs (account_id, action, symbol, quantity, price, reason)
@@ -270,17 +1021,106 @@ class DatabaseManager:
             logger.error(f"Error logging action: {str(e)}")
             return False
 
+    def log_trade_actions(self, entries: List[Dict]) -> bool:
+        """Log many trade actions in one transaction (dicts with log_trade_action arguments as keys)"""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO trade_logs (account_id, action, symbol, quantity, price, reason)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (e['account_id'], e['action'], e.get('symbol'), e.get('quantity'), e.get('price'), e.get('reason'))
+                for e in entries
+            ])
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error logging actions: {str(e)}")
+            return False
+
     def update_follower_pnl(self, follower_id: str, profit: float) -> bool:
         """Update follower P&L"""
+        return self.update_follower_pnls({follower_id: profit})
+
+    def update_follower_pnls(self, profits: Dict[str, float]) -> bool:
+        """Add P&L deltas {follower_id: profit} for many followers in one transaction"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 UPDATE follower_accounts SET profit_amount = profit_amount + ? WHERE follower_id = ?
-            ''', (profit, follower_id))
+            ''', [(profit, follower_id) for follower_id, profit in profits.items()])
             conn.commit()
             conn.close()
             return True
         except Exception as e:
             logger.error(f"Error updating P&L: {str(e)}")
             return False
+
+    def save_position_snapshot(self, master_account_id: str, books: Dict[str, Dict[str, Dict]],
+                               snapshot_date: str = None) -> bool:
+        """Store follower books {follower_id: {symbol: {quantity, avg_price}}} for a date (default today)"""
+        snapshot_date = snapshot_date or datetime.now().date().isoformat()
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM position_snapshots WHERE snapshot_date = ? AND master_account_id = ?
+            ''', (snapshot_date, master_account_id))
+            cursor.executemany('''
+                INSERT INTO position_snapshots
+                (snapshot_date, master_account_id, follower_id, symbol, quantity, avg_price)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (snapshot_date, master_account_id, follower_id, symbol, position['quantity'], position['avg_price'])
+                for follower_id, book in books.items()
+                for symbol, position in book.items()
+                if position['quantity']
+            ])
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error saving position snapshot: {str(e)}")
+            return False
+
+    def get_master_rollup(self, master_account_id: str) -> Dict:
+        """Precomputed follower count, investment, profit and trade count of a master"""
+        rollup = {'master_account_id': master_account_id, 'follower_count': 0,
+                  'total_investment': 0, 'total_profit': 0, 'trade_count': 0}
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM master_rollups WHERE master_account_id = ?', (master_account_id,))
+            row = cursor.fetchone()
+            conn.close()
+            if row:
+                rollup.update(dict(row))
+            return rollup
+        except Exception as e:
+            logger.error(f"Error fetching master rollup: {str(e)}")
+            return rollup
+
+    def get_daily_stats(self, master_account_id: str, trade_date: str = None) -> Dict[str, Dict]:
+        """
+        Per-follower trade count, exposure and realized P&L for one day (default today, local time)
+        Returns: {follower_id: stats}
+        """
+        try:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT follower_id, trade_date, trade_count, exposure, realized_pnl
+                FROM follower_daily_stats
+                WHERE master_account_id = ? AND trade_date = COALESCE(?, date('now', 'localtime'))
+            ''', (master_account_id, trade_date))
+            rows = cursor.fetchall()
+            conn.close()
+            return {row['follower_id']: dict(row) for row in rows}
+        except Exception as e:
+            logger.error(f"Error fetching daily stats: {str(e)}")
+            return {}
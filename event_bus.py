@@ -0,0 +1,232 @@
+"""
+Trade Mirroring System - Event Bus
+In-process publish/subscribe with priority lanes, bounded queues and batched delivery
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes, drained in this order
+HIGH = 0
+NORMAL = 1
+LOW = 2
+LANES = (HIGH, NORMAL, LOW)
+LANE_NAMES = {HIGH: 'high', NORMAL: 'normal', LOW: 'low'}
+
+
+@dataclass(frozen=True)
+class Event:
+    """Base event; subclasses set the lane they are published on"""
+    timestamp: float = field(default_factory=time.time, kw_only=True)
+    priority = NORMAL
+
+
+@dataclass(frozen=True)
+class OrderPlaced(Event):
+    """A follower (child) order was accepted by the broker"""
+    master_account_id: str
+    follower_id: str
+    account_id: str
+    symbol: str
+    side: str
+    quantity: float
+    price: float
+    order_type: str
+    order_id: Optional[str]
+    parent_order_id: Optional[str] = None
+    master_order_id: Optional[str] = None
+    intent_id: Optional[str] = None  # order journal entry to close once persisted
+    priority = HIGH
+
+
+@dataclass(frozen=True)
+class FillUpdated(Event):
+    """New filled quantity on a tracked follower order"""
+    order_id: str
+    follower_id: str
+    symbol: str
+    side: str
+    quantity: float
+    price: float
+    priority = NORMAL
+
+
+@dataclass(frozen=True)
+class RiskBlocked(Event):
+    """A risk rule blocked or flagged a follower trade"""
+    follower_id: str
+    action: str
+    reason: str
+    symbol: Optional[str] = None
+    quantity: Optional[float] = None
+    price: Optional[float] = None
+    priority = NORMAL
+
+
+@dataclass(frozen=True)
+class PositionDrift(Event):
+    """Cached follower position differed from the broker during reconciliation"""
+    follower_id: str
+    symbol: str
+    cached: float
+    actual: float
+    priority = LOW
+
+
+class EventBus:
+    """
+    Event Bus
+    Publishers enqueue and return immediately; one dispatcher thread drains
+    the high lane before normal and low, and hands each subscriber up to
+    batch_size events per call. When a lane is full the publisher gets
+    backpressure: high-lane events (placed orders, which must be persisted)
+    wait for space, normal-lane events wait at most publish_timeout and
+    low-lane events are dropped at once; drops are counted per lane
+    """
+
+    def __init__(self, queue_size: int = None, batch_size: int = None, publish_timeout: float = None):
+        self.queue_size = queue_size or config.EVENT_BUS_QUEUE_SIZE
+        self.batch_size = batch_size or config.EVENT_BUS_BATCH_SIZE
+        self.publish_timeout = (publish_timeout if publish_timeout is not None
+                                else config.EVENT_BUS_PUBLISH_TIMEOUT)
+        self._queues = {lane: queue.Queue(maxsize=self.queue_size) for lane in LANES}
+        self._subscribers: Dict[Type[Event], List[Tuple[Callable, bool]]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.published = {lane: 0 for lane in LANES}
+        self.dropped = {lane: 0 for lane in LANES}
+
+    def subscribe(self, event_type: Type[Event], handler: Callable, batch: bool = False):
+        """
+        Register a handler for an event type (and its subclasses)
+        batch=True handlers receive a list of events instead of one event per call
+        Handlers run on the dispatcher thread in subscription order
+        """
+        with self._lock:
+            self._subscribers.setdefault(event_type, []).append((handler, batch))
+
+    def unsubscribe(self, event_type: Type[Event], handler: Callable):
+        with self._lock:
+            self._subscribers[event_type] = [
+                (h, batch) for h, batch in self._subscribers.get(event_type, []) if h != handler
+            ]
+
+    def publish(self, event: Event) -> bool:
+        """Queue an event on its lane; returns False if it was dropped"""
+        lane = event.priority
+        try:
+            if lane == HIGH:
+                if self._queues[lane].full() and not (self._thread and self._thread.is_alive()):
+                    # Nobody is draining: deliver inline rather than block forever
+                    self.dispatch_once()
+                self._queues[lane].put(event)
+            elif lane == NORMAL and self.publish_timeout:
+                self._queues[lane].put(event, timeout=self.publish_timeout)
+            else:
+                self._queues[lane].put_nowait(event)
+        except queue.Full:
+            self.dropped[lane] += 1
+            if self.dropped[lane] % 1000 == 1:
+                logger.warning("Event bus %s lane full, dropped %d events", LANE_NAMES[lane], self.dropped[lane])
+            return False
+        self.published[lane] += 1
+        self._wake.set()
+        return True
+
+    def pending(self) -> int:
+        """Events queued but not yet dispatched"""
+        return sum(q.qsize() for q in self._queues.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            LANE_NAMES[lane]: {
+                'published': self.published[lane],
+                'dropped': self.dropped[lane],
+                'pending': self._queues[lane].qsize(),
+            }
+            for lane in LANES
+        }
+
+    def dispatch_once(self) -> int:
+        """
+        Deliver one batch from the highest-priority non-empty lane
+        Returns: number of events delivered
+        """
+        for lane in LANES:
+            events = self._drain(self._queues[lane])
+            if events:
+                self._deliver(events)
+                return len(events)
+        return 0
+
+    def _drain(self, lane_queue: queue.Queue) -> List[Event]:
+        events = []
+        try:
+            while len(events) < self.batch_size:
+                events.append(lane_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def _deliver(self, events: List[Event]):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        for event_type, handlers in subscribers:
+            matching = [event for event in events if isinstance(event, event_type)]
+            if not matching:
+                continue
+            for handler, batch in handlers:
+                try:
+                    if batch:
+                        handler(matching)
+                    else:
+                        for event in matching:
+                            handler(event)
+                except Exception as e:
+                    logger.error(f"Error in {event_type.__name__} subscriber: {str(e)}")
+
+    def flush(self, timeout: float = 5) -> bool:
+        """Deliver everything queued (on the caller's thread when the dispatcher is not running)"""
+        deadline = time.monotonic() + timeout
+        while self.pending() and time.monotonic() < deadline:
+            if self._thread and self._thread.is_alive():
+                self._wake.set()
+                time.sleep(0.001)
+            else:
+                self.dispatch_once()
+        return not self.pending()
+
+    def start(self):
+        """Start dispatcher thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="EventBus", daemon=True)
+        self._thread.start()
+        logger.info("✓ Event bus started")
+
+    def stop(self, drain: bool = True):
+        """Stop dispatcher thread, delivering queued events first unless drain=False"""
+        if drain:
+            self.flush()
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.dispatch_once():
+                self._wake.wait(0.1)
+                self._wake.clear()
@@ -0,0 +1,195 @@
+"""
+Trade Mirroring System - Follower Onboarding
+Bulk import and batch configuration of follower accounts from CSV/JSON
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import config
+from paper_broker import create_api_client
+from utils import validate_api_credentials
+
+logger = logging.getLogger(__name__)
+
+# Per-row outcomes
+ADDED = 'added'
+UPDATED = 'updated'
+EXISTS = 'exists'
+INVALID = 'invalid'
+AUTH_FAILED = 'auth_failed'
+FAILED = 'failed'
+
+
+def follower_id_for(master_account_id: str, account_id: str) -> str:
+    """Stable follower ID derived from the broker account, so it never collides after removals"""
+    return f"{master_account_id}_FOLLOWER_{re.sub(r'[^A-Za-z0-9]+', '_', account_id.strip()).upper()}"
+
+
+class FollowerOnboarding:
+    """
+    Follower Onboarding
+    Validates every row, authenticates the accounts concurrently, then writes
+    all accepted followers and their risk_management rows in one transaction.
+    Rows for accounts that already follow the master are reported as
+    'exists', or have their settings updated when update_existing is set
+    """
+
+    REQUIRED = ('account_name', 'account_id')
+
+    def __init__(self, db_manager, master_account_id: str, risk_manager=None, max_workers: int = None):
+        self.db = db_manager
+        self.master_account_id = master_account_id
+        self.risk_mgr = risk_manager
+        self.max_workers = max_workers or config.ONBOARDING_AUTH_WORKERS
+
+    @staticmethod
+    def load_file(filename: str) -> List[Dict]:
+        """Rows from a CSV file or a JSON list (or {"followers": [...]})"""
+        if os.path.splitext(filename)[1].lower() == '.json':
+            with open(filename) as f:
+                data = json.load(f)
+            return data.get('followers', []) if isinstance(data, dict) else data
+        with open(filename, newline='') as f:
+            return list(csv.DictReader(f))
+
+    def import_file(self, filename: str, authenticate: bool = True, update_existing: bool = False) -> List[Dict]:
+        return self.onboard(self.load_file(filename), authenticate, update_existing)
+
+    def onboard(self, rows: List[Dict], authenticate: bool = True, update_existing: bool = False) -> List[Dict]:
+        """
+        Add (or reconfigure) followers
+        authenticate: log in with each row's api_key/api_secret first; the
+        session token becomes the follower_token when the row has none
+        Returns: one result per row {row, account_id, follower_id, status, message}
+        """
+        existing = {f['account_id']: f['follower_id'] for f in self.db.get_all_followers(self.master_account_id)}
+        results, accepted, seen = [], [], set()
+
+        for number, row in enumerate(rows, start=1):
+            follower, error = self._parse_row(row, authenticate)
+            account_id = follower.get('account_id') if follower else str(row.get('account_id', ''))
+            result = {'row': number, 'account_id': account_id, 'follower_id': None, 'status': INVALID,
+                      'message': error}
+            results.append(result)
+            if error:
+                continue
+            if account_id in seen:
+                result['message'] = "Duplicate account in file"
+                continue
+            seen.add(account_id)
+
+            if account_id in existing:
+                result['follower_id'] = existing[account_id]
+                if not update_existing:
+                    result.update(status=EXISTS, message="Already a follower")
+                    continue
+                result['status'] = UPDATED
+            else:
+                result['follower_id'] = follower_id_for(self.master_account_id, account_id)
+                result['status'] = ADDED
+            follower['follower_id'] = result['follower_id']
+            accepted.append((result, follower))
+
+        if authenticate:
+            accepted = self._authenticate_all(accepted)
+
+        followers = [follower for _, follower in accepted]
+        if self.db.upsert_followers(self.master_account_id, followers):
+            for result, _ in accepted:
+                result['message'] = "Follower added" if result['status'] == ADDED else "Settings updated"
+            if self.risk_mgr:
+                self.risk_mgr.set_daily_loss_limits({f['follower_id']: f['daily_loss_limit'] for f in followers})
+        else:
+            for result, _ in accepted:
+                result.update(status=FAILED, message="Database write failed; no rows were saved")
+
+        counts = self.summarize(results)
+        logger.info(f"✓ Follower onboarding: {counts}")
+        return results
+
+    def _parse_row(self, row: Dict, authenticate: bool):
+        """Normalized follower dict, or (None, error message)"""
+        try:
+            row = {key.strip(): value.strip() if isinstance(value, str) else value
+                   for key, value in row.items() if key}
+            missing = [field for field in self.REQUIRED if not row.get(field)]
+            if missing:
+                return None, f"Missing {', '.join(missing)}"
+
+            if authenticate:
+                valid, message = validate_api_credentials(row.get('api_key', ''), row.get('api_secret', ''))
+                if not valid:
+                    return None, message
+            elif not row.get('follower_token'):
+                return None, "Missing follower_token"
+
+            lot_multiplier = float(row.get('lot_multiplier') or config.DEFAULT_LOT_MULTIPLIER)
+            if not 0.1 <= lot_multiplier <= 10:
+                return None, f"Lot multiplier out of range (0.1-10): {lot_multiplier}"
+
+            return {
+                'account_name': str(row['account_name']),
+                'account_id': str(row['account_id']),
+                'follower_token': row.get('follower_token') or '',
+                'api_key': row.get('api_key', ''),
+                'api_secret': row.get('api_secret', ''),
+                'lot_multiplier': lot_multiplier,
+                'investment_amount': float(row.get('investment_amount') or 0),
+                'daily_loss_limit': float(row.get('daily_loss_limit') or config.DAILY_LOSS_LIMIT),
+                'max_exposure_per_symbol': float(row.get('max_exposure_per_symbol') or config.MAX_EXPOSURE_PER_SYMBOL),
+                'per_account_cap': float(row.get('per_account_cap') or 0),
+            }, None
+        except (TypeError, ValueError) as e:
+            return None, f"Invalid number: {str(e)}"
+
+    def _authenticate_all(self, accepted: List) -> List:
+        """Log in to every accepted account in parallel; drops (and marks) the failures"""
+        if not accepted:
+            return accepted
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(accepted))) as executor:
+            tokens = list(executor.map(lambda item: self._authenticate(item[1]), accepted))
+
+        authenticated = []
+        for (result, follower), token in zip(accepted, tokens):
+            if token is None:
+                result.update(status=AUTH_FAILED, message="Authentication failed")
+                continue
+            follower['follower_token'] = follower['follower_token'] or token
+            authenticated.append((result, follower))
+        return authenticated
+
+    @staticmethod
+    def _authenticate(follower: Dict) -> Optional[str]:
+        try:
+            client = create_api_client(follower['api_key'], follower['api_secret'])
+            if client.authenticate():
+                return client.access_token or ''
+        except Exception as e:
+            logger.error(f"Error authenticating {follower['account_id']}: {str(e)}")
+        return None
+
+    @staticmethod
+    def summarize(results: List[Dict]) -> Dict[str, int]:
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return counts
+
+    @staticmethod
+    def write_results(results: List[Dict], filename: str) -> bool:
+        """Per-row results as CSV"""
+        try:
+            with open(filename, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['row', 'account_id', 'follower_id', 'status', 'message'])
+                writer.writeheader()
+                writer.writerows(results)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing onboarding results: {str(e)}")
+            return False
@@ -1,11 +1,12 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
     QPushButton, QLabel, QLineEdit, QDoubleSpinBox, QDialog, QMessageBox,
-    QComboBox, QSpinBox, QHeaderView
+    QComboBox, QSpinBox, QHeaderView, QFileDialog
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QFont
 import logging
+from follower_onboarding import FollowerOnboarding, ADDED, EXISTS, UPDATED
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,25 @@ class FollowerDialog(QDialog):
         }
 
 
+class FollowerImportWorker(QThread):
+    """Runs a bulk follower import (credential checks and logins) off the UI thread"""
+
+    finished_import = pyqtSignal(list)  # per-row results
+
+    def __init__(self, onboarding: FollowerOnboarding, filename: str):
+        super().__init__()
+        self.onboarding = onboarding
+        self.filename = filename
+
+    def run(self):
+        try:
+            self.finished_import.emit(self.onboarding.import_file(self.filename, update_existing=True))
+        except Exception as e:
+            logger.error(f"Error importing followers: {str(e)}")
+            self.finished_import.emit([{'row': 0, 'account_id': '', 'follower_id': None,
+                                        'status': 'failed', 'message': str(e)}])
+
+
 class FollowersWidget(QWidget):
     """Followers Management Panel"""
 
@@ -95,6 +115,8 @@ class FollowersWidget(QWidget):
         self.api_client = api_client
         self.db = db_manager
         self.risk_mgr = risk_manager
+        self.onboarding = FollowerOnboarding(db_manager, master_account_id, risk_manager)
+        self.import_worker = None
         self.init_ui()
         self.load_followers()
 
@@ -112,12 +134,15 @@ class FollowersWidget(QWidget):
         # Control buttons
         control_layout = QHBoxLayout()
         add_btn = QPushButton("➕ Add Follower")
+        self.import_btn = QPushButton("📥 Import Followers")
         remove_btn = QPushButton("❌ Remove Selected")
         refresh_btn = QPushButton("🔄 Refresh")
         add_btn.clicked.connect(self.add_follower)
+        self.import_btn.clicked.connect(self.import_followers)
         remove_btn.clicked.connect(self.remove_follower)
         refresh_btn.clicked.connect(self.load_followers)
         control_layout.addWidget(add_btn)
+        control_layout.addWidget(self.import_btn)
         control_layout.addWidget(remove_btn)
         control_layout.addWidget(refresh_btn)
         control_layout.addStretch()
@@ -151,9 +176,6 @@ class FollowersWidget(QWidget):
             followers = self.db.get_all_followers(self.master_account_id)
             self.followers_table.setRowCount(len(followers))
 
-            total_investment = 0
-            total_profit = 0
-
             for row, follower in enumerate(followers):
                 self.followers_table.setItem(row, 0, QTableWidgetItem(follower['account_name']))
                 self.followers_table.setItem(row, 1, QTableWidgetItem(follower['account_id']))
@@ -161,8 +183,6 @@ class FollowersWidget(QWidget):
 
                 investment = follower.get('investment_amount', 0)
                 profit = follower.get('profit_amount', 0)
-                total_investment += investment
-                total_profit += profit
 
                 self.followers_table.setItem(row, 3, QTableWidgetItem(f"₹{investment:,.2f}"))
                 self.followers_table.setItem(row, 4, QTableWidgetItem(f"₹{profit:,.2f}"))
@@ -181,44 +201,73 @@ class FollowersWidget(QWidget):
                 view_btn.clicked.connect(lambda checked, f=follower: self.view_follower(f))
                 self.followers_table.setCellWidget(row, 6, view_btn)
 
-            self.total_followers_label.setText(f"Total Followers: {len(followers)}")
-            self.total_investment_label.setText(f"Total Investment: ₹{total_investment:,.2f}")
-            self.total_profit_label.setText(f"Total Profit: ₹{total_profit:,.2f}")
+            self.update_summary()
 
             logger.info(f"✓ Loaded {len(followers)} followers")
         except Exception as e:
             logger.error(f"Error loading followers: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to load followers: {str(e)}")
 
+    def update_summary(self):
+        """Update summary labels from the precomputed master rollup"""
+        rollup = self.db.get_master_rollup(self.master_account_id)
+        self.total_followers_label.setText(f"Total Followers: {rollup['follower_count']}")
+        self.total_investment_label.setText(f"Total Investment: ₹{rollup['total_investment']:,.2f}")
+        self.total_profit_label.setText(f"Total Profit: ₹{rollup['total_profit']:,.2f}")
+
     def add_follower(self):
         """Add new follower account"""
         dialog = FollowerDialog(self)
         if dialog.exec_():
             data = dialog.get_data()
             try:
-                follower_id = f"{self.master_account_id}_FOLLOWER_{len(self.db.get_all_followers(self.master_account_id))}"
-                
-                success = self.db.add_follower_account(
-                    follower_id,
-                    data['account_name'],
-                    data['account_id'],
-                    data['follower_token'],
-                    data['lot_multiplier'],
-                    self.master_account_id
-                )
-
-                if success:
-                    # Set up risk management for new follower
-                    self.risk_mgr.set_daily_loss_limit(follower_id, 10000)  # Default ₹10,000
+                # Same path as bulk import: stable follower ID, follower and risk rows in one transaction
+                result = self.onboarding.onboard([data], authenticate=False)[0]
+
+                if result['status'] == ADDED:
                     QMessageBox.information(self, "Success", "Follower account added successfully!")
                     self.load_followers()
                     self.follower_updated.emit()
-                else:
+                elif result['status'] == EXISTS:
                     QMessageBox.warning(self, "Warning", "Follower already exists!")
+                else:
+                    QMessageBox.warning(self, "Warning", f"Follower not added: {result['message']}")
             except Exception as e:
                 logger.error(f"Error adding follower: {str(e)}")
                 QMessageBox.critical(self, "Error", f"Failed to add follower: {str(e)}")
 
+    def import_followers(self):
+        """Bulk import followers from CSV/JSON (api_key/api_secret are checked and logged in)"""
+        if self.import_worker and self.import_worker.isRunning():
+            return
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Import Followers", "", "Follower files (*.csv *.json);;All files (*)"
+        )
+        if not filename:
+            return
+        self.import_btn.setEnabled(False)
+        self.import_btn.setText("📥 Importing...")
+        self.import_worker = FollowerImportWorker(self.onboarding, filename)
+        self.import_worker.finished_import.connect(self.on_import_finished)
+        self.import_worker.start()
+
+    def on_import_finished(self, results: list):
+        """Show per-row import results"""
+        self.import_btn.setEnabled(True)
+        self.import_btn.setText("📥 Import Followers")
+        counts = FollowerOnboarding.summarize(results)
+        if counts.get(ADDED) or counts.get(UPDATED):
+            self.load_followers()
+            self.follower_updated.emit()
+
+        box = QMessageBox(self)
+        box.setWindowTitle("Import Followers")
+        box.setText("\n".join(f"{status}: {count}" for status, count in sorted(counts.items())) or "No rows")
+        box.setDetailedText("\n".join(
+            f"Row {r['row']} [{r['account_id']}]: {r['status']} - {r['message']}" for r in results
+        ))
+        box.exec_()
+
     def remove_follower(self):
         """Remove selected follower"""
         current_row = self.followers_table.currentRow()
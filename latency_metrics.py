@@ -0,0 +1,182 @@
+"""
+Trade Mirroring System - Latency Metrics Module
+Monotonic-clock spans aggregated into fixed-bucket latency histograms
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stages of the mirror path, in order
+STAGES = (
+    'follower_load',
+    'risk_check',
+    'order_build',
+    'http_send',
+    'broker_ack',
+    'post_ack',   # journal ack, OrderPlaced publish and order id mapping on the order path
+    'db_record',  # trades table write, on the event bus thread
+    'follower_ack',
+    'end_to_end',
+)
+
+# Geometric bucket upper bounds from 10µs to ~100s (≈9% resolution), in nanoseconds
+_BUCKET_BOUNDS_NS = [int(10_000 * 1.09 ** i) for i in range(188)]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+    Recording is a bisect plus an increment, so it is cheap enough to leave on
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS_NS, duration_ns)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile in milliseconds (bucket upper bound)"""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                bound = _BUCKET_BOUNDS_NS[index] if index < len(_BUCKET_BOUNDS_NS) else self.max_ns
+                return min(bound, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': (self.total_ns / self.count / 1e6) if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ns / 1e6,
+        }
+
+
+class LatencyRecorder:
+    """
+    Latency Recorder for the mirror path
+    Keeps one histogram per stage and one per (follower, stage)
+    """
+
+    def __init__(self):
+        self._stage_histograms: Dict[str, LatencyHistogram] = {}
+        self._follower_histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def record(self, stage: str, duration_ns: int, follower_id: str = None):
+        """Record one duration for a stage (optionally attributed to a follower)"""
+        with self._lock:
+            histogram = self._stage_histograms.get(stage)
+            if histogram is None:
+                histogram = self._stage_histograms[stage] = LatencyHistogram()
+            histogram.record(duration_ns)
+
+            if follower_id is not None:
+                follower_stages = self._follower_histograms.setdefault(follower_id, {})
+                histogram = follower_stages.get(stage)
+                if histogram is None:
+                    histogram = follower_stages[stage] = LatencyHistogram()
+                histogram.record(duration_ns)
+
+    @contextmanager
+    def span(self, stage: str, follower_id: str = None):
+        """Time a block with the monotonic clock"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter_ns() - start, follower_id)
+
+    def stage_summary(self) -> Dict[str, Dict]:
+        """Per-stage p50/p95/p99 in milliseconds, in mirror path order"""
+        with self._lock:
+            ordered = [s for s in STAGES if s in self._stage_histograms]
+            ordered += sorted(s for s in self._stage_histograms if s not in STAGES)
+            return {stage: self._stage_histograms[stage].summary() for stage in ordered}
+
+    def follower_summary(self, stage: str = 'follower_ack') -> Dict[str, Dict]:
+        """Per-follower p50/p95/p99 in milliseconds for one stage"""
+        with self._lock:
+            return {
+                follower_id: stages[stage].summary()
+                for follower_id, stages in self._follower_histograms.items()
+                if stage in stages
+            }
+
+    def snapshot(self) -> Dict:
+        """Full metrics snapshot"""
+        with self._lock:
+            followers = {
+                follower_id: {stage: histogram.summary() for stage, histogram in stages.items()}
+                for follower_id, stages in self._follower_histograms.items()
+            }
+        return {
+            'started_at': self.started_at.isoformat(),
+            'generated_at': datetime.now().isoformat(),
+            'stages': self.stage_summary(),
+            'followers': followers,
+        }
+
+    def export_json(self, filename: str) -> bool:
+        """Write metrics snapshot to a JSON file"""
+        try:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            tmp_filename = f"{filename}.tmp"
+            with open(tmp_filename, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(tmp_filename, filename)
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting latency metrics: {str(e)}")
+            return False
+
+    def to_prometheus(self) -> str:
+        """Render stage percentiles in Prometheus text exposition format"""
+        lines = ['# TYPE mirror_stage_latency_ms summary']
+        for stage, summary in self.stage_summary().items():
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f'mirror_stage_latency_ms{{stage="{stage}",quantile="{quantile}"}} {summary[key]:.3f}')
+            lines.append(f'mirror_stage_latency_ms_count{{stage="{stage}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Clear all histograms"""
+        with self._lock:
+            self._stage_histograms.clear()
+            self._follower_histograms.clear()
+            self.started_at = datetime.now()
+
+
+_recorder: Optional[LatencyRecorder] = None
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    """Process-wide latency recorder shared by the engine, API client and dashboard"""
+    global _recorder
+    if _recorder is None:
+        _recorder = LatencyRecorder()
+    return _recorder
@@ -0,0 +1,179 @@
+"""
+Trade Mirroring System - Logging Setup
+Queue-based logging: callers only enqueue records, a listener thread formats
+them as JSON lines into a size/time-rotated file and as text to the console
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import config
+
+# Attributes every LogRecord has; anything else was passed via extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, thread and any extra={...} fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                event[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            event['exc'] = record.exc_text
+        return json.dumps(event, default=str, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `burst` records per (logger, level, message template) through
+    per `window` seconds; the first record of the next window carries a
+    `suppressed` count. ERROR and above are never dropped
+    """
+
+    def __init__(self, burst: int = None, window: float = None):
+        super().__init__()
+        self.burst = burst or config.LOG_RATE_LIMIT_BURST
+        self.window = window or config.LOG_RATE_LIMIT_WINDOW
+        self._counters: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or now - counter[0] >= self.window:
+                suppressed = counter[2] if counter else 0
+                if len(self._counters) > 10000:
+                    self._counters.clear()
+                self._counters[key] = [now, 1, 0]
+            elif counter[1] < self.burst:
+                counter[1] += 1
+                suppressed = 0
+            else:
+                counter[2] += 1
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merge args into the message (they may change after the call) and drop
+        exc_info so the record stays picklable; formatting is left to the
+        listener. Only the exception line is kept, the traceback is not walked
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = ''.join(traceback.format_exception_only(*record.exc_info[:2])).rstrip()
+            record.exc_info = None
+        return record
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotates when the file exceeds max_bytes or at midnight, whichever comes first"""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.rollover_at = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight() -> float:
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        return time.time() >= self.rollover_at or super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_midnight()
+
+
+def setup_logging(log_dir: str = None, level: str = None, console: bool = True) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a bounded queue to a background listener
+    Call once at process start; stop with shutdown_logging()
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_dir = log_dir or config.LOG_PATH
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = SizedTimedRotatingFileHandler(
+        os.path.join(log_dir, config.LOG_FILE), config.LOG_MAX_BYTES, config.LOG_BACKUP_COUNT
+    )
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        handlers.append(console_handler)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level or config.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    queue_handler.listener = _listener
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
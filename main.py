@@ -3,32 +3,65 @@ import os
 import logging
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QVBoxLayout, QHBoxLayout, QWidget,
-    QTabWidget, QLabel, QPushButton, QMessageBox, QStatusBar
+    QTabWidget, QLabel, QPushButton, QMessageBox, QStatusBar, QProgressDialog
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from datetime import datetime
 
 # Import custom modules
-from aliceblue_api import AliceBlueAPIClient
+from paper_broker import create_api_client
 from database import DatabaseManager
+from credential_vault import CredentialVault
 from risk_manager import RiskManager
 from dashboard_widget import TradeDisplayWidget
 from followers_widget import FollowersWidget
 from master_account_widget import MasterAccountWidget
+from market_data import MarketDataService, SimulatedMarketFeed
+from trade_archive import TradeArchiver
+from report_exporter import TradeReportExporter
+from session_scheduler import SessionScheduler, roll_logs
+from logging_setup import setup_logging, shutdown_logging
+from refresh_scheduler import RefreshScheduler
+from performance_widget import PerformanceWidget
+import config
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('./logs/app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+class ReportExportWorker(QThread):
+    """Runs a streaming report export off the UI thread"""
+
+    progress = pyqtSignal(int, int)
+    finished_export = pyqtSignal(str, str, int)  # status ('done', 'cancelled', 'error'), filename or error, rows
+
+    def __init__(self, exporter: TradeReportExporter, filename: str, master_account_id: str = None):
+        super().__init__()
+        self.exporter = exporter
+        self.filename = filename
+        self.master_account_id = master_account_id
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _on_progress(self, done: int, total: int) -> bool:
+        self.progress.emit(done, total)
+        return not self._cancelled
+
+    def run(self):
+        try:
+            rows = self.exporter.export(
+                self.filename,
+                master_account_id=self.master_account_id,
+                progress_callback=self._on_progress
+            )
+            self.finished_export.emit('cancelled' if self._cancelled else 'done', self.filename, rows)
+        except Exception as e:
+            logger.error(f"Error exporting report: {str(e)}")
+            self.finished_export.emit('error', str(e), 0)
+
+
 class TradesMirroringApp(QMainWindow):
     """
     Main Application Window for Trade Mirroring System
@@ -47,9 +80,36 @@ class TradesMirroringApp(QMainWindow):
         self.setGeometry(100, 100, 1400, 900)
 
         # Initialize components
-        self.db_manager = DatabaseManager("./data/trades.db")
-        self.api_client = AliceBlueAPIClient("", "")  # Initialize with empty keys
+        # Secrets are encrypted at rest; the vault key is derived once here, not per request
+        self.vault = CredentialVault() if config.CREDENTIAL_VAULT_ENABLED else None
+        self.db_manager = DatabaseManager("./data/trades.db", vault=self.vault)
+        self.db_manager.encrypt_stored_credentials()
         self.risk_manager = RiskManager(self.db_manager)
+        feed = SimulatedMarketFeed() if config.MARKET_DATA_FEED == "simulated" else None
+        if config.MARKET_DATA_FEED not in ("simulated", "none"):
+            logger.warning(f"Unknown MARKET_DATA_FEED '{config.MARKET_DATA_FEED}': no live feed, "
+                           f"prices come from position snapshots")
+        self.market_data = MarketDataService(feed)
+        # Live AliceBlue client or the paper-trading simulator (config.BROKER_BACKEND)
+        self.api_client = create_api_client("", "", market_data=self.market_data)  # Initialize with empty keys
+        self.market_data.start()
+
+        # Roll old trade history into monthly archives outside market hours
+        self.trade_archiver = TradeArchiver(self.db_manager)
+        self.trade_archiver.start()
+
+        # Session boundary jobs (daily risk resets, log rollover)
+        self.session_scheduler = SessionScheduler()
+        self.session_scheduler.add_start_of_day_job('reset_risk_limits', self.risk_manager.reset_daily_limits)
+        self.session_scheduler.add_start_of_day_job('reset_exposures', self.risk_manager.reset_exposures)
+        self.session_scheduler.add_end_of_day_job('roll_logs', roll_logs)
+        self.session_scheduler.start()
+
+        self.export_worker = None
+        self.export_progress = None
+
+        # Single scheduler for all periodic view refreshes
+        self.refresh_scheduler = RefreshScheduler(self)
 
         # Create UI
         self.init_ui()
@@ -95,8 +155,13 @@ class TradesMirroringApp(QMainWindow):
         # Tab 3: Followers
         self.followers_tab_index = self.main_tabs.addTab(QWidget(), "👥 Followers")
 
+        # Tab 4: Performance (refresh, SQLite and HTTP timings; cProfile capture)
+        self.performance_widget = PerformanceWidget(self.refresh_scheduler)
+        self.main_tabs.addTab(self.performance_widget, "⚡ Performance")
+
         # Initialize dashboard and followers after master account selection
         self.master_account_id = None
+        self.dashboard_widget = None
         self.init_dashboard_tab()
         self.init_followers_tab()
 
@@ -141,8 +206,13 @@ class TradesMirroringApp(QMainWindow):
                     self.master_account_id,
                     self.api_client,
                     self.db_manager,
-                    self.risk_manager
+                    self.risk_manager,
+                    self.market_data,
+                    refresh_scheduler=self.refresh_scheduler
                 )
+                if self.dashboard_widget:
+                    self.dashboard_widget.shutdown()
+                self.dashboard_widget = dashboard
                 self.main_tabs.removeTab(self.dashboard_tab_index)
                 self.main_tabs.insertTab(self.dashboard_tab_index, dashboard, "📊 Dashboard")
         except Exception as e:
@@ -165,10 +235,9 @@ class TradesMirroringApp(QMainWindow):
 
     def setup_timers(self):
         """Setup auto-update timers"""
-        # Connection status timer
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_connection_status)
-        self.status_timer.start(5000)  # Check every 5 seconds
+        # Connection status (not tied to a tab or market hours)
+        self.refresh_scheduler.add_task('app.status', self.update_connection_status,
+                                        config.ACCOUNT_REFRESH_INTERVAL, market_hours_only=False)
 
     def update_connection_status(self):
         """Update connection status indicator"""
@@ -183,7 +252,11 @@ class TradesMirroringApp(QMainWindow):
 
             # Update status bar
             current_time = datetime.now().strftime("%H:%M:%S")
-            self.statusBar.showMessage(f"Ready | Last Update: {current_time}")
+            saved = self.refresh_scheduler.saved_work()
+            self.statusBar.showMessage(
+                f"Ready | Last Update: {current_time} | "
+                f"Refreshes skipped: {saved['saved_runs']:,} ({saved['saved_pct']:.0f}%)"
+            )
         except Exception as e:
             logger.error(f"Error updating status: {str(e)}")
 
@@ -201,18 +274,49 @@ class TradesMirroringApp(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to refresh: {str(e)}")
 
     def export_report(self):
-        """Export trading report"""
+        """Export trading report (streamed in a background thread)"""
         try:
+            if self.export_worker and self.export_worker.isRunning():
+                QMessageBox.information(self, "Export", "An export is already running")
+                return
+
             logger.info("Exporting report...")
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"./reports/trade_report_{timestamp}.csv"
-            
-            QMessageBox.information(self, "Export", f"✓ Report exported to:\n{filename}")
-            logger.info(f"Report exported: {filename}")
+            filename = f"./reports/trade_report_{timestamp}.{config.EXPORT_FORMAT}"
+
+            self.export_worker = ReportExportWorker(
+                TradeReportExporter(self.db_manager), filename, self.master_account_id
+            )
+            self.export_progress = QProgressDialog("Exporting trades...", "Cancel", 0, 100, self)
+            self.export_progress.setWindowTitle("Export")
+            self.export_progress.setWindowModality(Qt.WindowModal)
+            self.export_progress.canceled.connect(self.export_worker.cancel)
+            self.export_worker.progress.connect(self.on_export_progress)
+            self.export_worker.finished_export.connect(self.on_export_finished)
+            self.export_worker.start()
         except Exception as e:
             logger.error(f"Error exporting report: {str(e)}")
             QMessageBox.critical(self, "Error", f"Export failed: {str(e)}")
 
+    def on_export_progress(self, done: int, total: int):
+        """Update export progress dialog"""
+        if self.export_progress and total:
+            self.export_progress.setValue(int(done * 100 / total))
+            self.export_progress.setLabelText(f"Exporting trades... {done:,} / {total:,}")
+
+    def on_export_finished(self, status: str, result: str, rows: int):
+        """Close progress dialog and report the outcome"""
+        if self.export_progress:
+            self.export_progress.close()
+            self.export_progress = None
+        if status == 'done':
+            QMessageBox.information(self, "Export", f"✓ {rows:,} trades exported to:\n{result}")
+            logger.info(f"Report exported: {result}")
+        elif status == 'cancelled':
+            QMessageBox.information(self, "Export", f"Export cancelled after {rows:,} trades:\n{result}")
+        else:
+            QMessageBox.critical(self, "Error", f"Export failed: {result}")
+
     def open_settings(self):
         """Open settings dialog"""
         QMessageBox.information(self, "Settings", "Settings panel will be available soon!")
@@ -248,6 +352,14 @@ class TradesMirroringApp(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            if self.dashboard_widget:
+                self.dashboard_widget.shutdown()
+            self.market_data.stop()
+            self.trade_archiver.stop()
+            self.session_scheduler.stop()
+            self.api_client.logout()
+            if self.vault:
+                self.vault.lock()
             logger.info("✓ Application closed")
             event.accept()
         else:
@@ -265,6 +377,7 @@ def create_directories():
 
 def main():
     """Main application entry point"""
+    setup_logging()
     create_directories()
     
     app = QApplication(sys.argv)
@@ -277,7 +390,9 @@ def main():
     window.show()
     
     logger.info("✓ UI initialized and displayed")
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    shutdown_logging()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,224 @@
+"""
+Trade Mirroring System - Market Data Module
+Shared array-backed LTP table fed by a streaming (or simulated) tick source
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class PriceTable:
+    """
+    Latest tick per symbol in contiguous NumPy arrays
+    Symbols get a stable row index so P&L consumers can gather LTPs in one vector lookup
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self.ltp = np.full(capacity, np.nan)
+        self.tick_time = np.zeros(capacity)
+        self._lock = threading.RLock()
+
+    def index_of(self, symbol: str) -> int:
+        """Row index for a symbol (allocated on first use)"""
+        index = self._index.get(symbol)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._index.get(symbol)
+            if index is None:
+                index = len(self._symbols)
+                if index >= len(self.ltp):
+                    self._grow()
+                self._symbols.append(symbol)
+                self._index[symbol] = index
+            return index
+
+    def _grow(self):
+        """Double array capacity (must hold lock)"""
+        capacity = len(self.ltp) * 2
+        self.ltp = np.concatenate([self.ltp, np.full(capacity - len(self.ltp), np.nan)])
+        self.tick_time = np.concatenate([self.tick_time, np.zeros(capacity - len(self.tick_time))])
+
+    def update(self, symbol: str, ltp: float, tick_time: float = None) -> bool:
+        """Store a tick; returns True if the price changed"""
+        with self._lock:
+            index = self.index_of(symbol)
+            changed = self.ltp[index] != ltp
+            self.ltp[index] = ltp
+            self.tick_time[index] = tick_time or time.time()
+        return bool(changed)
+
+    def get(self, symbol: str, default: float = None) -> Optional[float]:
+        """Latest LTP for a symbol"""
+        index = self._index.get(symbol)
+        if index is None or np.isnan(self.ltp[index]):
+            return default
+        return float(self.ltp[index])
+
+    def gather(self, symbols: Iterable[str]) -> np.ndarray:
+        """LTPs for a list of symbols in one vector (NaN where no tick yet)"""
+        with self._lock:
+            indices = np.fromiter((self.index_of(s) for s in symbols), dtype=np.intp)
+            return self.ltp[indices]
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def snapshot(self) -> Dict[str, float]:
+        """All known prices as a dict"""
+        return {s: float(self.ltp[i]) for s, i in self._index.items() if not np.isnan(self.ltp[i])}
+
+
+class MarketDataService:
+    """
+    Market Data Service
+    Subscribes a tick feed once to the union of symbols held by the master and
+    all followers, keeps the shared PriceTable current and pushes changed
+    prices to registered P&L consumers
+    """
+
+    def __init__(self, feed=None, price_table: PriceTable = None):
+        self.price_table = price_table or PriceTable()
+        self.feed = feed
+        self.subscriptions: Set[str] = set()
+        self._listeners: List[Callable[[Dict[str, float]], None]] = []
+        self._lock = threading.Lock()
+        if self.feed:
+            self.feed.on_ticks = self.on_ticks
+
+    def add_listener(self, callback: Callable[[Dict[str, float]], None]):
+        """Register a consumer called with {symbol: ltp} for every batch of changed prices"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, float]], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def update_subscriptions(self, master_symbols: Iterable[str], follower_symbols: Iterable[str] = ()) -> bool:
+        """
+        Subscribe to the union of master and follower symbols
+        Only the difference against the current subscription is sent to the feed
+        Returns: True if the subscription set changed
+        """
+        wanted = set(master_symbols) | set(follower_symbols)
+        with self._lock:
+            added = wanted - self.subscriptions
+            removed = self.subscriptions - wanted
+            if not added and not removed:
+                return False
+            self.subscriptions = wanted
+
+        for symbol in added:
+            self.price_table.index_of(symbol)
+        if self.feed:
+            if added:
+                self.feed.subscribe(sorted(added))
+            if removed:
+                self.feed.unsubscribe(sorted(removed))
+        logger.info(f"✓ Market data subscriptions: {len(wanted)} symbols (+{len(added)} / -{len(removed)})")
+        return True
+
+    def on_ticks(self, ticks: Dict[str, float]):
+        """Apply a batch of ticks and notify listeners of the prices that changed"""
+        now = time.time()
+        changed = {symbol: ltp for symbol, ltp in ticks.items() if self.price_table.update(symbol, ltp, now)}
+        if not changed:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(changed)
+            except Exception as e:
+                logger.error(f"Error in market data listener: {str(e)}")
+
+    def seed_prices(self, prices: Dict[str, float]):
+        """Fill prices for symbols that have not ticked yet (e.g. LTP from a positions snapshot)"""
+        for symbol, ltp in prices.items():
+            if ltp and self.price_table.get(symbol) is None:
+                self.price_table.update(symbol, ltp)
+                if hasattr(self.feed, 'set_price'):
+                    self.feed.set_price(symbol, ltp)
+
+    def get_ltp(self, symbol: str, default: float = None) -> Optional[float]:
+        return self.price_table.get(symbol, default)
+
+    def start(self):
+        if self.feed:
+            self.feed.start()
+
+    def stop(self):
+        if self.feed:
+            self.feed.stop()
+
+
+class SimulatedMarketFeed:
+    """
+    Simulated tick feed for local testing
+    Random-walks every subscribed symbol and delivers one batch per tick interval
+    """
+
+    def __init__(self, tick_interval: float = None, volatility: float = 0.0005,
+                 initial_prices: Dict[str, float] = None, seed: int = None):
+        self.tick_interval = tick_interval or config.MARKET_DATA_TICK_INTERVAL
+        self.volatility = volatility
+        self.prices: Dict[str, float] = dict(initial_prices or {})
+        self.random = random.Random(seed)
+        self.on_ticks: Optional[Callable[[Dict[str, float]], None]] = None
+        self._subscribed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, symbols: List[str]):
+        with self._lock:
+            self._subscribed.update(symbols)
+
+    def unsubscribe(self, symbols: List[str]):
+        with self._lock:
+            self._subscribed.difference_update(symbols)
+
+    def set_price(self, symbol: str, price: float):
+        """Anchor the random walk for a symbol (e.g. at its entry price)"""
+        with self._lock:
+            self.prices[symbol] = price
+
+    def generate_ticks(self) -> Dict[str, float]:
+        """Advance the random walk one step for all subscribed symbols"""
+        ticks = {}
+        with self._lock:
+            for symbol in self._subscribed:
+                price = self.prices.get(symbol, 100.0)
+                price = round(max(0.05, price * (1 + self.random.gauss(0, self.volatility))), 2)
+                self.prices[symbol] = price
+                ticks[symbol] = price
+        return ticks
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SimulatedMarketFeed", daemon=True)
+        self._thread.start()
+        logger.info("✓ Simulated market feed started")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.tick_interval):
+            ticks = self.generate_ticks()
+            if ticks and self.on_ticks:
+                self.on_ticks(ticks)
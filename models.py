@@ -0,0 +1,175 @@
+"""
+Trade Mirroring System - Domain Models
+Compact slotted records for followers, trades, positions and orders
+"""
+
+import sqlite3
+from operator import itemgetter
+from dataclasses import dataclass, fields, replace
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+
+class Record:
+    """
+    Mapping-style access for slotted models so code written against dict
+    rows keeps working: record['symbol'], record.get('ltp', 0), dict(record)
+    and {**record}. None stands for a missing value: get() falls back to its
+    default and keys() skips it, like a dict without that key
+    """
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+    FIELD_SET = frozenset()
+    API_ALIASES: Dict[str, str] = {}  # payload key → field, for from_api
+    _API_PLAN: Tuple[tuple, tuple] = ((), ())
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELD_SET and getattr(self, key) is not None
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.FIELD_SET else None
+        return default if value is None else value
+
+    def keys(self):
+        return [name for name in self.FIELDS if getattr(self, name) is not None]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def copy(self, **changes):
+        return replace(self, **changes)
+
+    @classmethod
+    def from_api(cls: Type[T], data: Dict, aliases: Dict[str, str] = None) -> T:
+        """
+        Build from a broker payload, keeping only model fields; payload keys
+        in aliases (payload key → field) fill fields the payload leaves unset
+        """
+        defaults, alias_slots = cls._API_PLAN if aliases is None else _api_plan(cls, aliases)
+        get = data.get
+        values = [get(name, default) for name, default in defaults]
+        for index, source in alias_slots:
+            if values[index] is None and source in data:
+                values[index] = data[source]
+        return cls(*values)
+
+
+def _api_plan(cls, aliases: Dict[str, str]) -> Tuple[tuple, tuple]:
+    """((field, default) in field order, (field index, payload key) per alias)"""
+    defaults = tuple((f.name, f.default) for f in fields(cls))
+    return defaults, tuple((cls.FIELDS.index(name), source) for source, name in aliases.items())
+
+
+def model(cls):
+    """Class decorator: slotted dataclass with the Record field index"""
+    cls = dataclass(slots=True)(cls)
+    cls.FIELDS = tuple(f.name for f in fields(cls))
+    cls.FIELD_SET = frozenset(cls.FIELDS)
+    cls._API_PLAN = _api_plan(cls, cls.API_ALIASES)
+    return cls
+
+
+@model
+class Follower(Record):
+    id: Optional[int] = None
+    follower_id: Optional[str] = None
+    account_name: Optional[str] = None
+    account_id: Optional[str] = None
+    follower_token: Optional[str] = None
+    lot_multiplier: float = 1.0
+    investment_amount: float = 0
+    profit_amount: float = 0
+    currency: Optional[str] = None
+    status: Optional[str] = None
+    master_account_id: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+@model
+class Trade(Record):
+    id: Optional[int] = None
+    master_account_id: Optional[str] = None
+    follower_account_id: Optional[str] = None
+    symbol: Optional[str] = None
+    side: Optional[str] = None
+    quantity: float = 0
+    price: float = 0
+    order_type: Optional[str] = None
+    order_id: Optional[str] = None
+    follower_order_id: Optional[str] = None
+    master_order_id: Optional[str] = None
+    parent_order_id: Optional[str] = None
+    status: Optional[str] = None
+    fill_percentage: Optional[float] = None
+    filled_quantity: Optional[float] = None
+    entry_time: Optional[str] = None
+    close_time: Optional[str] = None
+    pnl: Optional[float] = None
+    account_id: Optional[str] = None  # broker account, when joined from follower_accounts
+
+
+@model
+class Position(Record):
+    symbol: Optional[str] = None
+    side: Optional[str] = None
+    quantity: float = 0
+    price: Optional[float] = None
+    ltp: Optional[float] = None
+
+    API_ALIASES = {'avg_price': 'price', 'average_price': 'price', 'last_price': 'ltp'}
+
+
+@model
+class Order(Record):
+    order_id: Optional[str] = None
+    account_id: Optional[str] = None
+    symbol: Optional[str] = None
+    side: Optional[str] = None
+    quantity: float = 0
+    price: Optional[float] = None
+    order_type: Optional[str] = None
+    status: Optional[str] = None
+    filled_quantity: Optional[float] = None
+    average_price: Optional[float] = None
+    order_tag: Optional[str] = None
+    order_time: Optional[float] = None
+
+    API_ALIASES = {'filled_qty': 'filled_quantity', 'avg_price': 'average_price'}
+
+
+def row_factory(model_cls: Type[T]) -> Callable[[sqlite3.Cursor, tuple], T]:
+    """
+    sqlite3 row factory building model_cls instances
+    Columns are matched to fields once per statement; columns without a
+    field are ignored and fields without a column keep their default
+    """
+    defaults = tuple(f.default for f in fields(model_cls))
+    cached = (None, None)
+
+    def factory(cursor: sqlite3.Cursor, row: tuple):
+        nonlocal cached
+        description, getter = cached
+        if cursor.description is not description:
+            width = len(cursor.description)
+            columns = {column[0]: i for i, column in enumerate(cursor.description)}
+            # Fields without a column read their default from the tail appended to the row
+            getter = itemgetter(*(columns.get(name, width + i) for i, name in enumerate(model_cls.FIELDS)))
+            cached = (cursor.description, getter)
+        return model_cls(*getter(row + defaults))
+
+    return factory
@@ -0,0 +1,131 @@
+"""
+Trade Mirroring System - Order ID Map
+Maps master order ids to the follower child orders that mirror them
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class OrderIdMap:
+    """
+    Master → Follower Order ID Map
+    Persisted in the trades table (master_order_id / follower_order_id) and
+    cached in memory so modify/cancel fan-out needs a single lookup per event.
+    register stays in memory (it runs on the order path, before the bus has
+    persisted the child); children stored by an earlier process are merged
+    into an entry the first time it is looked up
+    """
+
+    def __init__(self, db_manager, max_entries: int = None):
+        self.db = db_manager
+        self.max_entries = max_entries or config.ORDER_ID_MAP_CACHE_SIZE
+        self._cache: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._seeded = set()  # master order ids whose entry includes the stored children
+        self._lock = threading.Lock()
+
+    def register(self, master_order_id: str, follower_id: str, account_id: str,
+                 follower_order_id: str, quantity: float, lot_multiplier: float = 1.0,
+                 symbol: str = None, side: str = None, price: float = 0, order_type: str = None,
+                 parent_order_id: str = None):
+        """Register a follower child order placed for a master order"""
+        if not master_order_id or not follower_order_id:
+            return
+        entry = {
+            'follower_id': follower_id,
+            'account_id': account_id,
+            'lot_multiplier': lot_multiplier,
+            'follower_order_id': follower_order_id,
+            'symbol': symbol,
+            'side': side,
+            'quantity': quantity,
+            'price': price,
+            'order_type': order_type,
+            'parent_order_id': parent_order_id,
+            'status': 'pending',
+            'filled_quantity': 0,
+        }
+        with self._lock:
+            children = self._cache.setdefault(master_order_id, [])
+            if not any(child['follower_order_id'] == follower_order_id for child in children):
+                children.append(entry)
+            self._cache.move_to_end(master_order_id)
+            self._evict()
+
+    def lookup(self, master_order_id: str) -> List[Dict]:
+        """Get follower child orders for a master order (cache first, then one indexed query)"""
+        with self._lock:
+            if master_order_id in self._seeded:
+                self._cache.move_to_end(master_order_id)
+                return list(self._cache[master_order_id])
+
+        stored = self.db.get_follower_orders(master_order_id)
+        with self._lock:
+            if not stored and master_order_id not in self._cache:
+                return []
+            # Children registered while the query ran are kept
+            children = list(self._merge(master_order_id, stored))
+            self._evict()
+        return children
+
+    def refresh(self, master_order_id: str) -> List[Dict]:
+        """
+        Get follower child orders with status and filled quantity re-read from
+        the database (kept current by the order tracker); children not yet
+        persisted keep their registered state
+        """
+        stored = self.db.get_follower_orders(master_order_id)
+        with self._lock:
+            if not stored and master_order_id not in self._cache:
+                return []
+            children = self._merge(master_order_id, stored)
+            stored_by_id = {child['follower_order_id']: child for child in stored}
+            for child in children:
+                row = stored_by_id.get(child['follower_order_id'])
+                if row is not None:
+                    child['status'] = row['status']
+                    child['filled_quantity'] = row['filled_quantity'] or 0
+            self._evict()
+            return list(children)
+
+    def group_by_follower(self, master_order_id: str, refresh: bool = False) -> Dict[str, List[Dict]]:
+        """Get follower child orders for a master order grouped by follower id"""
+        grouped: Dict[str, List[Dict]] = {}
+        for child in (self.refresh(master_order_id) if refresh else self.lookup(master_order_id)):
+            grouped.setdefault(child['follower_id'], []).append(child)
+        return grouped
+
+    def update_quantity(self, master_order_id: str, follower_order_id: str, quantity: float) -> bool:
+        """Store a child's modified quantity and keep the cached copy in sync"""
+        with self._lock:
+            for child in self._cache.get(master_order_id, []):
+                if child['follower_order_id'] == follower_order_id:
+                    child['quantity'] = quantity
+        return self.db.update_follower_order_quantity(follower_order_id, quantity)
+
+    def remove(self, master_order_id: str):
+        """Drop a master order from the cache"""
+        with self._lock:
+            self._cache.pop(master_order_id, None)
+            self._seeded.discard(master_order_id)
+
+    def _merge(self, master_order_id: str, stored: List[Dict]) -> List[Dict]:
+        """Cache entry for a master order with stored children added if missing (must hold lock)"""
+        children = self._cache.setdefault(master_order_id, [])
+        known = {child['follower_order_id'] for child in children}
+        children.extend(child for child in stored if child['follower_order_id'] not in known)
+        self._cache.move_to_end(master_order_id)
+        self._seeded.add(master_order_id)
+        return children
+
+    def _evict(self):
+        """Evict least recently used master orders (must hold lock)"""
+        while len(self._cache) > self.max_entries:
+            master_order_id, _ = self._cache.popitem(last=False)
+            self._seeded.discard(master_order_id)
@@ -0,0 +1,320 @@
+"""
+Trade Mirroring System - Order Journal
+Durable write-ahead journal of outbound follower orders for crash recovery
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Record kinds
+INTENT = 'intent'  # about to send; written durably before place_order
+ACK = 'ack'        # broker accepted, carries the broker order id
+DONE = 'done'      # closed: trade persisted, send failed, or resolved by recovery
+
+ORDER_FIELDS = ('master_account_id', 'master_order_id', 'parent_order_id', 'follower_id', 'account_id',
+                'symbol', 'side', 'quantity', 'price', 'order_type')
+
+
+class JournalWriteError(Exception):
+    """Intents could not be committed; the orders must not be sent"""
+
+
+class OrderJournal:
+    """
+    Order Intent Journal
+    Append-only SQLite table in its own WAL-mode file with synchronous=FULL,
+    so every commit is fsynced. One writer thread commits whatever has been
+    appended since its last commit in a single transaction (group commit):
+    intents block the caller until they are durable, acks and closes do not.
+    Each intent ID is sent to the broker as the order_tag so recovery can
+    find the order even when the process died before the ack was journaled
+    """
+
+    def __init__(self, path: str, commit_window_ms: float = None):
+        self.path = path
+        self.commit_window = (config.ORDER_JOURNAL_COMMIT_WINDOW_MS if commit_window_ms is None
+                              else commit_window_ms) / 1000
+        self._pending: List[tuple] = []
+        self._appended = 0  # records appended so far
+        self._durable = 0   # records committed so far
+        self._failed: Deque[Tuple[int, int, str]] = deque(maxlen=100)  # (first, last) records of failed commits
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # one committer at a time, in append order
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._conn = self._connect()
+        self.commits = 0
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=FULL')
+        return conn
+
+    def _init_schema(self):
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS order_journal (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    intent_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    master_account_id TEXT,
+                    master_order_id TEXT,
+                    parent_order_id TEXT,
+                    follower_id TEXT,
+                    account_id TEXT,
+                    symbol TEXT,
+                    side TEXT,
+                    quantity REAL,
+                    price REAL,
+                    order_type TEXT,
+                    broker_order_id TEXT,
+                    note TEXT
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_order_journal_intent ON order_journal(intent_id, kind)')
+
+    # ---- writing -------------------------------------------------------------
+
+    def _append(self, records: List[tuple], wait: bool):
+        with self._cond:
+            self._pending.extend(records)
+            self._appended += len(records)
+            ticket = self._appended
+            self._cond.notify_all()
+            running = self._thread and self._thread.is_alive()
+        if not wait:
+            return
+        if not running:
+            self.flush()
+        with self._cond:
+            while True:
+                for first, last, error in self._failed:
+                    if first <= ticket <= last:
+                        raise JournalWriteError(error)
+                if self._durable >= ticket:
+                    return
+                self._cond.wait()
+
+    def record_intents(self, orders: List[Dict]) -> List[str]:
+        """
+        Durably journal orders about to be sent (blocks until fsynced)
+        orders: dicts with ORDER_FIELDS keys
+        Returns: one intent ID per order, to be sent as its order_tag
+        Raises: JournalWriteError if the commit failed
+        """
+        now = time.time()
+        intent_ids = [uuid.uuid4().hex for _ in orders]
+        self._append([
+            (intent_id, INTENT, now, *(order.get(field) for field in ORDER_FIELDS), None, None)
+            for intent_id, order in zip(intent_ids, orders)
+        ], wait=True)
+        return intent_ids
+
+    def ack(self, intent_id: str, broker_order_id: str):
+        """Broker accepted the order"""
+        self._append([(intent_id, ACK, time.time(), *([None] * len(ORDER_FIELDS)), broker_order_id, None)],
+                     wait=False)
+
+    def close(self, intent_ids: List[str], note: str = None):
+        """Close intents (trade persisted, or the send failed)"""
+        now = time.time()
+        self._append([(intent_id, DONE, now, *([None] * len(ORDER_FIELDS)), None, note)
+                      for intent_id in intent_ids if intent_id], wait=False)
+
+    def flush(self):
+        """Commit everything appended so far on the calling thread"""
+        with self._write_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+                upto = self._appended
+            error = self._write(batch) if batch else None
+            with self._cond:
+                if error is None:
+                    self._durable = upto
+                else:
+                    # Intents in this batch were never journaled; their senders are told so
+                    self._failed.append((upto - len(batch) + 1, upto, error))
+                self._cond.notify_all()
+
+    def _write(self, batch: List[tuple]) -> Optional[str]:
+        """Commit a batch; returns the error message if it failed"""
+        try:
+            with self._conn:
+                self._conn.executemany('''
+                    INSERT INTO order_journal
+                    (intent_id, kind, recorded_at, master_account_id, master_order_id, parent_order_id,
+                     follower_id, account_id, symbol, side, quantity, price, order_type, broker_order_id, note)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', batch)
+            self.commits += 1
+            return None
+        except Exception as e:
+            logger.error(f"Error writing order journal: {str(e)}")
+            return str(e)
+
+    def start(self):
+        """Start group-commit writer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="OrderJournal", daemon=True)
+        self._thread.start()
+        logger.info("✓ Order journal started")
+
+    def stop(self):
+        """Commit what is pending and stop the writer thread"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+            if self.commit_window:
+                time.sleep(self.commit_window)  # let concurrent senders join this commit
+            self.flush()
+
+    # ---- reading and recovery ---------------------------------------------------
+
+    def open_intents(self) -> List[Dict]:
+        """Intents without a DONE record, with the broker order id if one was acked"""
+        try:
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT i.intent_id, i.recorded_at, {', '.join('i.' + field for field in ORDER_FIELDS)},
+                       (SELECT a.broker_order_id FROM order_journal a
+                        WHERE a.intent_id = i.intent_id AND a.kind = '{ACK}') AS broker_order_id
+                FROM order_journal i
+                WHERE i.kind = '{INTENT}'
+                  AND NOT EXISTS (SELECT 1 FROM order_journal d WHERE d.intent_id = i.intent_id AND d.kind = '{DONE}')
+                ORDER BY i.seq
+            ''')
+            rows = cursor.fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error reading order journal: {str(e)}")
+            return []
+
+    def recover(self, api_client, db_manager, max_workers: int = None) -> Dict[str, int]:
+        """
+        Reconcile intents left open by a previous run against the broker
+        Order books of all affected accounts are fetched concurrently; each
+        intent is matched by acked order id, then order_tag, then by symbol,
+        side and quantity placed after the intent. Matched orders missing from
+        the trades table are recorded; every open intent is closed
+        Intents on accounts whose order book could not be fetched (or came
+        back empty) stay open for the next pass
+        Returns: counts of 'recovered', 'already_recorded', 'not_at_broker' and 'unresolved'
+        """
+        intents = self.open_intents()
+        counts = {'recovered': 0, 'already_recorded': 0, 'not_at_broker': 0, 'unresolved': 0}
+        if not intents:
+            return counts
+        logger.info(f"Recovering {len(intents)} open order intents...")
+
+        accounts = sorted({intent['account_id'] for intent in intents})
+        with ThreadPoolExecutor(max_workers=min(max_workers or config.ORDER_WORKER_THREADS, len(accounts))) as ex:
+            books = dict(zip(accounts, ex.map(api_client.get_orders, accounts)))
+
+        unresolved = [intent for intent in intents if not books.get(intent['account_id'])]
+        counts['unresolved'] = len(unresolved)
+        intents = [intent for intent in intents if books.get(intent['account_id'])]
+
+        claimed = set()
+        matched = {}
+        for intent in intents:
+            order = self._match(intent, books[intent['account_id']], claimed)
+            if order:
+                claimed.add(order['order_id'])
+                matched[intent['intent_id']] = order
+
+        known = db_manager.get_existing_order_ids([order['order_id'] for order in matched.values()])
+        missing = []
+        for intent in intents:
+            order = matched.get(intent['intent_id'])
+            if order is None:
+                counts['not_at_broker'] += 1
+            elif order['order_id'] in known:
+                counts['already_recorded'] += 1
+            else:
+                counts['recovered'] += 1
+                missing.append({
+                    'master_account_id': intent['master_account_id'],
+                    'follower_account_id': intent['follower_id'],
+                    'symbol': intent['symbol'],
+                    'side': intent['side'],
+                    'quantity': intent['quantity'],
+                    'price': intent['price'],
+                    'order_type': intent['order_type'],
+                    'order_id': order['order_id'],
+                    'parent_order_id': intent['parent_order_id'],
+                    'master_order_id': intent['master_order_id'],
+                })
+
+        if missing and not db_manager.record_trades(missing):
+            logger.error("Order recovery could not record trades; intents left open")
+            return counts
+        for intent in intents:
+            order = matched.get(intent['intent_id'])
+            self.close([intent['intent_id']], 'recovered' if order else 'not_at_broker')
+        self.flush()
+        logger.info(f"✓ Order recovery: {counts}")
+        return counts
+
+    @staticmethod
+    def _match(intent: Dict, orders: List[Dict], claimed: set) -> Optional[Dict]:
+        candidates = [order for order in orders if order.get('order_id') not in claimed]
+        for order in candidates:
+            if intent['broker_order_id'] and order.get('order_id') == intent['broker_order_id']:
+                return order
+        for order in candidates:
+            if order.get('order_tag') == intent['intent_id']:
+                return order
+        for order in candidates:
+            # Brokers without tag support: same instrument and size, placed after the intent was written
+            if (order.get('symbol') == intent['symbol'] and str(order.get('side')).upper() == str(intent['side']).upper()
+                    and float(order.get('quantity') or 0) == float(intent['quantity'] or 0)
+                    and not order.get('order_tag')
+                    and float(order.get('order_time') or intent['recorded_at']) >= intent['recorded_at']):
+                return order
+        return None
+
+    def compact(self) -> int:
+        """Delete records of closed intents (end of day); returns rows removed"""
+        self.flush()
+        try:
+            with self._write_lock:
+                with self._conn:
+                    cursor = self._conn.execute(f'''
+                        DELETE FROM order_journal WHERE intent_id IN
+                        (SELECT intent_id FROM order_journal WHERE kind = '{DONE}')
+                    ''')
+                self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            logger.info(f"✓ Order journal compacted: {cursor.rowcount} records removed")
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error compacting order journal: {str(e)}")
+            return 0
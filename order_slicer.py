@@ -0,0 +1,85 @@
+"""
+Trade Mirroring System - Order Slicing Module
+Splits follower orders above the exchange freeze quantity into child orders
+"""
+
+import logging
+import uuid
+from typing import Dict, List, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class OrderSlicer:
+    """
+    Order Slicer for large follower orders
+    Orders above the freeze limit are rejected by the exchange, so they are
+    split into child orders that each stay within the limit
+    """
+
+    def __init__(self, freeze_quantities: Dict[str, int] = None, default_freeze_quantity: int = None):
+        self.freeze_quantities = dict(freeze_quantities if freeze_quantities is not None
+                                      else config.FREEZE_QUANTITIES)
+        self.default_freeze_quantity = (default_freeze_quantity if default_freeze_quantity is not None
+                                        else config.DEFAULT_FREEZE_QUANTITY)
+
+    def get_freeze_quantity(self, symbol: str) -> int:
+        """Get freeze quantity for a symbol (falls back to the default limit)"""
+        return int(self.freeze_quantities.get(symbol.upper(), self.default_freeze_quantity))
+
+    def set_freeze_quantity(self, symbol: str, freeze_quantity: int):
+        """Override freeze quantity for a symbol"""
+        self.freeze_quantities[symbol.upper()] = int(freeze_quantity)
+
+    def needs_slicing(self, symbol: str, quantity: int) -> bool:
+        """Check if an order quantity exceeds the freeze limit"""
+        return quantity > self.get_freeze_quantity(symbol)
+
+    def slice_quantity(self, symbol: str, quantity: int) -> List[int]:
+        """
+        Split quantity into child quantities, each within the freeze limit
+
+        Example: freeze 1800, quantity 4000 -> [1800, 1800, 400]
+        """
+        quantity = int(quantity)
+        freeze_qty = self.get_freeze_quantity(symbol)
+
+        if freeze_qty <= 0 or quantity <= freeze_qty:
+            return [quantity]
+
+        full_slices, remainder = divmod(quantity, freeze_qty)
+        child_quantities = [freeze_qty] * full_slices
+        if remainder:
+            child_quantities.append(remainder)
+
+        logger.info("✓ Order sliced: %s %s → %d child orders (freeze: %s)", symbol, quantity, len(child_quantities), freeze_qty)
+        return child_quantities
+
+    def reslice(self, symbol: str, quantity: int, filled: List[float]) -> Tuple[List[int], List[int]]:
+        """
+        Re-slice an outstanding quantity over live child orders, each within the freeze limit
+        filled: quantity already filled on each live child (kept in its new quantity)
+        Returns: (new quantity per live child, 0 where it is no longer needed;
+                  quantities of extra child orders to place)
+
+        Example: freeze 1800, quantity 6000 over two unfilled children -> ([1800, 1800], [1800, 600])
+        """
+        remaining = max(int(quantity), 0)
+        freeze_qty = self.get_freeze_quantity(symbol)
+
+        child_quantities = []
+        for filled_qty in filled:
+            filled_qty = int(filled_qty or 0)
+            room = freeze_qty - filled_qty if freeze_qty > 0 else remaining
+            take = max(min(remaining, room), 0)
+            child_quantities.append(filled_qty + take if take else 0)
+            remaining -= take
+
+        return child_quantities, self.slice_quantity(symbol, remaining) if remaining else []
+
+    @staticmethod
+    def new_parent_order_id(follower_id: str) -> str:
+        """Generate parent order id that groups child orders in the trades table"""
+        return f"{follower_id}-P{uuid.uuid4().hex[:12]}"
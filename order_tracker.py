@@ -0,0 +1,255 @@
+"""
+Trade Mirroring System - Order Status Tracker
+Polls follower order books and keeps trades.status / fill_percentage current
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import config
+from account_snapshot import ORDERS
+from event_bus import FillUpdated
+
+logger = logging.getLogger(__name__)
+
+# Broker status strings normalized to the values stored in trades.status
+BROKER_STATUS_MAP = {
+    'complete': 'filled',
+    'completed': 'filled',
+    'filled': 'filled',
+    'traded': 'filled',
+    'rejected': 'rejected',
+    'cancelled': 'cancelled',
+    'canceled': 'cancelled',
+    'open': 'open',
+    'pending': 'pending',
+    'trigger pending': 'pending',
+    'partially_filled': 'partially_filled',
+    'partially filled': 'partially_filled',
+}
+
+TERMINAL_STATUSES = {'filled', 'rejected', 'cancelled'}
+
+
+class OrderStatusTracker:
+    """
+    Order Status Tracker
+    Batch-polls get_orders once per follower account, diffs the result against
+    known open orders and writes all changes in one transaction. With an
+    account snapshot service, order books from a sweep younger than the poll
+    interval are used instead of fetching again
+    """
+
+    def __init__(self, api_client, db_manager, master_account_id: str,
+                 poll_interval: float = None, max_poll_interval: float = None, event_bus=None, snapshots=None):
+        self.api_client = api_client
+        self.snapshots = snapshots
+        self.db = db_manager
+        self.event_bus = event_bus
+        self.master_account_id = master_account_id
+        self.poll_interval = poll_interval or config.ORDER_STATUS_POLL_INTERVAL
+        self.max_poll_interval = max_poll_interval or config.ORDER_STATUS_MAX_POLL_INTERVAL
+
+        self._open_orders: Dict[str, Dict] = {}
+        self._fill_listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=config.ORDER_WORKER_THREADS)
+
+    def load_open_orders(self) -> int:
+        """Load non-terminal orders from the database (e.g. after restart)"""
+        open_trades = self.db.get_open_trades(self.master_account_id)
+        with self._lock:
+            for trade in open_trades:
+                self._open_orders[trade['order_id']] = {
+                    'account_id': trade['account_id'],
+                    'follower_id': trade['follower_account_id'],
+                    'symbol': trade['symbol'],
+                    'side': trade['side'],
+                    'price': trade['price'],
+                    'quantity': trade['quantity'],
+                    'status': trade['status'],
+                    'filled_quantity': trade['filled_quantity'] or 0,
+                    'tracked_at': 0,
+                }
+        logger.info(f"✓ Tracking {len(open_trades)} open orders")
+        return len(open_trades)
+
+    def add_fill_listener(self, callback: Callable[[Dict], None]):
+        """
+        Register a consumer of incremental fills
+        Called with {order_id, follower_id, symbol, side, quantity, price} for each new fill
+        """
+        self._fill_listeners.append(callback)
+
+    def track_order(self, order_id: str, account_id: str, quantity: float, follower_id: str = None,
+                    symbol: str = None, side: str = None, price: float = 0):
+        """Start tracking a newly placed order"""
+        if not order_id:
+            return
+        with self._lock:
+            self._open_orders[order_id] = {
+                'account_id': account_id,
+                'follower_id': follower_id,
+                'symbol': symbol,
+                'side': side,
+                'price': price,
+                'quantity': quantity,
+                'status': 'pending',
+                'filled_quantity': 0,
+                'tracked_at': time.time(),
+            }
+        self._wake.set()
+
+    def open_order_count(self) -> int:
+        """Number of orders not yet in a terminal state"""
+        with self._lock:
+            return len(self._open_orders)
+
+    def poll_once(self) -> List[Dict]:
+        """
+        Poll every account with open orders once and apply changes
+        Returns: list of applied updates
+        """
+        with self._lock:
+            orders_by_account: Dict[str, Dict[str, Dict]] = {}
+            for order_id, known in self._open_orders.items():
+                orders_by_account.setdefault(known['account_id'], {})[order_id] = dict(known)
+
+        if not orders_by_account:
+            return []
+
+        account_ids = list(orders_by_account)
+        snapshot = self.snapshots.current() if self.snapshots else None
+        if snapshot and snapshot.age > self.poll_interval:
+            snapshot = None
+
+        def fetch(account_id: str) -> Dict[str, Dict]:
+            # A sweep only covers orders that were already placed when it started
+            if (snapshot and snapshot.has(account_id, ORDERS) and all(
+                    known['tracked_at'] <= snapshot.taken_at for known in orders_by_account[account_id].values())):
+                return {str(order.get('order_id')): order for order in snapshot.orders_for(account_id)}
+            return self._fetch_orders(account_id)
+
+        broker_orders = self._executor.map(fetch, account_ids)
+
+        updates = []
+        for account_id, account_orders in zip(account_ids, broker_orders):
+            updates.extend(self._diff(orders_by_account[account_id], account_orders))
+
+        if updates and self.db.update_trade_statuses(updates):
+            fills = []
+            with self._lock:
+                for update in updates:
+                    known = self._open_orders.get(update['order_id'])
+                    if known is None:
+                        continue
+                    fill_qty = update['filled_quantity'] - (known['filled_quantity'] or 0)
+                    if fill_qty > 0 and known['symbol']:
+                        fills.append({
+                            'order_id': update['order_id'],
+                            'follower_id': known['follower_id'],
+                            'symbol': known['symbol'],
+                            'side': known['side'],
+                            'quantity': fill_qty,
+                            'price': update.get('average_price') or known['price'],
+                        })
+                    if update['status'] in TERMINAL_STATUSES:
+                        del self._open_orders[update['order_id']]
+                    else:
+                        known['status'] = update['status']
+                        known['filled_quantity'] = update['filled_quantity']
+            logger.info(f"✓ Applied {len(updates)} order status updates")
+            self._notify_fills(fills)
+
+        return updates
+
+    def _notify_fills(self, fills: List[Dict]):
+        for fill in fills:
+            for listener in self._fill_listeners:
+                try:
+                    listener(fill)
+                except Exception as e:
+                    logger.error(f"Error in fill listener: {str(e)}")
+            if self.event_bus:
+                self.event_bus.publish(FillUpdated(**fill))
+
+    def _fetch_orders(self, account_id: str) -> Dict[str, Dict]:
+        """Fetch the full order book of one account, indexed by order id"""
+        try:
+            return {str(order.get('order_id')): order for order in self.api_client.get_orders(account_id) or []}
+        except Exception as e:
+            logger.error(f"Error fetching orders for {account_id}: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _diff(known_orders: Dict[str, Dict], broker_orders: Dict[str, Dict]) -> List[Dict]:
+        """Compare known open orders with the broker view and build updates for changed ones"""
+        updates = []
+        for order_id, known in known_orders.items():
+            broker_order = broker_orders.get(order_id)
+            if broker_order is None:
+                continue
+
+            quantity = float(broker_order.get('quantity') or known['quantity'] or 0)
+            filled_qty = float(broker_order.get('filled_quantity', broker_order.get('filled_qty', 0)) or 0)
+            raw_status = str(broker_order.get('status', '')).strip().lower()
+            status = BROKER_STATUS_MAP.get(raw_status, known['status'])
+            if status not in TERMINAL_STATUSES and 0 < filled_qty < quantity:
+                status = 'partially_filled'
+            if status == 'filled' and not filled_qty:
+                filled_qty = quantity
+
+            if status == known['status'] and filled_qty == known['filled_quantity']:
+                continue
+
+            updates.append({
+                'order_id': order_id,
+                'status': status,
+                'fill_percentage': (filled_qty / quantity * 100) if quantity > 0 else 0,
+                'filled_quantity': filled_qty,
+                'average_price': float(broker_order.get('average_price') or 0),
+            })
+        return updates
+
+    def start(self):
+        """Start background polling thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="OrderStatusTracker", daemon=True)
+        self._thread.start()
+        logger.info("✓ Order status tracker started")
+
+    def stop(self):
+        """Stop background polling thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+        logger.info("✓ Order status tracker stopped")
+
+    def _run(self):
+        """Poll while orders are open; back off exponentially once all are terminal"""
+        interval = self.poll_interval
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Error polling order status: {str(e)}")
+
+            if self.open_order_count():
+                interval = self.poll_interval
+            else:
+                interval = min(interval * 2, self.max_poll_interval)
+
+            self._wake.wait(interval)
+            if self._wake.is_set():
+                self._wake.clear()
+                interval = self.poll_interval
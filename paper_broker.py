@@ -0,0 +1,267 @@
+"""
+Trade Mirroring System - Paper Trading Broker
+In-memory simulated broker with the same interface as AliceBlueAPIClient
+"""
+
+import logging
+import random
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import config
+from latency_metrics import get_latency_recorder
+from models import Order, Position
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('open', 'partially_filled')
+
+
+class PaperTradingClient:
+    """
+    Paper Trading Client
+    Drop-in replacement for AliceBlueAPIClient backed by an in-memory order
+    book. Each call sleeps for a simulated broker latency; orders are
+    rejected with probability reject_rate, otherwise filled after fill_delay
+    seconds (in several tranches with probability partial_fill_rate).
+    Limit orders fill only once the last price crosses the limit. Matching
+    happens lazily whenever orders or positions are read, and every random
+    draw comes from one seeded generator so runs are reproducible
+    """
+
+    def __init__(self, api_key: str = "", api_secret: str = "", seed: int = None,
+                 latency_ms: float = None, jitter_ms: float = None, reject_rate: float = None,
+                 partial_fill_rate: float = None, fill_delay: float = None, market_data=None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.access_token = None
+        self.account_tokens: Dict[str, str] = {}
+        self.latency_ms = config.PAPER_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = config.PAPER_JITTER_MS if jitter_ms is None else jitter_ms
+        self.reject_rate = config.PAPER_REJECT_RATE if reject_rate is None else reject_rate
+        self.partial_fill_rate = config.PAPER_PARTIAL_FILL_RATE if partial_fill_rate is None else partial_fill_rate
+        self.fill_delay = config.PAPER_FILL_DELAY if fill_delay is None else fill_delay
+        self.market_data = market_data
+        self.random = random.Random(config.PAPER_SEED if seed is None else seed)
+        self.latency = get_latency_recorder()
+
+        self.orders: Dict[str, Dict[str, Dict]] = {}
+        self.positions: Dict[str, Dict[str, Dict]] = {}
+        self.holdings: Dict[str, List[Dict]] = {}
+        self.order_count = 0
+        self._lock = threading.Lock()
+
+    # ---- simulation helpers -----------------------------------------------
+
+    def _delay(self) -> int:
+        """Sleep for one simulated round trip; returns its length in ns"""
+        with self._lock:
+            delay_ms = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms))
+        time.sleep(delay_ms / 1000)
+        return int(delay_ms * 1_000_000)
+
+    def _ltp(self, symbol: str, default: float) -> float:
+        if self.market_data:
+            return self.market_data.get_ltp(symbol, default) or default
+        return default
+
+    def _fill_plan(self, quantity: int, now: float) -> List[List]:
+        """[[fill_time, quantity], ...] tranches that add up to quantity"""
+        if quantity > 1 and self.random.random() < self.partial_fill_rate:
+            tranches = self.random.randint(2, min(4, quantity))
+            sizes = [quantity // tranches] * tranches
+            sizes[-1] += quantity - sum(sizes)
+            return [[now + self.fill_delay * (i + 1), size] for i, size in enumerate(sizes)]
+        return [[now + self.fill_delay, quantity]]
+
+    def _match(self, account_id: str = None, now: float = None):
+        """Apply every tranche that is due (optionally for one account only)"""
+        now = now or time.time()
+        with self._lock:
+            accounts = [account_id] if account_id is not None else list(self.orders)
+            for account in accounts:
+                for order in self.orders.get(account, {}).values():
+                    if order['status'] not in OPEN_STATUSES:
+                        continue
+                    plan = order['_plan']
+                    while plan and plan[0][0] <= now:
+                        fill_price = self._fill_price(order)
+                        if fill_price is None:
+                            break
+                        _, size = plan.pop(0)
+                        self._apply_fill(account, order, size, fill_price)
+
+    def _fill_price(self, order: Dict) -> Optional[float]:
+        """Execution price, or None while a limit order is not marketable"""
+        ltp = self._ltp(order['symbol'], order['price'])
+        if str(order.get('order_type', '')).upper() != 'LIMIT' or not order['price']:
+            return ltp or order['price']
+        buy = str(order['side']).upper() == 'BUY'
+        if (buy and ltp <= order['price']) or (not buy and ltp >= order['price']):
+            return ltp
+        return None
+
+    def _apply_fill(self, account_id: str, order: Dict, size: float, price: float):
+        filled = order['filled_quantity']
+        order['average_price'] = (order['average_price'] * filled + price * size) / (filled + size)
+        order['filled_quantity'] = filled + size
+        order['status'] = 'complete' if order['filled_quantity'] >= order['quantity'] else 'partially_filled'
+
+        signed = size if str(order['side']).upper() == 'BUY' else -size
+        position = self.positions.setdefault(account_id, {}).setdefault(
+            order['symbol'], {'symbol': order['symbol'], 'quantity': 0, 'price': 0}
+        )
+        old = position['quantity']
+        new = old + signed
+        if old == 0 or (old > 0) == (signed > 0):
+            position['price'] = (abs(old) * position['price'] + size * price) / abs(new)
+        elif new == 0:
+            position['price'] = 0
+        elif (new > 0) != (old > 0):
+            position['price'] = price
+        position['quantity'] = new
+
+    # ---- AliceBlueAPIClient interface ---------------------------------------
+
+    async def initialize(self):
+        """No session to open"""
+
+    async def close(self):
+        """No session to close"""
+
+    def authenticate(self) -> bool:
+        self._delay()
+        self.access_token = f"paper-{uuid.uuid4().hex[:12]}"
+        logger.info("✓ Authentication successful (paper trading)")
+        return True
+
+    def set_access_token(self, token: Optional[str]):
+        self.access_token = token
+
+    def set_account_token(self, account_id: str, token: Optional[str]):
+        if token:
+            self.account_tokens[account_id] = token
+        else:
+            self.account_tokens.pop(account_id, None)
+
+    def logout(self, account_id: str = None):
+        if account_id is not None:
+            self.account_tokens.pop(account_id, None)
+            return
+        self.account_tokens.clear()
+        self.access_token = None
+
+    def get_account_details(self, account_id: str) -> Optional[Dict]:
+        self._delay()
+        return {'account_id': account_id, 'account_name': f"Paper {account_id}", 'mode': 'paper'}
+
+    def get_positions(self, account_id: str) -> List[Position]:
+        self._delay()
+        self._match(account_id)
+        with self._lock:
+            return [
+                Position(
+                    symbol=symbol,
+                    side='BUY' if position['quantity'] > 0 else 'SELL',
+                    quantity=abs(position['quantity']),
+                    price=position['price'],
+                    ltp=self._ltp(symbol, position['price']),
+                )
+                for symbol, position in self.positions.get(account_id, {}).items()
+                if position['quantity']
+            ]
+
+    def get_orders(self, account_id: str, status: str = "all") -> List[Order]:
+        self._delay()
+        self._match(account_id)
+        with self._lock:
+            orders = [Order.from_api(order) for order in self.orders.get(account_id, {}).values()
+                      if status == "all" or order['status'] == status]
+        return orders
+
+    def place_order(self, account_id: str, order_params: Dict) -> Optional[Order]:
+        delay_ns = self._delay()
+        self.latency.record('broker_ack', delay_ns)
+        now = time.time()
+        with self._lock:
+            order_id = f"PAPER{self.order_count:010d}"
+            self.order_count += 1
+            quantity = int(order_params.get('quantity', 0))
+            rejected = quantity <= 0 or self.random.random() < self.reject_rate
+            order = {
+                'order_id': order_id,
+                'account_id': account_id,
+                'symbol': order_params.get('symbol'),
+                'side': order_params.get('side'),
+                'quantity': quantity,
+                'filled_quantity': 0,
+                'average_price': 0,
+                'price': order_params.get('price', 0),
+                'order_type': order_params.get('order_type', 'MARKET'),
+                'order_tag': order_params.get('order_tag'),
+                'status': 'rejected' if rejected else 'open',
+                'order_time': now,
+                '_plan': [] if rejected else self._fill_plan(quantity, now),
+            }
+            self.orders.setdefault(account_id, {})[order_id] = order
+
+        if rejected:
+            # Same contract as the live client: a rejected placement returns None
+            logger.warning("Paper order rejected: %s %s %s", order['symbol'], order['side'], quantity)
+            return None
+        if not self.fill_delay:
+            self._match(account_id, now)
+        logger.debug("Paper order placed %s: %s %s %s", order_id, order['symbol'], order['side'], quantity)
+        return Order(order_id=order_id, account_id=account_id, status=order['status'])
+
+    def modify_order(self, account_id: str, order_id: str, modifications: Dict) -> Optional[Order]:
+        self._delay()
+        self._match(account_id)
+        with self._lock:
+            order = self.orders.get(account_id, {}).get(order_id)
+            if order is None or order['status'] not in OPEN_STATUSES:
+                return None
+            if 'quantity' in modifications:
+                new_qty = int(modifications['quantity'])
+                if new_qty < order['filled_quantity']:
+                    return None
+                order['_plan'] = self._fill_plan(new_qty - order['filled_quantity'], time.time()) \
+                    if new_qty > order['filled_quantity'] else []
+                order['quantity'] = new_qty
+                if new_qty == order['filled_quantity']:
+                    order['status'] = 'complete'
+            for key in ('price', 'order_type'):
+                if key in modifications:
+                    order[key] = modifications[key]
+            return Order(order_id=order_id, account_id=account_id, status=order['status'])
+
+    def cancel_order(self, account_id: str, order_id: str) -> bool:
+        self._delay()
+        self._match(account_id)
+        with self._lock:
+            order = self.orders.get(account_id, {}).get(order_id)
+            if order is None or order['status'] not in OPEN_STATUSES:
+                return False
+            order['status'] = 'cancelled'
+            order['_plan'] = []
+            return True
+
+    def get_holdings(self, account_id: str) -> List[Dict]:
+        self._delay()
+        with self._lock:
+            return [dict(holding) for holding in self.holdings.get(account_id, [])]
+
+    def set_holdings(self, account_id: str, holdings: List[Dict]):
+        """Seed delivery holdings returned by get_holdings"""
+        with self._lock:
+            self.holdings[account_id] = [dict(holding) for holding in holdings]
+
+
+def create_api_client(api_key: str, api_secret: str, base_url: str = None, market_data=None):
+    """Broker client selected by config.BROKER_BACKEND ("aliceblue" or "paper")"""
+    if config.BROKER_BACKEND == "paper" and base_url is None:
+        return PaperTradingClient(api_key, api_secret, market_data=market_data)
+    from aliceblue_api import AliceBlueAPIClient
+    return AliceBlueAPIClient(api_key, api_secret, base_url)
@@ -0,0 +1,146 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPushButton, QLabel, QCheckBox, QMessageBox, QHeaderView, QPlainTextEdit,
+    QFileDialog, QTabWidget
+)
+from PyQt5.QtGui import QFont
+from datetime import datetime
+import logging
+import os
+
+import config
+from profiler import CATEGORIES, HTTP, SQLITE, TIMER, get_profiler
+from refresh_scheduler import RefreshScheduler
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_LABELS = {
+    TIMER: "Refresh Callbacks",
+    SQLITE: "SQLite Statements",
+    HTTP: "Broker HTTP",
+}
+
+
+class PerformanceWidget(QWidget):
+    """Performance panel: refresh callback, SQLite and HTTP timings plus cProfile capture"""
+
+    def __init__(self, refresh_scheduler=None):
+        super().__init__()
+        self.profiler = get_profiler()
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler(self)
+        self.tables = {}
+        self.init_ui()
+        self.refresh_scheduler.add_task('performance.tables', self.update_tables,
+                                        config.ACCOUNT_REFRESH_INTERVAL, self, market_hours_only=False)
+
+    def init_ui(self):
+        """Initialize UI"""
+        layout = QVBoxLayout()
+
+        # Controls
+        control_layout = QHBoxLayout()
+        self.record_checkbox = QCheckBox("Record timings")
+        self.record_checkbox.setChecked(self.profiler.enabled)
+        self.record_checkbox.toggled.connect(self.toggle_recording)
+        control_layout.addWidget(self.record_checkbox)
+
+        self.cprofile_btn = QPushButton("▶ Start cProfile")
+        self.cprofile_btn.clicked.connect(self.toggle_cprofile)
+        control_layout.addWidget(self.cprofile_btn)
+
+        dump_btn = QPushButton("📥 Dump to File")
+        dump_btn.clicked.connect(self.dump_profile)
+        control_layout.addWidget(dump_btn)
+
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        control_layout.addWidget(reset_btn)
+
+        control_layout.addStretch()
+        self.since_label = QLabel()
+        control_layout.addWidget(self.since_label)
+        layout.addLayout(control_layout)
+
+        # One table per timing category, slowest total first
+        tabs = QTabWidget()
+        for category in CATEGORIES:
+            table = QTableWidget()
+            table.setColumnCount(7)
+            table.setHorizontalHeaderLabels([
+                "Name", "Count", "Mean (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)", "Total (ms)"
+            ])
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+            table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+            self.tables[category] = table
+            tabs.addTab(table, CATEGORY_LABELS[category])
+
+        self.cprofile_output = QPlainTextEdit()
+        self.cprofile_output.setReadOnly(True)
+        self.cprofile_output.setFont(QFont("Monospace"))
+        self.cprofile_output.setPlaceholderText(
+            "Start cProfile, use the application, then stop it to see where UI thread time went"
+        )
+        tabs.addTab(self.cprofile_output, "cProfile")
+        layout.addWidget(tabs)
+
+        self.setLayout(layout)
+
+    def toggle_recording(self, checked: bool):
+        """Turn timing of refresh callbacks, SQLite and HTTP on or off"""
+        self.profiler.enabled = checked
+        logger.info(f"Performance timing {'enabled' if checked else 'disabled'}")
+
+    def toggle_cprofile(self):
+        """Start or stop a cProfile capture of the UI thread"""
+        try:
+            if self.profiler.cprofile_running:
+                self.profiler.stop_cprofile()
+                self.cprofile_output.setPlainText(self.profiler.cprofile_report())
+                self.cprofile_btn.setText("▶ Start cProfile")
+            else:
+                self.profiler.start_cprofile()
+                self.cprofile_output.setPlainText("Capturing…")
+                self.cprofile_btn.setText("■ Stop cProfile")
+        except Exception as e:
+            logger.error(f"Error toggling cProfile: {str(e)}")
+            QMessageBox.critical(self, "Error", f"cProfile failed: {str(e)}")
+
+    def update_tables(self):
+        """Update timing tables"""
+        try:
+            for category, table in self.tables.items():
+                rows = self.profiler.summary(category)
+                table.setRowCount(len(rows))
+                for row, (name, summary) in enumerate(rows.items()):
+                    table.setItem(row, 0, QTableWidgetItem(name))
+                    table.setItem(row, 1, QTableWidgetItem(str(summary['count'])))
+                    table.setItem(row, 2, QTableWidgetItem(f"{summary['mean_ms']:.2f}"))
+                    table.setItem(row, 3, QTableWidgetItem(f"{summary['p95_ms']:.2f}"))
+                    table.setItem(row, 4, QTableWidgetItem(f"{summary['p99_ms']:.2f}"))
+                    table.setItem(row, 5, QTableWidgetItem(f"{summary['max_ms']:.2f}"))
+                    table.setItem(row, 6, QTableWidgetItem(f"{summary['total_ms']:.1f}"))
+            self.since_label.setText(f"Since {self.profiler.started_at.strftime('%H:%M:%S')}")
+
+        except Exception as e:
+            logger.error(f"Error updating performance tables: {str(e)}")
+
+    def dump_profile(self):
+        """Write timings (and the last cProfile capture) to file"""
+        try:
+            default = os.path.join(config.PROFILE_DUMP_DIR,
+                                   f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            filename, _ = QFileDialog.getSaveFileName(self, "Dump Profile", default, "JSON Files (*.json)")
+            if not filename:
+                return
+            if not self.profiler.dump(filename, self.refresh_scheduler.stats()):
+                raise RuntimeError("could not write profile")
+            extra = "\n(cProfile stats alongside as .prof and .txt)" if self.profiler.has_cprofile_stats else ""
+            QMessageBox.information(self, "Dump", f"✓ Profile written to:\n{filename}{extra}")
+        except Exception as e:
+            logger.error(f"Error dumping profile: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Dump failed: {str(e)}")
+
+    def reset(self):
+        """Clear recorded timings"""
+        self.profiler.reset()
+        self.update_tables()
@@ -0,0 +1,190 @@
+"""
+Trade Mirroring System - Portfolio P&L Engine
+Columnar (accounts × symbols) book evaluated in one vectorized pass per tick
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from market_data import PriceTable
+
+logger = logging.getLogger(__name__)
+
+SHORT_SIDES = ('SELL', 'SHORT', 'S')
+
+
+def side_sign(side: str) -> int:
+    """+1 for long/buy, -1 for short/sell"""
+    return -1 if str(side).upper() in SHORT_SIDES else 1
+
+
+class PortfolioPnLEngine:
+    """
+    Portfolio P&L Engine
+    Holds entry price, quantity and side sign for every account × symbol in
+    NumPy arrays; symbol columns share the PriceTable row index so the LTP
+    vector is used as-is without a per-symbol lookup
+    """
+
+    def __init__(self, price_table: PriceTable = None, account_capacity: int = 64):
+        self.price_table = price_table or PriceTable()
+        self._accounts: Dict[str, int] = {}
+        symbol_capacity = len(self.price_table.ltp)
+        shape = (account_capacity, symbol_capacity)
+        self.quantity = np.zeros(shape)                 # absolute open quantity
+        self.side = np.zeros(shape, dtype=np.int8)     # +1 long, -1 short, 0 flat
+        self.entry_price = np.zeros(shape)              # average entry price of the open quantity
+        self.realized = np.zeros(shape)                 # realized P&L from closed quantity
+        self._lock = threading.Lock()
+
+    # ---- book maintenance -------------------------------------------------
+
+    def account_index(self, account_id: str) -> int:
+        index = self._accounts.get(account_id)
+        if index is None:
+            index = len(self._accounts)
+            if index >= self.quantity.shape[0]:
+                self._resize(rows=self.quantity.shape[0] * 2)
+            self._accounts[account_id] = index
+        return index
+
+    def symbol_index(self, symbol: str) -> int:
+        index = self.price_table.index_of(symbol)
+        if index >= self.quantity.shape[1]:
+            self._resize(cols=len(self.price_table.ltp))
+        return index
+
+    def _resize(self, rows: int = None, cols: int = None):
+        rows = rows or self.quantity.shape[0]
+        cols = cols or self.quantity.shape[1]
+        for name in ('quantity', 'side', 'entry_price', 'realized'):
+            old = getattr(self, name)
+            new = np.zeros((rows, cols), dtype=old.dtype)
+            new[:old.shape[0], :old.shape[1]] = old
+            setattr(self, name, new)
+
+    @property
+    def accounts(self) -> List[str]:
+        return list(self._accounts)
+
+    def set_position(self, account_id: str, symbol: str, side: str, quantity: float, entry_price: float):
+        """Load an open position as-is (e.g. from a broker positions snapshot)"""
+        with self._lock:
+            a, s = self.account_index(account_id), self.symbol_index(symbol)
+            sign = side_sign(side)
+            if quantity < 0:
+                sign, quantity = -1, -quantity
+            self.quantity[a, s] = quantity
+            self.side[a, s] = sign if quantity else 0
+            self.entry_price[a, s] = entry_price if quantity else 0
+
+    def clear_account(self, account_id: str):
+        """Drop all open quantity for an account before reloading its snapshot"""
+        with self._lock:
+            a = self._accounts.get(account_id)
+            if a is not None:
+                self.quantity[a] = 0
+                self.side[a] = 0
+                self.entry_price[a] = 0
+
+    def apply_fill(self, account_id: str, symbol: str, side: str, quantity: float, price: float):
+        """
+        Apply an executed fill
+        Adds to the position at a weighted average price, or closes quantity
+        against the entry price (realizing P&L) and flips any remainder
+        """
+        with self._lock:
+            a, s = self.account_index(account_id), self.symbol_index(symbol)
+            fill_sign = side_sign(side)
+            open_qty = self.quantity[a, s]
+            open_sign = self.side[a, s]
+
+            if open_qty == 0 or open_sign == fill_sign:
+                total = open_qty + quantity
+                self.entry_price[a, s] = (self.entry_price[a, s] * open_qty + price * quantity) / total
+                self.quantity[a, s] = total
+                self.side[a, s] = fill_sign
+                return
+
+            closed = min(open_qty, quantity)
+            self.realized[a, s] += (price - self.entry_price[a, s]) * closed * open_sign
+            remaining = open_qty - closed
+            flipped = quantity - closed
+
+            if flipped > 0:
+                self.quantity[a, s] = flipped
+                self.side[a, s] = fill_sign
+                self.entry_price[a, s] = price
+            else:
+                self.quantity[a, s] = remaining
+                if remaining == 0:
+                    self.side[a, s] = 0
+                    self.entry_price[a, s] = 0
+
+    # ---- evaluation -------------------------------------------------------
+
+    def compute(self) -> Dict[str, np.ndarray]:
+        """
+        Mark the whole book to market in one pass
+        Returns arrays shaped (accounts, symbols): unrealized, realized, total, pct
+        (symbols without a tick yet are valued at entry price)
+        """
+        with self._lock:
+            rows, cols = len(self._accounts), self.quantity.shape[1]
+            qty = self.quantity[:rows]
+            sign = self.side[:rows]
+            entry = self.entry_price[:rows]
+            realized = self.realized[:rows].copy()
+            ltp = self.price_table.ltp[:cols]
+
+            mark = np.where(np.isnan(ltp), entry, ltp)
+            unrealized = (mark - entry) * qty * sign
+            cost = entry * qty
+            pct = np.divide(unrealized * 100, cost, out=np.zeros_like(unrealized), where=cost > 0)
+
+        return {
+            'unrealized': unrealized,
+            'realized': realized,
+            'total': unrealized + realized,
+            'pct': pct,
+        }
+
+    def account_totals(self, result: Dict[str, np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """Per-account realized / unrealized / total P&L"""
+        result = result or self.compute()
+        unrealized = result['unrealized'].sum(axis=1)
+        realized = result['realized'].sum(axis=1)
+        # Accounts registered after `result` was computed have nothing in it yet
+        return {
+            account_id: {
+                'unrealized': float(unrealized[i]),
+                'realized': float(realized[i]),
+                'total': float(unrealized[i] + realized[i]),
+            }
+            for account_id, i in self._accounts.items() if i < len(unrealized)
+        }
+
+    def position_pnl(self, account_id: str, result: Dict[str, np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """P&L for every symbol an account has traded"""
+        a = self._accounts.get(account_id)
+        if a is None:
+            return {}
+        result = result or self.compute()
+        positions = {}
+        for symbol in self.price_table.symbols:
+            s = self.price_table.index_of(symbol)
+            if s >= result['unrealized'].shape[1]:
+                continue
+            if self.quantity[a, s] or result['realized'][a, s]:
+                positions[symbol] = {
+                    'quantity': float(self.quantity[a, s]),
+                    'side': int(self.side[a, s]),
+                    'entry_price': float(self.entry_price[a, s]),
+                    'unrealized': float(result['unrealized'][a, s]),
+                    'realized': float(result['realized'][a, s]),
+                    'pct': float(result['pct'][a, s]),
+                }
+        return positions
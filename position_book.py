@@ -0,0 +1,174 @@
+"""
+Trade Mirroring System - Follower Position Books
+Cached per-follower positions maintained from fills and broker reconciliation
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+from pnl_engine import side_sign
+
+logger = logging.getLogger(__name__)
+
+
+class FollowerPositionService:
+    """
+    Follower Position Service
+    Keeps one incrementally updated book per follower so views can compare
+    actual vs expected follower quantities without calling the broker API
+    """
+
+    def __init__(self, db_manager, master_account_id: str, pnl_engine=None):
+        self.db = db_manager
+        self.master_account_id = master_account_id
+        self.pnl_engine = pnl_engine
+        self._books: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def load_from_trades(self) -> int:
+        """Rebuild all books from filled quantities recorded in the trades table"""
+        rows = self.db.get_follower_net_positions(self.master_account_id)
+        books: Dict[str, Dict[str, Dict]] = {}
+        now = datetime.now()
+        for row in rows:
+            books.setdefault(row['follower_id'], {})[row['symbol']] = {
+                'quantity': row['quantity'] or 0,
+                'avg_price': row['avg_price'] or 0,
+                'updated_at': now,
+                'source': 'trades',
+            }
+        with self._lock:
+            changed = self._quantities(books) != self._quantities(self._books)
+            self._books = books
+            if changed:
+                self.version += 1
+        self._sync_pnl_engine(books)
+        return len(rows)
+
+    @staticmethod
+    def _quantities(books: Dict[str, Dict[str, Dict]]) -> Dict:
+        return {
+            follower_id: {symbol: (p['quantity'], p['avg_price']) for symbol, p in book.items()}
+            for follower_id, book in books.items()
+        }
+
+    def apply_fill(self, fill: Dict):
+        """
+        Apply an incremental fill {follower_id, symbol, side, quantity, price}
+        (registered as an OrderStatusTracker fill listener)
+        """
+        follower_id, symbol = fill['follower_id'], fill['symbol']
+        signed_qty = side_sign(fill['side']) * fill['quantity']
+        with self._lock:
+            position = self._books.setdefault(follower_id, {}).setdefault(
+                symbol, {'quantity': 0, 'avg_price': 0, 'updated_at': None, 'source': 'fills'}
+            )
+            old_qty = position['quantity']
+            new_qty = old_qty + signed_qty
+            if old_qty == 0 or (old_qty > 0) == (signed_qty > 0):
+                position['avg_price'] = (abs(old_qty) * position['avg_price'] + abs(signed_qty) * fill['price']) / abs(new_qty)
+            elif new_qty == 0:
+                position['avg_price'] = 0
+            elif (new_qty > 0) != (old_qty > 0):
+                position['avg_price'] = fill['price']
+            position['quantity'] = new_qty
+            position['updated_at'] = datetime.now()
+            position['source'] = 'fills'
+            self.version += 1
+
+        if self.pnl_engine:
+            self.pnl_engine.apply_fill(follower_id, symbol, fill['side'], fill['quantity'], fill['price'])
+
+    def reconcile(self, follower_id: str, broker_positions: List[Dict], as_of: datetime = None) -> List[Dict]:
+        """
+        Replace a follower's book with the broker's view
+        as_of: when the broker view was fetched; symbols with fills applied
+        after that keep their cached position
+        Returns: list of drifts {symbol, cached, actual} found before replacing
+        """
+        now = datetime.now()
+        book = {}
+        for position in broker_positions:
+            qty = position.get('quantity', 0)
+            if position.get('side') and qty > 0:
+                qty = side_sign(position['side']) * qty
+            book[position['symbol']] = {
+                'quantity': qty,
+                'avg_price': position.get('price', position.get('avg_price', 0)),
+                'updated_at': now,
+                'source': 'broker',
+            }
+
+        with self._lock:
+            cached = self._books.get(follower_id, {})
+            if as_of:
+                for symbol, position in cached.items():
+                    if position['source'] == 'fills' and position['updated_at'] and position['updated_at'] > as_of:
+                        book[symbol] = position
+            drifts = [
+                {'symbol': symbol, 'cached': cached.get(symbol, {}).get('quantity', 0),
+                 'actual': book.get(symbol, {}).get('quantity', 0)}
+                for symbol in set(cached) | set(book)
+                if cached.get(symbol, {}).get('quantity', 0) != book.get(symbol, {}).get('quantity', 0)
+            ]
+            self._books[follower_id] = book
+            self.version += 1
+
+        self._sync_pnl_engine({follower_id: book})
+        if drifts:
+            logger.warning(f"Reconciled {follower_id}: {len(drifts)} cached positions drifted from broker")
+        return drifts
+
+    def _sync_pnl_engine(self, books: Dict[str, Dict[str, Dict]]):
+        """Load full books into the P&L engine"""
+        if not self.pnl_engine:
+            return
+        for follower_id, book in books.items():
+            self.pnl_engine.clear_account(follower_id)
+            for symbol, position in book.items():
+                self.pnl_engine.set_position(follower_id, symbol, '', position['quantity'], position['avg_price'])
+
+    def get_book(self, follower_id: str) -> Dict[str, Dict]:
+        """Cached positions for one follower"""
+        with self._lock:
+            return {symbol: dict(position) for symbol, position in self._books.get(follower_id, {}).items()}
+
+    def get_books(self) -> Dict[str, Dict[str, Dict]]:
+        """Cached positions for every follower"""
+        with self._lock:
+            return {
+                follower_id: {symbol: dict(position) for symbol, position in book.items()}
+                for follower_id, book in self._books.items()
+            }
+
+    def get_quantity(self, follower_id: str, symbol: str) -> float:
+        with self._lock:
+            return self._books.get(follower_id, {}).get(symbol, {}).get('quantity', 0)
+
+    def total_quantity(self, symbol: str) -> float:
+        """Net quantity of a symbol across all followers"""
+        with self._lock:
+            return sum(book.get(symbol, {}).get('quantity', 0) for book in self._books.values())
+
+    def breakdown(self, symbol: str, master_quantity: float, followers: List[Dict]) -> List[Dict]:
+        """Expand a master position into every follower's expected vs actual quantity"""
+        rows = []
+        with self._lock:
+            for follower in followers:
+                position = self._books.get(follower['follower_id'], {}).get(symbol, {})
+                expected = master_quantity * follower.get('lot_multiplier', 1)
+                actual = position.get('quantity', 0)
+                rows.append({
+                    'follower_id': follower['follower_id'],
+                    'account_name': follower.get('account_name', follower['follower_id']),
+                    'lot_multiplier': follower.get('lot_multiplier', 1),
+                    'expected': expected,
+                    'actual': actual,
+                    'difference': actual - expected,
+                    'avg_price': position.get('avg_price', 0),
+                    'updated_at': position.get('updated_at'),
+                })
+        return rows
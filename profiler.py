@@ -0,0 +1,230 @@
+"""
+Trade Mirroring System - Profiler
+Opt-in timing of refresh callbacks, SQLite statements and broker HTTP calls,
+plus cProfile capture of the UI thread, with a dump for offline analysis
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import config
+from latency_metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Timing categories
+TIMER = 'timer'
+SQLITE = 'sqlite'
+HTTP = 'http'
+CATEGORIES = (TIMER, SQLITE, HTTP)
+
+# Last URL segments that name an action rather than an id
+_HTTP_ACTIONS = {'place', 'modify', 'cancel', 'authenticate'}
+
+
+def statement_key(sql: str) -> str:
+    """One-line form of a statement, used to group its timings"""
+    return re.sub(r'\s+', ' ', sql).strip()[:config.PROFILER_SQL_KEY_LENGTH]
+
+
+def endpoint_key(method: str, url: str, base_url: str = '') -> str:
+    """'GET orders' / 'POST orders/place': the endpoint below base_url without account and order ids"""
+    if base_url and url.startswith(base_url):
+        url = '/' + url[len(base_url):]
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    if not parts:
+        return method
+    endpoint = parts[0]
+    if len(parts) > 1 and parts[-1] in _HTTP_ACTIONS:
+        endpoint += '/' + parts[-1]
+    return f"{method} {endpoint}"
+
+
+class PerformanceProfiler:
+    """
+    Performance Profiler
+    Timings are only recorded while `enabled` is set (config.PROFILING_ENABLED
+    at startup, or the Performance tab); each is a histogram record, cheap
+    enough to leave on. cProfile capture covers the thread that started it,
+    which for the UI is where timers, table rebuilds and their SQLite/HTTP
+    calls run
+    """
+
+    def __init__(self):
+        self.enabled = config.PROFILING_ENABLED
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {category: {} for category in CATEGORIES}
+        self._lock = threading.Lock()
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._cprofile_stats: Optional[pstats.Stats] = None
+        self.started_at = datetime.now()
+
+    def record(self, category: str, name: str, duration_ns: int):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms[category].get(name)
+            if histogram is None:
+                histogram = self._histograms[category][name] = LatencyHistogram()
+            histogram.record(duration_ns)
+
+    @contextmanager
+    def span(self, category: str, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(category, name, time.perf_counter_ns() - start)
+
+    def summary(self, category: str) -> Dict[str, Dict]:
+        """Per-name count, mean/p50/p95/p99/max ms and total ms, slowest total first"""
+        with self._lock:
+            rows = {name: dict(histogram.summary(), total_ms=histogram.total_ns / 1e6)
+                    for name, histogram in self._histograms[category].items()}
+        return dict(sorted(rows.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {category: {} for category in CATEGORIES}
+            self.started_at = datetime.now()
+
+    # ---- cProfile ----------------------------------------------------------------
+
+    @property
+    def cprofile_running(self) -> bool:
+        return self._cprofile is not None
+
+    @property
+    def has_cprofile_stats(self) -> bool:
+        return self._cprofile_stats is not None
+
+    def start_cprofile(self):
+        """Start deterministic profiling of the calling thread"""
+        if self._cprofile:
+            return
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+        logger.info("✓ cProfile capture started")
+
+    def stop_cprofile(self) -> Optional[pstats.Stats]:
+        """Stop capture; the stats are kept for cprofile_report() and dump()"""
+        if not self._cprofile:
+            return self._cprofile_stats
+        self._cprofile.disable()
+        self._cprofile_stats = pstats.Stats(self._cprofile)
+        self._cprofile = None
+        logger.info("✓ cProfile capture stopped")
+        return self._cprofile_stats
+
+    def cprofile_report(self, limit: int = None, sort: str = 'cumulative') -> str:
+        """Top functions of the last capture as pstats text"""
+        if not self._cprofile_stats:
+            return ""
+        stream = io.StringIO()
+        self._cprofile_stats.stream = stream
+        self._cprofile_stats.sort_stats(sort).print_stats(limit or config.PROFILER_REPORT_LINES)
+        return stream.getvalue()
+
+    # ---- export --------------------------------------------------------------------
+
+    def snapshot(self, refresh_stats: Dict = None) -> Dict:
+        data = {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'taken_at': datetime.now().isoformat(timespec='seconds'),
+            'enabled': self.enabled,
+        }
+        for category in CATEGORIES:
+            data[category] = self.summary(category)
+        if refresh_stats is not None:
+            data['refresh_tasks'] = refresh_stats
+        return data
+
+    def dump(self, filename: str, refresh_stats: Dict = None) -> bool:
+        """
+        Write timings as JSON; the last cProfile capture goes next to it as
+        <name>.prof (pstats / snakeviz) and <name>.txt
+        """
+        try:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            with open(filename, 'w') as f:
+                json.dump(self.snapshot(refresh_stats), f, indent=2)
+            if self._cprofile_stats:
+                base = os.path.splitext(filename)[0]
+                self._cprofile_stats.dump_stats(base + '.prof')
+                with open(base + '.txt', 'w') as f:
+                    f.write(self.cprofile_report())
+            logger.info(f"✓ Profile written to {filename}")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing profile: {str(e)}")
+            return False
+
+    # ---- instrumentation hooks --------------------------------------------------
+
+    def http_hook(self, base_url: str = ''):
+        """requests response hook timing each call from sending the request to the response headers"""
+        def hook(response, *args, **kwargs):
+            if self.enabled:
+                self.record(HTTP, endpoint_key(response.request.method, response.request.url, base_url),
+                            int(response.elapsed.total_seconds() * 1e9))
+            return response
+        return hook
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor recording execute and fetch time per statement"""
+
+    _key = None
+
+    def execute(self, sql, parameters=()):
+        self._key = statement_key(sql)
+        with _profiler.span(SQLITE, self._key):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._key = statement_key(sql)
+        with _profiler.span(SQLITE, self._key):
+            return super().executemany(sql, seq_of_parameters)
+
+    def fetchone(self):
+        with _profiler.span(SQLITE, f"{self._key} [fetch]"):
+            return super().fetchone()
+
+    def fetchmany(self, *args, **kwargs):
+        with _profiler.span(SQLITE, f"{self._key} [fetch]"):
+            return super().fetchmany(*args, **kwargs)
+
+    def fetchall(self):
+        with _profiler.span(SQLITE, f"{self._key} [fetch]"):
+            return super().fetchall()
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection handing out ProfiledCursor (also used by conn.execute/executemany)"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+
+def connection_factory():
+    """sqlite3.connect factory: timed connections while profiling is enabled"""
+    return ProfiledConnection if _profiler.enabled else sqlite3.Connection
+
+
+_profiler = PerformanceProfiler()
+
+
+def get_profiler() -> PerformanceProfiler:
+    """Process-wide profiler shared by the scheduler, database, API client and Performance tab"""
+    return _profiler
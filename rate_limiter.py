@@ -0,0 +1,69 @@
+"""
+Trade Mirroring System - Rate Limiter Module
+Token bucket used to keep concurrent broker calls within API rate limits
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket rate limiter
+    Allows short bursts up to `burst` calls, refilled at `rate` calls per second
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Block until a token is available
+        Returns: bool - False if timeout expired before a token was available
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+
+class AccountRateLimiter:
+    """
+    Per-account rate limiter
+    Broker order limits apply per trading account, so each account gets its own bucket
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.burst = burst
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, account_id: str, timeout: float = None) -> bool:
+        """Block until the account's bucket has a token"""
+        limiter = self._limiters.get(account_id)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(account_id, RateLimiter(self.rate, self.burst))
+        return limiter.acquire(timeout)
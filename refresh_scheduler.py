@@ -0,0 +1,175 @@
+"""
+Trade Mirroring System - Refresh Scheduler
+One UI-thread timer driving every periodic view refresh
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+
+import config
+from profiler import TIMER, get_profiler
+from utils import is_market_open
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTask:
+    """A periodic refresh callback and its scheduling state"""
+
+    def __init__(self, name: str, callback: Callable, interval: float, widget=None,
+                 market_hours_only: bool = True):
+        self.name = name
+        self.callback = callback
+        self.base_interval = interval
+        self.min_interval = interval * config.REFRESH_SPEEDUP_FACTOR
+        self.max_interval = interval * config.REFRESH_MAX_BACKOFF
+        self.interval = interval
+        self.widget = widget
+        self.market_hours_only = market_hours_only
+        self.paused = False
+        self.hidden = False
+        self.last_check: Optional[float] = None  # last run or skipped run
+        self.runs = 0
+        self.skipped_hidden = 0
+        self.skipped_closed = 0
+        self.run_seconds = 0.0
+        self.created = time.monotonic()
+
+    def adapt(self, changed):
+        """Shorten the interval while the callback reports changes, back off while it reports none"""
+        if changed is True:
+            self.interval = self.min_interval
+        elif changed is False:
+            self.interval = min(self.interval * config.REFRESH_BACKOFF_FACTOR, self.max_interval)
+
+    def stats(self, now: float) -> Dict:
+        baseline = (now - self.created) / self.base_interval
+        avg_ms = self.run_seconds * 1000 / self.runs if self.runs else 0
+        saved = baseline - self.runs  # negative when speed-ups cost more than back-offs saved
+        return {
+            'runs': self.runs,
+            'baseline_runs': int(baseline),
+            'saved_runs': int(saved),
+            'saved_ms': saved * avg_ms,
+            'skipped_hidden': self.skipped_hidden,
+            'skipped_closed': self.skipped_closed,
+            'interval': self.interval,
+            'avg_ms': avg_ms,
+        }
+
+
+class RefreshScheduler(QObject):
+    """
+    Refresh Scheduler
+    Replaces per-widget fixed QTimers: a task runs only when its widget is
+    visible and (for market-bound tasks) the market is open, except that each
+    task runs once so views are never empty. Callbacks may return True/False
+    to report whether their data changed, which shortens or backs off their
+    interval. Work saved is measured against running every task at its
+    configured interval
+    """
+
+    def __init__(self, parent=None, tick_ms: int = None):
+        super().__init__(parent)
+        self.tasks: Dict[str, RefreshTask] = {}
+        self.profiler = get_profiler()
+        self._market_open = is_market_open()
+        self._market_checked = time.monotonic()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.tick)
+        self._timer.start(tick_ms or config.REFRESH_TICK_MS)
+
+    def add_task(self, name: str, callback: Callable, interval: float, widget=None,
+                 market_hours_only: bool = True) -> RefreshTask:
+        """Register a refresh; interval in seconds, widget gates it on visibility"""
+        task = RefreshTask(name, callback, interval, widget, market_hours_only)
+        self.tasks[name] = task
+        return task
+
+    def remove_task(self, name: str):
+        self.tasks.pop(name, None)
+
+    def pause(self, *names: str):
+        for name in names:
+            if name in self.tasks:
+                self.tasks[name].paused = True
+
+    def resume(self, *names: str):
+        for name in names:
+            if name in self.tasks:
+                self.tasks[name].paused = False
+
+    def run_now(self, name: str):
+        """Run a task immediately regardless of visibility or market hours"""
+        task = self.tasks.get(name)
+        if task:
+            self._run(task, time.monotonic())
+
+    def market_open(self, now: float) -> bool:
+        if now - self._market_checked >= 30:
+            self._market_open = is_market_open()
+            self._market_checked = now
+        return self._market_open
+
+    def tick(self):
+        now = time.monotonic()
+        for task in list(self.tasks.values()):
+            if task.paused:
+                continue
+            due = task.last_check is None or now - task.last_check >= task.interval
+
+            if task.widget is not None and not task.widget.isVisible():
+                task.hidden = True
+                if due:
+                    task.skipped_hidden += 1
+                    task.last_check = now
+                continue
+            if task.hidden:
+                # Tab just became visible: bring it up to date at once
+                task.hidden = False
+                self._run(task, now)
+                continue
+
+            if not due:
+                continue
+            if task.market_hours_only and task.runs and not self.market_open(now):
+                task.skipped_closed += 1
+                task.last_check = now
+                continue
+            self._run(task, now)
+
+    def _run(self, task: RefreshTask, now: float):
+        start = time.perf_counter()
+        try:
+            changed = task.callback()
+        except Exception as e:
+            logger.error(f"Error in refresh task {task.name}: {str(e)}")
+            changed = None
+        elapsed = time.perf_counter() - start
+        task.run_seconds += elapsed
+        task.runs += 1
+        self.profiler.record(TIMER, f"{task.name} ({getattr(task.callback, '__name__', 'callback')})",
+                             int(elapsed * 1e9))
+        task.last_check = now
+        task.adapt(changed)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-task runs, skips, current interval and work saved vs fixed timers"""
+        now = time.monotonic()
+        return {name: task.stats(now) for name, task in self.tasks.items()}
+
+    def saved_work(self) -> Dict:
+        """Totals across all tasks"""
+        stats = self.stats().values()
+        runs = sum(s['runs'] for s in stats)
+        baseline = sum(s['baseline_runs'] for s in stats)
+        return {
+            'runs': runs,
+            'baseline_runs': baseline,
+            'saved_runs': sum(s['saved_runs'] for s in stats),
+            'saved_ms': sum(s['saved_ms'] for s in stats),
+            'saved_pct': (1 - runs / baseline) * 100 if baseline else 0,
+        }
@@ -0,0 +1,167 @@
+"""
+Trade Mirroring System - Report Exporter
+Streams trades out of SQLite in fixed-size chunks into CSV or Parquet
+"""
+
+import csv
+import logging
+import os
+import sqlite3
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], bool]
+
+
+class TradeReportExporter:
+    """
+    Trade Report Exporter
+    Reads rows with fetchmany() so memory stays constant regardless of how
+    much history is exported; the hot DB and (optionally) archived months are
+    exported in chronological order
+    """
+
+    def __init__(self, db_manager, chunk_size: int = None):
+        self.db = db_manager
+        self.chunk_size = chunk_size or config.EXPORT_CHUNK_SIZE
+
+    def _sources(self, start: str = None, end: str = None, include_archived: bool = False) -> List[str]:
+        sources = []
+        if include_archived:
+            sources.extend(self.db.get_archive_files(start[:7] if start else None, end[:7] if end else None))
+        sources.append(self.db.db_path)
+        return sources
+
+    @staticmethod
+    def _where(master_account_id: str = None, start: str = None, end: str = None) -> Tuple[str, tuple]:
+        clauses, params = [], []
+        if master_account_id:
+            clauses.append('master_account_id = ?')
+            params.append(master_account_id)
+        if start:
+            clauses.append('entry_time >= ?')
+            params.append(start)
+        if end:
+            clauses.append('entry_time < ?')
+            params.append(end)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), tuple(params)
+
+    def count_trades(self, master_account_id: str = None, start: str = None, end: str = None,
+                     include_archived: bool = False) -> int:
+        """Number of rows an export will write (for progress reporting)"""
+        where, params = self._where(master_account_id, start, end)
+        total = 0
+        for path in self._sources(start, end, include_archived):
+            conn = sqlite3.connect(path)
+            try:
+                total += conn.execute(f"SELECT COUNT(*) FROM trades {where}", params).fetchone()[0]
+            except sqlite3.OperationalError:
+                pass
+            finally:
+                conn.close()
+        return total
+
+    def export_columns(self) -> List[str]:
+        """Columns an export writes: those of the hot trades table"""
+        conn = sqlite3.connect(self.db.db_path)
+        try:
+            return [column[0] for column in conn.execute("SELECT * FROM trades LIMIT 0").description]
+        finally:
+            conn.close()
+
+    def iter_chunks(self, master_account_id: str = None, start: str = None, end: str = None,
+                    include_archived: bool = False) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """Yield (column_names, rows) chunks of at most chunk_size rows"""
+        where, params = self._where(master_account_id, start, end)
+        columns = self.export_columns()
+        for path in self._sources(start, end, include_archived):
+            conn = sqlite3.connect(path)
+            try:
+                source_columns = {row[1] for row in conn.execute("PRAGMA table_info(trades)")}
+                if not source_columns:
+                    continue
+                select = ', '.join(c if c in source_columns else f"NULL AS {c}" for c in columns)
+                cursor = conn.execute(f"SELECT {select} FROM trades {where} ORDER BY entry_time", params)
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    yield columns, rows
+            finally:
+                conn.close()
+
+    def export_csv(self, filename: str, master_account_id: str = None, start: str = None, end: str = None,
+                   include_archived: bool = False, progress_callback: Optional[ProgressCallback] = None) -> int:
+        """
+        Write trades to CSV incrementally
+        progress_callback(done, total) may return False to cancel
+        Returns: rows written
+        """
+        total = self.count_trades(master_account_id, start, end, include_archived)
+        written = 0
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+        with open(filename, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            # Header first, so an export matching no trades still has one
+            writer.writerow(self.export_columns())
+            for _, rows in self.iter_chunks(master_account_id, start, end, include_archived):
+                writer.writerows(rows)
+                written += len(rows)
+                if progress_callback and progress_callback(written, total) is False:
+                    logger.warning(f"Export cancelled after {written} rows")
+                    break
+
+        logger.info(f"✓ Exported {written} trades to {filename}")
+        return written
+
+    def export_parquet(self, filename: str, master_account_id: str = None, start: str = None, end: str = None,
+                       include_archived: bool = False, progress_callback: Optional[ProgressCallback] = None,
+                       compression: str = 'zstd') -> int:
+        """
+        Write trades to Parquet, one compressed row group per chunk (requires pyarrow)
+        Returns: rows written
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        total = self.count_trades(master_account_id, start, end, include_archived)
+        written = 0
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+        # Schema first, so an export matching no trades is still a readable file
+        schema = pa.schema([(name, self._arrow_type(pa, name)) for name in self.export_columns()])
+        writer = pq.ParquetWriter(filename, schema, compression=compression)
+        try:
+            for columns, rows in self.iter_chunks(master_account_id, start, end, include_archived):
+                data = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+                writer.write_table(pa.Table.from_pydict(data, schema=writer.schema))
+                written += len(rows)
+                if progress_callback and progress_callback(written, total) is False:
+                    logger.warning(f"Export cancelled after {written} rows")
+                    break
+        finally:
+            writer.close()
+
+        logger.info(f"✓ Exported {written} trades to {filename}")
+        return written
+
+    @staticmethod
+    def _arrow_type(pa, column: str):
+        if column == 'id':
+            return pa.int64()
+        if column in ('quantity', 'price', 'fill_percentage', 'filled_quantity', 'pnl'):
+            return pa.float64()
+        return pa.string()
+
+    def export(self, filename: str, **kwargs) -> int:
+        """Export by file extension (.parquet or .csv)"""
+        if filename.lower().endswith('.parquet'):
+            return self.export_parquet(filename, **kwargs)
+        return self.export_csv(filename, **kwargs)
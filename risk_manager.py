@@ -2,6 +2,8 @@ from typing import Dict, List
 import logging
 from datetime import datetime, timedelta
 
+from event_bus import RiskBlocked
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,8 +13,9 @@ class RiskManager:
     Handles daily loss limits, exposure caps, and lot multipliers
     """
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, event_bus=None):
         self.db = db_manager
+        self.event_bus = event_bus
         self.daily_loss_limits = {}
         self.exposure_tracking = {}
         self.interventions = {}
@@ -31,6 +34,13 @@ class RiskManager:
             logger.error(f"Error setting daily loss limit: {str(e)}")
             return False
 
+    def set_daily_loss_limits(self, limits: Dict[str, float]):
+        """Set daily loss limits for many followers at once: {follower_id: limit}"""
+        now = datetime.now()
+        for follower_id, limit in limits.items():
+            self.daily_loss_limits[follower_id] = {'limit': limit, 'current_loss': 0, 'reset_time': now}
+        logger.info(f"✓ Daily loss limits set for {len(limits)} accounts")
+
     def set_max_exposure(self, follower_id: str, symbol: str, max_exposure: float) -> bool:
         """Set max exposure per symbol (in INR)"""
         try:
@@ -47,6 +57,13 @@ class RiskManager:
             logger.error(f"Error setting max exposure: {str(e)}")
             return False
 
+    def _log_action(self, follower_id: str, action: str, symbol: str = None, reason: str = None):
+        """Publish a RiskBlocked event when an event bus is attached, otherwise write trade_logs directly"""
+        if self.event_bus:
+            self.event_bus.publish(RiskBlocked(follower_id, action, reason or '', symbol))
+        else:
+            self.db.log_trade_action(follower_id, action, symbol=symbol, reason=reason)
+
     def check_daily_loss_limit(self, follower_id: str, current_loss: float) -> tuple[bool, str]:
         """
         Check if daily loss limit is exceeded
@@ -56,19 +73,14 @@ class RiskManager:
             return True, "No limit set"
 
         limit_info = self.daily_loss_limits[follower_id]
-        
-        # Reset if new day
-        if datetime.now().date() > limit_info['reset_time'].date():
-            limit_info['current_loss'] = 0
-            limit_info['reset_time'] = datetime.now()
 
         if abs(current_loss) >= limit_info['limit']:
-            self.db.log_trade_action(
-                follower_id, 
+            self._log_action(
+                follower_id,
                 'LIMIT_EXCEEDED',
                 reason=f"Daily loss limit exceeded: ₹{current_loss}"
             )
-            logger.warning(f"⚠ Daily loss limit exceeded for {follower_id}")
+            logger.warning("⚠ Daily loss limit exceeded for %s", follower_id)
             return False, f"Daily loss limit exceeded: ₹{current_loss} / ₹{limit_info['limit']}"
         
         return True, "Within limit"
@@ -84,18 +96,33 @@ class RiskManager:
         exposure_info = self.exposure_tracking[follower_id][symbol]
         
         if position_value >= exposure_info['max']:
-            self.db.log_trade_action(
+            self._log_action(
                 follower_id,
                 'EXPOSURE_LIMIT_EXCEEDED',
                 symbol=symbol,
                 reason=f"Max exposure exceeded for {symbol}"
             )
-            logger.warning(f"⚠ Exposure limit exceeded for {symbol}")
+            logger.warning("⚠ Exposure limit exceeded for %s", symbol)
             return False, f"Exposure limit exceeded: ₹{position_value} / ₹{exposure_info['max']}"
 
         exposure_info['current'] = position_value
         return True, "Within limit"
 
+    def reset_daily_limits(self):
+        """Zero accumulated daily losses (run by the session scheduler at start of day)"""
+        now = datetime.now()
+        for limit_info in self.daily_loss_limits.values():
+            limit_info['current_loss'] = 0
+            limit_info['reset_time'] = now
+        logger.info(f"✓ Daily loss limits reset for {len(self.daily_loss_limits)} accounts")
+
+    def reset_exposures(self):
+        """Zero tracked symbol exposures (run by the session scheduler at start of day)"""
+        for symbols in self.exposure_tracking.values():
+            for exposure_info in symbols.values():
+                exposure_info['current'] = 0
+        logger.info(f"✓ Exposure tracking reset for {len(self.exposure_tracking)} accounts")
+
     def calculate_adjusted_quantity(self, follower_id: str, master_quantity: float, 
                                    lot_multiplier: float, account_cap: float = None) -> float:
         """
@@ -117,7 +144,7 @@ class RiskManager:
             # Ensure minimum quantity
             adjusted_qty = max(adjusted_qty, 1)
             
-            logger.info(f"✓ Adjusted quantity: {master_quantity} → {adjusted_qty} (multiplier: {lot_multiplier})")
+            logger.debug("✓ Adjusted quantity: %s → %s (multiplier: %s)", master_quantity, adjusted_qty, lot_multiplier)
             return adjusted_qty
         except Exception as e:
             logger.error(f"Error calculating adjusted quantity: {str(e)}")
@@ -143,7 +170,7 @@ class RiskManager:
         # Check per-account cap
         if account_cap and position_value > account_cap:
             msg = f"Position exceeds account cap: ₹{position_value} / ₹{account_cap}"
-            self.db.log_trade_action(follower_id, 'CAP_EXCEEDED', symbol=symbol, reason=msg)
+            self._log_action(follower_id, 'CAP_EXCEEDED', symbol=symbol, reason=msg)
             return False, msg
 
         return True, "Trade validation passed"
@@ -164,7 +191,7 @@ class RiskManager:
             }
             
             self.interventions[follower_id].append(intervention)
-            self.db.log_trade_action(follower_id, intervention_type, symbol=symbol, reason=reason)
+            self._log_action(follower_id, intervention_type, symbol=symbol, reason=reason)
             
             logger.info(f"✓ Intervention logged: {intervention_type} - {reason}")
             return True
@@ -0,0 +1,103 @@
+"""
+Trade Mirroring System - Serialization
+JSON encoding/decoding for broker API traffic: orjson when it is installed,
+the standard library json module otherwise
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Type
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj: Any):
+    """Non-JSON types seen in order payloads: models and numpy scalars"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonSerializer:
+    """Stdlib json; dumps returns compact UTF-8 bytes, loads accepts bytes or str"""
+
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def decode_models(self, data, key: str, model_cls) -> List:
+        """
+        Parse a list response and keep only the model fields of each item
+        ({"orders": [...]} → [Order, ...]); the parsed payload is dropped right away
+        """
+        from_api = model_cls.from_api
+        return [from_api(item) for item in self.loads(data).get(key) or []]
+
+
+class OrjsonSerializer(JsonSerializer):
+    """orjson (raises ImportError when not installed)"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        # Models go through _default like with stdlib json, so unset (None) fields are left out
+        self._options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj, default=_default, option=self._options)
+
+    def loads(self, data):
+        return self._loads(data)
+
+
+SERIALIZERS: Dict[str, Type[JsonSerializer]] = {
+    'orjson': OrjsonSerializer,
+    'json': JsonSerializer,
+}
+
+_serializer = None
+
+
+def register_serializer(name: str, serializer_cls: Type[JsonSerializer]):
+    """Make another backend selectable through config.JSON_BACKEND / set_serializer"""
+    SERIALIZERS[name] = serializer_cls
+
+
+def set_serializer(name: str = None) -> JsonSerializer:
+    """
+    Select the process-wide serializer
+    name: a SERIALIZERS key, or "auto" for the first one that imports
+    (defaults to config.JSON_BACKEND)
+    """
+    global _serializer
+    name = name or config.JSON_BACKEND
+    if name != 'auto' and name not in SERIALIZERS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+
+    candidates = list(SERIALIZERS) if name == 'auto' else [name, 'json']
+    for candidate in candidates:
+        try:
+            _serializer = SERIALIZERS[candidate]()
+            break
+        except ImportError:
+            if name != 'auto':
+                logger.warning(f"JSON backend '{name}' is not installed, using stdlib json")
+    logger.info(f"✓ JSON serializer: {_serializer.name}")
+    return _serializer
+
+
+def get_serializer() -> JsonSerializer:
+    """Process-wide serializer, selected on first use"""
+    return _serializer or set_serializer()
+
@@ -0,0 +1,118 @@
+"""
+Trade Mirroring System - Session Scheduler
+Runs start-of-day and end-of-day jobs on exchange session boundaries
+"""
+
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+import config
+from utils import get_session_bounds, is_trading_day, next_trading_day
+
+logger = logging.getLogger(__name__)
+
+
+def roll_logs():
+    """Roll over every rotating file handler of the root logger (including queue listener targets)"""
+    for handler in logging.getLogger().handlers:
+        listener = getattr(handler, 'listener', None)
+        for target in (listener.handlers if listener else (handler,)):
+            if hasattr(target, 'doRollover'):
+                target.acquire()
+                try:
+                    target.doRollover()
+                finally:
+                    target.release()
+
+
+class SessionScheduler:
+    """
+    Session Scheduler
+    Fires registered jobs once per trading day: start-of-day jobs shortly
+    before market open (or immediately when started mid-session) and
+    end-of-day jobs after market close; weekends and MARKET_HOLIDAYS are
+    skipped so per-trade checks never need to compare dates themselves
+    """
+
+    def __init__(self, pre_open_minutes: int = None, check_interval: float = None):
+        self.pre_open = timedelta(minutes=pre_open_minutes if pre_open_minutes is not None
+                                  else config.SESSION_PRE_OPEN_MINUTES)
+        self.check_interval = check_interval or config.SESSION_CHECK_INTERVAL
+        self.start_of_day_jobs: List[Tuple[str, Callable[[], None]]] = []
+        self.end_of_day_jobs: List[Tuple[str, Callable[[], None]]] = []
+        self.last_start_date: Optional[date] = None
+        self.last_end_date: Optional[date] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_start_of_day_job(self, name: str, job: Callable[[], None]):
+        """Register a job run once before each trading session"""
+        self.start_of_day_jobs.append((name, job))
+
+    def add_end_of_day_job(self, name: str, job: Callable[[], None]):
+        """Register a job run once after each trading session closes"""
+        self.end_of_day_jobs.append((name, job))
+
+    def tick(self, now: datetime = None) -> List[str]:
+        """
+        Run any session jobs that are due
+        Returns: names of the jobs that ran
+        """
+        now = now or datetime.now()
+        today = now.date()
+        if not is_trading_day(today):
+            return []
+
+        market_open, market_close = get_session_bounds(today)
+        ran = []
+        if self.last_start_date != today and market_open - self.pre_open <= now < market_close:
+            ran.extend(self._run_jobs('start-of-day', self.start_of_day_jobs))
+            self.last_start_date = today
+        if self.last_end_date != today and now >= market_close and self.last_start_date == today:
+            ran.extend(self._run_jobs('end-of-day', self.end_of_day_jobs))
+            self.last_end_date = today
+            logger.info(f"Next session: start-of-day jobs at {self.next_start_of_day(now):%Y-%m-%d %H:%M}")
+        return ran
+
+    def next_start_of_day(self, now: datetime = None) -> datetime:
+        """When start-of-day jobs are next due (now, if today's session has not had them yet)"""
+        now = now or datetime.now()
+        today = now.date()
+        if is_trading_day(today) and self.last_start_date != today and now < get_session_bounds(today)[1]:
+            day = today
+        else:
+            day = next_trading_day(today)
+        return max(now, get_session_bounds(day)[0] - self.pre_open)
+
+    @staticmethod
+    def _run_jobs(phase: str, jobs: List[Tuple[str, Callable[[], None]]]) -> List[str]:
+        ran = []
+        for name, job in jobs:
+            try:
+                job()
+                ran.append(name)
+            except Exception as e:
+                logger.error(f"Error in {phase} job {name}: {str(e)}")
+        logger.info(f"✓ Ran {len(ran)}/{len(jobs)} {phase} jobs")
+        return ran
+
+    def start(self):
+        """Start background scheduler thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SessionScheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"✓ Session scheduler started (next start-of-day jobs at {self.next_start_of_day():%Y-%m-%d %H:%M})")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self.check_interval)
@@ -0,0 +1,60 @@
+import pytest
+
+import config
+from paper_broker import PaperTradingClient
+from trade_mirroring_engine import TradeMirroringEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'LATENCY_METRICS_PATH', str(tmp_path / 'latency.json'))
+    client = PaperTradingClient(latency_ms=0, jitter_ms=0, reject_rate=0, partial_fill_rate=0, fill_delay=3600)
+    engine = TradeMirroringEngine('M', 'key', 'secret', db_path=str(tmp_path / 'trades.db'), api_client=client)
+    engine.db.add_master_account('M', 'Master', 'key', 'secret')
+    engine.db.add_follower_account('F1', 'Follower', 'A1', 'token', 1, 'M')
+    engine.order_slicer.set_freeze_quantity('NIFTY', 1800)
+    assert engine.initialize()
+    yield engine
+    engine.shutdown()
+
+
+def open_quantities(engine):
+    orders = engine.api_client.get_orders('A1')
+    return sorted(order['quantity'] for order in orders if order['status'] not in ('cancelled', 'rejected'))
+
+
+def mirror(engine, quantity):
+    assert engine.mirror_trade({'order_id': 'MO1', 'symbol': 'NIFTY', 'side': 'BUY', 'quantity': quantity,
+                                'price': 100, 'order_type': 'LIMIT'})
+
+
+def test_modify_increase_past_freeze_limit_places_extra_children(engine):
+    mirror(engine, 3000)
+    assert open_quantities(engine) == [1200, 1800]
+
+    assert engine.modify_trade('MO1', {'quantity': 6000})
+
+    assert open_quantities(engine) == [600, 1800, 1800, 1800]
+    assert len(engine.order_id_map.lookup('MO1')) == 4
+
+
+def test_modify_decrease_cancels_children_no_longer_needed(engine):
+    mirror(engine, 3000)
+
+    assert engine.modify_trade('MO1', {'quantity': 1000})
+
+    assert open_quantities(engine) == [1000]
+
+
+def test_modify_skips_filled_children(engine):
+    mirror(engine, 3000)
+    engine.event_bus.flush()
+    filled = engine.order_id_map.lookup('MO1')[0]
+    engine.db.update_trade_statuses([{'order_id': filled['follower_order_id'], 'status': 'filled',
+                                      'fill_percentage': 100, 'filled_quantity': filled['quantity']}])
+
+    assert engine.modify_trade('MO1', {'quantity': 2000})
+
+    modified = [child for child in engine.order_id_map.lookup('MO1')
+                if child['follower_order_id'] != filled['follower_order_id']]
+    assert [child['quantity'] for child in modified] == [200]
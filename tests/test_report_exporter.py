@@ -0,0 +1,37 @@
+import csv
+
+from database import DatabaseManager
+from report_exporter import TradeReportExporter
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_empty_export_writes_header(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'trades.db'))
+    exporter = TradeReportExporter(db)
+    path = tmp_path / 'empty.csv'
+
+    assert exporter.export_csv(str(path), master_account_id='NONE') == 0
+
+    assert read_csv(path) == [exporter.export_columns()]
+    assert 'entry_time' in exporter.export_columns()
+
+
+def test_export_writes_every_chunk_under_one_header(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'trades.db'))
+    db.add_master_account('M', 'Master', 'key', 'secret')
+    db.add_follower_account('F1', 'Follower', 'A1', 'token', 1, 'M')
+    db.record_trades([{'master_account_id': 'M', 'follower_account_id': 'F1', 'symbol': 'NIFTY', 'side': 'BUY',
+                       'quantity': i + 1, 'price': 100, 'order_type': 'MARKET', 'order_id': f'C{i}'}
+                      for i in range(5)])
+    exporter = TradeReportExporter(db, chunk_size=2)
+    path = tmp_path / 'trades.csv'
+
+    assert exporter.export_csv(str(path), master_account_id='M') == 5
+
+    rows = read_csv(path)
+    assert rows[0] == exporter.export_columns()
+    assert len(rows) == 6
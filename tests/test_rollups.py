@@ -0,0 +1,51 @@
+import sqlite3
+
+from database import DatabaseManager
+
+
+def record(db, order_id, quantity, price=100):
+    assert db.record_trades([{'master_account_id': 'M', 'follower_account_id': 'F1', 'symbol': 'NIFTY',
+                              'side': 'BUY', 'quantity': quantity, 'price': price, 'order_type': 'LIMIT',
+                              'order_id': order_id, 'master_order_id': 'MO1'}])
+
+
+def exposure(db):
+    return db.get_daily_stats('M')['F1']['exposure']
+
+
+def rebuilt_exposure(db):
+    conn = sqlite3.connect(db.db_path)
+    db._rebuild_rollups(conn.cursor())
+    conn.commit()
+    conn.close()
+    return exposure(db)
+
+
+def test_modified_quantity_moves_exposure(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'trades.db'))
+    db.add_master_account('M', 'Master', 'key', 'secret')
+    db.add_follower_account('F1', 'Follower', 'A1', 'token', 1, 'M')
+    record(db, 'C1', 10)
+    record(db, 'C2', 5)
+    assert exposure(db) == 1500
+
+    assert db.update_follower_order_quantity('C1', 25)
+    assert exposure(db) == 3000
+
+    assert db.update_follower_order_quantity('C2', 2)
+    assert exposure(db) == 2700
+    assert rebuilt_exposure(db) == 2700
+
+
+def test_cancelled_order_quantity_change_leaves_exposure(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'trades.db'))
+    db.add_master_account('M', 'Master', 'key', 'secret')
+    db.add_follower_account('F1', 'Follower', 'A1', 'token', 1, 'M')
+    record(db, 'C1', 10)
+    assert db.update_trade_statuses([{'order_id': 'C1', 'status': 'cancelled', 'fill_percentage': 40,
+                                      'filled_quantity': 4}])
+    assert exposure(db) == 400
+
+    assert db.update_follower_order_quantity('C1', 20)
+    assert exposure(db) == 400
+    assert rebuilt_exposure(db) == 400
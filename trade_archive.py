@@ -0,0 +1,147 @@
+"""
+Trade Mirroring System - Trade History Archival
+Moves closed trades and old logs into per-month archive databases
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import config
+from utils import is_market_open
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = ('filled', 'rejected', 'cancelled')
+
+# table -> (timestamp column, extra WHERE clause restricting rows that may be archived)
+ARCHIVED_TABLES = {
+    'trades': ('entry_time', f"AND status IN ({', '.join(repr(s) for s in CLOSED_STATUSES)})"),
+    'trade_logs': ('timestamp', ''),
+}
+
+
+class TradeArchiver:
+    """
+    Trade Archiver
+    Keeps the hot database small by rolling closed trades and logs older than
+    the retention window into data/archive/trades_YYYY_MM.db; DatabaseManager
+    reads these back when a query asks for archived ranges
+    """
+
+    def __init__(self, db_manager, retention_days: int = None, check_interval: float = None):
+        self.db = db_manager
+        self.retention_days = retention_days or config.TRADE_RETENTION_DAYS
+        self.check_interval = check_interval or config.ARCHIVE_CHECK_INTERVAL
+        self.last_run_date = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def archive_path(self, month: str) -> str:
+        """Archive database path for a 'YYYY-MM' month"""
+        return os.path.join(self.db.archive_dir, f"trades_{month.replace('-', '_')}.db")
+
+    def archive_old_rows(self, now: datetime = None) -> Dict[str, int]:
+        """
+        Move rows older than the retention window into monthly archives
+        Each month is copied and deleted in one transaction
+        now: aware or naive local time; the cutoff is taken in UTC, like the stored timestamps
+        Returns: {table: rows archived}
+        """
+        now = now.astimezone(timezone.utc) if now else datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=self.retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+        moved = {table: 0 for table in ARCHIVED_TABLES}
+
+        os.makedirs(self.db.archive_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db.db_path, isolation_level=None)
+        try:
+            for month in self._months_to_archive(conn, cutoff):
+                conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path(month),))
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    for table, (time_column, condition) in ARCHIVED_TABLES.items():
+                        columns = self._ensure_archive_table(conn, table, time_column)
+                        where = f"{time_column} < ? AND strftime('%Y-%m', {time_column}) = ? {condition}"
+                        column_list = ', '.join(columns)
+                        cursor = conn.execute(
+                            f"INSERT INTO archive.{table} ({column_list}) SELECT {column_list} FROM main.{table} WHERE {where}",
+                            (cutoff, month)
+                        )
+                        moved[table] += cursor.rowcount
+                        conn.execute(f"DELETE FROM main.{table} WHERE {where}", (cutoff, month))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+                finally:
+                    conn.execute('DETACH DATABASE archive')
+
+            if any(moved.values()):
+                conn.execute('VACUUM')
+        finally:
+            conn.close()
+
+        logger.info(f"✓ Archived {moved['trades']} trades and {moved['trade_logs']} logs older than {cutoff} UTC")
+        return moved
+
+    def _months_to_archive(self, conn, cutoff: str) -> List[str]:
+        months = set()
+        for table, (time_column, condition) in ARCHIVED_TABLES.items():
+            rows = conn.execute(
+                f"SELECT DISTINCT strftime('%Y-%m', {time_column}) FROM {table} WHERE {time_column} < ? {condition}",
+                (cutoff,)
+            ).fetchall()
+            months.update(row[0] for row in rows if row[0])
+        return sorted(months)
+
+    @staticmethod
+    def _ensure_archive_table(conn, table: str, time_column: str) -> List[str]:
+        """Create the archive table or add columns added to the hot schema since; returns shared columns"""
+        hot_columns = [(row[1], row[2]) for row in conn.execute(f"PRAGMA main.table_info({table})")]
+        archive_columns = {row[1] for row in conn.execute(f"PRAGMA archive.table_info({table})")}
+
+        if not archive_columns:
+            definition = ', '.join(f"{name} {col_type}" for name, col_type in hot_columns)
+            conn.execute(f"CREATE TABLE archive.{table} ({definition})")
+            conn.execute(f"CREATE INDEX archive.idx_{table}_time ON {table}({time_column})")
+        else:
+            for name, col_type in hot_columns:
+                if name not in archive_columns:
+                    conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {name} {col_type}")
+
+        return [name for name, _ in hot_columns]
+
+    def run_if_due(self, now: datetime = None) -> bool:
+        """Archive once per day, only while the market is closed (local time)"""
+        now = now or datetime.now()
+        if is_market_open() or self.last_run_date == now.date():
+            return False
+        try:
+            self.archive_old_rows(now)
+            self.last_run_date = now.date()
+            return True
+        except Exception as e:
+            logger.error(f"Error archiving trade history: {str(e)}")
+            return False
+
+    def start(self):
+        """Start background archival thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TradeArchiver", daemon=True)
+        self._thread.start()
+        logger.info("✓ Trade archiver started")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_if_due()
+            self._stop.wait(self.check_interval)
@@ -3,12 +3,29 @@ AliceBlue API Integration Examples
 Demonstrates how to use the AliceBlue API client
 """
 
-from aliceblue_api import AliceBlueAPIClient
+import os
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from paper_broker import create_api_client
 from database import DatabaseManager
 from risk_manager import RiskManager
+from order_id_map import OrderIdMap
+from order_slicer import OrderSlicer
+from order_tracker import OrderStatusTracker, TERMINAL_STATUSES
+from pnl_engine import PortfolioPnLEngine
+from position_book import FollowerPositionService
+from rate_limiter import AccountRateLimiter
+from latency_metrics import get_latency_recorder
+from event_bus import EventBus, OrderPlaced, PositionDrift, RiskBlocked
+from order_journal import JournalWriteError, OrderJournal
+from account_snapshot import AccountSnapshotService, POSITIONS
+from session_scheduler import SessionScheduler
+from models import Order
+import config
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -18,13 +35,41 @@ class TradeMirroringEngine:
     Handles automatic mirroring of master trades to follower accounts
     """
 
-    def __init__(self, master_account_id: str, api_key: str, api_secret: str):
+    def __init__(self, master_account_id: str, api_key: str, api_secret: str,
+                 db_path: str = None, base_url: str = None, api_client=None, vault=None, session_scheduler=None):
         self.master_account_id = master_account_id
-        self.api_client = AliceBlueAPIClient(api_key, api_secret)
-        self.db = DatabaseManager()
-        self.risk_mgr = RiskManager(self.db)
+        self.db = DatabaseManager(db_path or config.DATABASE_PATH, vault=vault)
+        if api_client is None and not (api_key and api_secret):
+            # Credentials saved with the master account (decrypted once through the vault)
+            api_key, api_secret = self.db.get_master_credentials(master_account_id) or ('', '')
+        self.api_client = api_client or create_api_client(api_key, api_secret, base_url)
+        # Intents are journaled before each send so a crash mid fan-out can be reconciled
+        self.journal = OrderJournal(os.path.join(os.path.dirname(self.db.db_path) or '.', config.ORDER_JOURNAL_FILE))
+        # Order path publishes; persistence and tracking consume in batches on the bus thread
+        self.event_bus = EventBus()
+        self.risk_mgr = RiskManager(self.db, self.event_bus)
+        self.order_slicer = OrderSlicer()
+        self.rate_limiter = AccountRateLimiter(config.MAX_ORDERS_PER_SECOND)
+        self.order_executor = ThreadPoolExecutor(max_workers=config.ORDER_WORKER_THREADS)
+        # One concurrent broker sweep of every account, shared by sync_positions and the order tracker
+        self.snapshots = AccountSnapshotService(self.api_client, self.db, master_account_id)
+        self.order_tracker = OrderStatusTracker(self.api_client, self.db, master_account_id,
+                                                event_bus=self.event_bus, snapshots=self.snapshots)
+        self.order_id_map = OrderIdMap(self.db)
+        self.pnl_engine = PortfolioPnLEngine()
+        self.position_service = FollowerPositionService(self.db, master_account_id, self.pnl_engine)
+        self.order_tracker.add_fill_listener(self.position_service.apply_fill)
+        self.latency = get_latency_recorder()
+        # Daily risk resets and end-of-day housekeeping (the app may share its own scheduler)
+        self.owns_session_scheduler = session_scheduler is None
+        self.session_scheduler = session_scheduler or SessionScheduler()
+        self._session_jobs_registered = False
         self.active_trades = {}
 
+        self.event_bus.subscribe(OrderPlaced, self._persist_orders, batch=True)
+        self.event_bus.subscribe(OrderPlaced, self._track_orders, batch=True)
+        self.event_bus.subscribe(RiskBlocked, self._persist_risk_events, batch=True)
+
     def initialize(self) -> bool:
         """Initialize and authenticate with AliceBlue"""
         logger.info("Initializing Trade Mirroring Engine...")
@@ -34,33 +79,104 @@ class TradeMirroringEngine:
             logger.error("Failed to authenticate with AliceBlue API")
             return False
 
+        self.load_follower_sessions()
+        self.event_bus.start()
+        self.journal.start()
+
+        # Record broker orders a previous run sent but never persisted, then rebuild follower books and resume fill tracking for orders left open by a previous session
+        self.journal.recover(self.api_client, self.db)
+        self.position_service.load_from_trades()
+        self.order_tracker.load_open_orders()
+        self.order_tracker.start()
+        self.snapshots.start()
+        if not self._session_jobs_registered:
+            self.register_session_jobs(self.session_scheduler)
+            self._session_jobs_registered = True
+        if self.owns_session_scheduler:
+            self.session_scheduler.start()
+
         logger.info("✓ Engine initialized and authenticated")
         return True
 
+    def load_follower_sessions(self) -> int:
+        """Give every follower with a stored token its own pooled broker session; returns sessions opened"""
+        opened = 0
+        for follower in self.db.get_all_followers(self.master_account_id):
+            token = self.db.get_follower_token(follower.follower_id)
+            if token and follower.account_id:
+                self.api_client.set_account_token(follower.account_id, token)
+                opened += 1
+        logger.info(f"✓ {opened} follower broker sessions loaded")
+        return opened
+
+    def register_session_jobs(self, scheduler):
+        """Register start-of-day / end-of-day jobs with a SessionScheduler"""
+        scheduler.add_start_of_day_job('reset_risk_limits', self.risk_mgr.reset_daily_limits)
+        scheduler.add_start_of_day_job('reset_exposures', self.risk_mgr.reset_exposures)
+        scheduler.add_start_of_day_job('load_follower_sessions', self.load_follower_sessions)
+        scheduler.add_start_of_day_job('load_follower_books', self.position_service.load_from_trades)
+        scheduler.add_start_of_day_job('load_open_orders', self.order_tracker.load_open_orders)
+        scheduler.add_end_of_day_job('snapshot_positions', self.snapshot_positions)
+        scheduler.add_end_of_day_job('export_latency_metrics', self.export_latency_metrics)
+        scheduler.add_end_of_day_job('compact_order_journal', self.journal.compact)
+
+    def snapshot_positions(self) -> bool:
+        """Persist today's closing follower books"""
+        return self.db.save_position_snapshot(self.master_account_id, self.position_service.get_books())
+
+    def export_latency_metrics(self):
+        """Write the session's latency metrics and start a fresh window"""
+        self.latency.export_json(config.LATENCY_METRICS_PATH)
+        self.latency.reset()
+
+    def shutdown(self):
+        """Stop background workers"""
+        if self.owns_session_scheduler:
+            self.session_scheduler.stop()
+        self.order_executor.shutdown(wait=True)
+        self.event_bus.stop()
+        self.journal.stop()
+        self.order_tracker.stop()
+        self.snapshots.stop()
+        self.api_client.logout()
+        if self.db.vault:
+            self.db.vault.logout(self.master_account_id)
+            for follower in self.db.get_all_followers(self.master_account_id):
+                self.db.vault.logout(follower.follower_id)
+        self.latency.export_json(config.LATENCY_METRICS_PATH)
+        logger.info("✓ Engine stopped")
+
     def mirror_trade(self, trade_order: dict) -> bool:
         """
         Mirror a single trade from master to all followers
         
         trade_order example:
         {
+            'order_id': 'MASTER-ORDER-1',  # master order id, used by modify/cancel
             'symbol': 'RELIANCE',
             'side': 'BUY',
             'quantity': 100,
             'price': 2500,
-            'order_type': 'MARKET'
+            'order_type': 'MARKET',
+            'received_ns': 123456789  # optional time.perf_counter_ns() of the master fill
         }
         """
+        mirror_start = trade_order.get('received_ns') or time.perf_counter_ns()
+        last_ack_ns = None
         try:
             symbol = trade_order['symbol']
             side = trade_order['side']
             quantity = trade_order['quantity']
             price = trade_order.get('price', 0)
             order_type = trade_order['order_type']
+            master_order_id = trade_order.get('order_id')
 
-            logger.info(f"Mirroring trade: {symbol} {side} {quantity} @ {order_type}")
+            logger.info("Mirroring trade: %s %s %s @ %s", symbol, side, quantity, order_type,
+                        extra={'event': 'mirror_trade', 'master_order_id': master_order_id})
 
             # Get all follower accounts
-            followers = self.db.get_all_followers(self.master_account_id)
+            with self.latency.span('follower_load'):
+                followers = self.db.get_all_followers(self.master_account_id)
             
             if not followers:
                 logger.warning("No follower accounts configured")
@@ -70,10 +186,12 @@ class TradeMirroringEngine:
 
             # Mirror to each follower
             for follower in followers:
-                follower_id = follower['follower_id']
-                lot_multiplier = follower['lot_multiplier']
+                follower_id = follower.follower_id
+                lot_multiplier = follower.lot_multiplier
+                account_id = follower.account_id
 
                 # Calculate adjusted quantity
+                risk_start = time.perf_counter_ns()
                 adjusted_qty = self.risk_mgr.calculate_adjusted_quantity(
                     follower_id,
                     quantity,
@@ -87,9 +205,11 @@ class TradeMirroringEngine:
                     adjusted_qty,
                     price
                 )
+                self.latency.record('risk_check', time.perf_counter_ns() - risk_start, follower_id)
 
                 if not is_valid:
-                    logger.warning(f"Trade validation failed for {follower['account_name']}: {validation_msg}")
+                    logger.warning("Trade validation failed for %s: %s", follower.account_name, validation_msg,
+                                   extra={'event': 'risk_blocked', 'follower_id': follower_id})
                     self.risk_mgr.log_intervention(
                         follower_id,
                         'VALIDATION_FAILED',
@@ -99,41 +219,57 @@ class TradeMirroringEngine:
                     )
                     continue
 
-                # Prepare order for follower
-                follower_order = {
-                    'symbol': symbol,
-                    'side': side,
-                    'quantity': int(adjusted_qty),
-                    'price': price,
-                    'order_type': order_type,
-                    'account_id': follower['account_id']
-                }
-
-                # Place order on follower account
-                order_result = self.api_client.place_order(
-                    follower['account_id'],
-                    follower_order
-                )
+                build_start = time.perf_counter_ns()
 
-                if order_result:
-                    order_id = order_result.get('order_id')
-                    
-                    # Record trade in database
-                    self.db.record_trade(
-                        self.master_account_id,
-                        follower_id,
-                        symbol,
-                        side,
-                        adjusted_qty,
-                        price,
-                        order_type,
-                        order_id
-                    )
+                # Slice orders above the exchange freeze quantity
+                child_quantities = self.order_slicer.slice_quantity(symbol, int(adjusted_qty))
+                parent_order_id = (self.order_slicer.new_parent_order_id(follower_id)
+                                   if len(child_quantities) > 1 else None)
 
-                    logger.info(f"✓ Trade mirrored to {follower['account_name']}: {adjusted_qty} @ {order_type}")
+                # Prepare order for follower
+                follower_order = Order(
+                    account_id=account_id,
+                    symbol=symbol,
+                    side=side,
+                    quantity=int(adjusted_qty),
+                    price=price,
+                    order_type=order_type
+                )
+                self.latency.record('order_build', time.perf_counter_ns() - build_start, follower_id)
+
+                # Journal the intents durably, then place order(s) on follower account
+                try:
+                    intent_ids = self._journal_intents(follower_id, follower_order, child_quantities,
+                                                       master_order_id, parent_order_id)
+                except JournalWriteError as e:
+                    logger.error("Order not sent to %s: intents could not be journaled (%s)",
+                                 follower.account_name, e,
+                                 extra={'event': 'journal_failed', 'follower_id': follower_id})
+                    continue
+                child_results = self._place_child_orders(account_id, follower_order,
+                                                         child_quantities, intent_ids)
+                last_ack_ns = time.perf_counter_ns()
+                self.latency.record('follower_ack', last_ack_ns - mirror_start, follower_id)
+
+                post_ack_start = time.perf_counter_ns()
+                placed_qty = self._record_placed(follower_id, lot_multiplier, follower_order, child_results,
+                                                 intent_ids, master_order_id, parent_order_id)
+                self.latency.record('post_ack', time.perf_counter_ns() - post_ack_start, follower_id)
+
+                if placed_qty:
+                    logger.info("✓ Trade mirrored to %s: %s @ %s", follower.account_name, placed_qty, order_type,
+                                extra={'event': 'follower_order', 'follower_id': follower_id})
                     success_count += 1
+                    if placed_qty < int(adjusted_qty):
+                        logger.warning(
+                            "Partial slice placement for %s: %s / %s",
+                            follower.account_name, placed_qty, int(adjusted_qty)
+                        )
                 else:
-                    logger.error(f"Failed to place order for {follower['account_name']}")
+                    logger.error("Failed to place order for %s", follower.account_name)
+
+            if last_ack_ns is not None:
+                self.latency.record('end_to_end', last_ack_ns - mirror_start)
 
             return success_count > 0
 
@@ -141,10 +277,134 @@ class TradeMirroringEngine:
             logger.error(f"Error mirroring trade: {str(e)}")
             return False
 
+    def _journal_intents(self, follower_id: str, follower_order: Order, child_quantities: List[int],
+                         master_order_id: str, parent_order_id: str = None) -> List[str]:
+        """Journal one intent per child order; raises JournalWriteError if they are not durable"""
+        return self.journal.record_intents([
+            {**follower_order, 'quantity': child_qty, 'master_account_id': self.master_account_id,
+             'master_order_id': master_order_id, 'parent_order_id': parent_order_id,
+             'follower_id': follower_id}
+            for child_qty in child_quantities
+        ])
+
+    def _record_placed(self, follower_id: str, lot_multiplier: float, follower_order: Order,
+                       child_results: List[Tuple[int, Optional[Order]]], intent_ids: List[str],
+                       master_order_id: str, parent_order_id: str = None) -> int:
+        """
+        Close or ack the intents of sent child orders, publish the placed ones
+        and map them to the master order
+        Returns: total quantity placed
+        """
+        placed_qty = 0
+        for (child_qty, order_result), intent_id in zip(child_results, intent_ids):
+            if not order_result:
+                self.journal.close([intent_id], 'send_failed')
+                continue
+            self.journal.ack(intent_id, order_result.get('order_id'))
+
+            # Persisted and tracked asynchronously by bus subscribers
+            self.event_bus.publish(OrderPlaced(
+                self.master_account_id,
+                follower_id,
+                follower_order.account_id,
+                follower_order.symbol,
+                follower_order.side,
+                child_qty,
+                follower_order.price,
+                follower_order.order_type,
+                order_result.get('order_id'),
+                parent_order_id,
+                master_order_id,
+                intent_id
+            ))
+            self.order_id_map.register(
+                master_order_id,
+                follower_id,
+                follower_order.account_id,
+                order_result.get('order_id'),
+                child_qty,
+                lot_multiplier,
+                symbol=follower_order.symbol,
+                side=follower_order.side,
+                price=follower_order.price,
+                order_type=follower_order.order_type,
+                parent_order_id=parent_order_id
+            )
+            placed_qty += child_qty
+        return placed_qty
+
+    def _persist_orders(self, events: List[OrderPlaced]):
+        """Bus subscriber: write placed orders to the trades table in one transaction, then close their intents"""
+        db_start = time.perf_counter_ns()
+        persisted = self.db.record_trades([
+            {
+                'master_account_id': e.master_account_id,
+                'follower_account_id': e.follower_id,
+                'symbol': e.symbol,
+                'side': e.side,
+                'quantity': e.quantity,
+                'price': e.price,
+                'order_type': e.order_type,
+                'order_id': e.order_id,
+                'parent_order_id': e.parent_order_id,
+                'master_order_id': e.master_order_id,
+            }
+            for e in events
+        ])
+        self.latency.record('db_record', time.perf_counter_ns() - db_start)
+        if persisted:
+            self.journal.close([e.intent_id for e in events])
+
+    def _track_orders(self, events: List[OrderPlaced]):
+        """Bus subscriber: start status polling once orders are persisted"""
+        for e in events:
+            self.order_tracker.track_order(e.order_id, e.account_id, e.quantity, e.follower_id,
+                                           e.symbol, e.side, e.price)
+
+    def _persist_risk_events(self, events: List[RiskBlocked]):
+        """Bus subscriber: write risk interventions to trade_logs in one transaction"""
+        self.db.log_trade_actions([
+            {'account_id': e.follower_id, 'action': e.action, 'symbol': e.symbol,
+             'quantity': e.quantity, 'price': e.price, 'reason': e.reason}
+            for e in events
+        ])
+
+    def _place_child_orders(self, account_id: str, follower_order: Order, child_quantities: List[int],
+                            order_tags: List[str] = None) -> List[Tuple[int, Optional[Order]]]:
+        """
+        Place child orders concurrently, throttled by the broker rate limit
+        order_tags: per-child order_tag sent to the broker (journal intent IDs)
+        Returns: list of (child_quantity, order_result) in slice order
+        """
+        def place(child_qty: int, order_tag: str = None) -> Optional[Order]:
+            self.rate_limiter.acquire(account_id)
+            return self.api_client.place_order(account_id, follower_order.copy(quantity=child_qty, order_tag=order_tag))
+
+        order_tags = order_tags or [None] * len(child_quantities)
+        if len(child_quantities) == 1:
+            return [(child_quantities[0], place(child_quantities[0], order_tags[0]))]
+
+        futures = [self.order_executor.submit(place, child_qty, order_tag)
+                   for child_qty, order_tag in zip(child_quantities, order_tags)]
+        results = []
+        for child_qty, future in zip(child_quantities, futures):
+            try:
+                results.append((child_qty, future.result()))
+            except Exception as e:
+                logger.error(f"Error placing child order: {str(e)}")
+                results.append((child_qty, None))
+        return results
+
     def modify_trade(self, order_id: str, modifications: dict) -> bool:
         """
         Modify existing trades
-        
+
+        order_id is the master order id; the change is fanned out concurrently
+        to every live follower child order mirroring it. A quantity change is
+        scaled per follower and the quantity still outstanding is re-sliced
+        within the freeze limit: live children are modified, extra slices are
+        placed as new children and children no longer needed are cancelled
+
         modifications example:
         {
             'quantity': 150,
@@ -154,21 +414,73 @@ class TradeMirroringEngine:
         try:
             logger.info(f"Modifying trade {order_id}: {modifications}")
 
-            # Get trade details
-            # In real implementation, fetch from database
+            children_by_follower = self.order_id_map.group_by_follower(order_id, refresh=True)
+            if not children_by_follower:
+                logger.warning(f"No follower orders found for master order {order_id}")
+                return False
 
-            # Modify in follower accounts
-            followers = self.db.get_all_followers(self.master_account_id)
-            
-            success_count = 0
-            for follower in followers:
-                result = self.api_client.modify_order(
-                    follower['account_id'],
-                    order_id,
-                    modifications
+            modify_requests = []
+            cancel_requests = []
+            new_children = []
+            for follower_id, children in children_by_follower.items():
+                live = [child for child in children if child['status'] not in TERMINAL_STATUSES]
+                if not live:
+                    continue
+                if 'quantity' not in modifications:
+                    modify_requests.extend((child, dict(modifications)) for child in live)
+                    continue
+
+                adjusted_qty = self.risk_mgr.calculate_adjusted_quantity(
+                    follower_id,
+                    modifications['quantity'],
+                    children[0]['lot_multiplier']
+                )
+                # Fills on any child (done or live) count towards the follower's new total
+                filled_qty = sum(self._child_filled_quantity(child) for child in children)
+                child_quantities, extra_quantities = self.order_slicer.reslice(
+                    children[0]['symbol'],
+                    int(adjusted_qty) - filled_qty,
+                    [self._child_filled_quantity(child) for child in live]
                 )
+
+                for child, child_qty in zip(live, child_quantities):
+                    if not child_qty:
+                        cancel_requests.append(child)
+                    elif child_qty != child['quantity'] or set(modifications) - {'quantity'}:
+                        modify_requests.append((child, {**modifications, 'quantity': child_qty}))
+                if extra_quantities:
+                    new_children.append((follower_id, children[0], extra_quantities))
+
+            def modify(request) -> bool:
+                child, child_mods = request
+                self.rate_limiter.acquire(child['account_id'])
+                result = self.api_client.modify_order(child['account_id'], child['follower_order_id'], child_mods)
+                if result and 'quantity' in child_mods:
+                    self.order_id_map.update_quantity(order_id, child['follower_order_id'], child_mods['quantity'])
+                return bool(result)
+
+            def cancel(child) -> bool:
+                self.rate_limiter.acquire(child['account_id'])
+                return self.api_client.cancel_order(child['account_id'], child['follower_order_id'])
+
+            results = list(self.order_executor.map(modify, modify_requests))
+            cancel_results = list(self.order_executor.map(cancel, cancel_requests))
+            for child, result in zip(cancel_requests, cancel_results):
                 if result:
-                    success_count += 1
+                    self.db.log_trade_action(
+                        child['follower_id'],
+                        'ORDER_CANCELLED',
+                        reason=f"Cancelled order {child['follower_order_id']} no longer needed after modify of master {order_id}"
+                    )
+            results.extend(cancel_results)
+
+            # Extra slices are placed from this thread, their child orders go to the worker pool
+            for follower_id, template, extra_quantities in new_children:
+                results.append(self._place_extra_children(order_id, follower_id, template,
+                                                          extra_quantities, modifications) > 0)
+
+            success_count = sum(results)
+            logger.info(f"✓ Modified {success_count} / {len(results)} follower order changes for {order_id}")
 
             return success_count > 0
 
@@ -176,25 +488,68 @@ class TradeMirroringEngine:
             logger.error(f"Error modifying trade: {str(e)}")
             return False
 
+    @staticmethod
+    def _child_filled_quantity(child: Dict) -> int:
+        """Filled quantity of a mapped child order (a filled child without a fill count is filled in full)"""
+        filled_qty = child.get('filled_quantity') or 0
+        if not filled_qty and child['status'] == 'filled':
+            filled_qty = child['quantity']
+        return int(filled_qty)
+
+    def _place_extra_children(self, master_order_id: str, follower_id: str, template: Dict,
+                              child_quantities: List[int], modifications: dict) -> int:
+        """
+        Place the child orders a quantity increase needs beyond the live ones
+        template: an existing child of the follower the new orders copy
+        Returns: total quantity placed
+        """
+        follower_order = Order(
+            account_id=template['account_id'],
+            symbol=template['symbol'],
+            side=template['side'],
+            quantity=sum(child_quantities),
+            price=modifications.get('price', template['price']),
+            order_type=modifications.get('order_type', template['order_type'])
+        )
+        parent_order_id = template.get('parent_order_id') or self.order_slicer.new_parent_order_id(follower_id)
+        try:
+            intent_ids = self._journal_intents(follower_id, follower_order, child_quantities,
+                                               master_order_id, parent_order_id)
+        except JournalWriteError as e:
+            logger.error("Extra child orders not sent to %s: intents could not be journaled (%s)",
+                         follower_id, e, extra={'event': 'journal_failed', 'follower_id': follower_id})
+            return 0
+        child_results = self._place_child_orders(follower_order.account_id, follower_order,
+                                                 child_quantities, intent_ids)
+        placed_qty = self._record_placed(follower_id, template['lot_multiplier'], follower_order,
+                                         child_results, intent_ids, master_order_id, parent_order_id)
+        logger.info(f"✓ Placed {placed_qty} / {sum(child_quantities)} extra for {follower_id} on modify of {master_order_id}")
+        return placed_qty
+
     def cancel_trade(self, order_id: str) -> bool:
-        """Cancel a trade across all followers"""
+        """Cancel a trade across all followers (order_id is the master order id)"""
         try:
             logger.info(f"Cancelling trade {order_id}")
 
-            followers = self.db.get_all_followers(self.master_account_id)
+            children = self.order_id_map.lookup(order_id)
+            if not children:
+                logger.warning(f"No follower orders found for master order {order_id}")
+                return False
+
+            def cancel(child) -> bool:
+                self.rate_limiter.acquire(child['account_id'])
+                return self.api_client.cancel_order(child['account_id'], child['follower_order_id'])
+
+            results = list(self.order_executor.map(cancel, children))
             success_count = 0
 
-            for follower in followers:
-                result = self.api_client.cancel_order(
-                    follower['account_id'],
-                    order_id
-                )
+            for child, result in zip(children, results):
                 if result:
                     success_count += 1
                     self.db.log_trade_action(
-                        follower['follower_id'],
+                        child['follower_id'],
                         'ORDER_CANCELLED',
-                        reason=f"Cancelled order {order_id}"
+                        reason=f"Cancelled order {child['follower_order_id']} (master {order_id})"
                     )
 
             return success_count > 0
@@ -204,23 +559,17 @@ class TradeMirroringEngine:
             return False
 
     def get_master_positions(self) -> list:
-        """Get all open positions in master account"""
+        """Get all open positions in master account (from the latest account snapshot)"""
         try:
-            positions = self.api_client.get_positions(self.master_account_id)
-            return positions
+            return self.snapshots.latest().positions_for(self.master_account_id)
         except Exception as e:
             logger.error(f"Error getting positions: {str(e)}")
             return []
 
     def get_follower_positions(self, follower_id: str) -> list:
-        """Get positions for specific follower"""
+        """Get positions for specific follower (from the latest account snapshot)"""
         try:
-            follower = self.db.get_all_followers(self.master_account_id)
-            for f in follower:
-                if f['follower_id'] == follower_id:
-                    positions = self.api_client.get_positions(f['account_id'])
-                    return positions
-            return []
+            return self.snapshots.latest().follower_positions(follower_id)
         except Exception as e:
             logger.error(f"Error getting follower positions: {str(e)}")
             return []
@@ -230,11 +579,21 @@ class TradeMirroringEngine:
         try:
             logger.info("Syncing positions...")
 
-            master_positions = self.get_master_positions()
+            # Master and follower books from the same sweep, so they are compared at one point in time
+            snapshot = self.snapshots.latest()
+            master_positions = snapshot.positions_for(self.master_account_id)
+            as_of = datetime.fromtimestamp(snapshot.taken_at)
             followers = self.db.get_all_followers(self.master_account_id)
 
             for follower in followers:
-                follower_positions = self.api_client.get_positions(follower['account_id'])
+                if not snapshot.has(follower['account_id'], POSITIONS):
+                    logger.warning(f"Skipping position sync for {follower['account_name']}: no fresh snapshot")
+                    continue
+                follower_positions = snapshot.positions_for(follower['account_id'])
+                drifts = self.position_service.reconcile(follower['follower_id'], follower_positions, as_of)
+                for drift in drifts:
+                    self.event_bus.publish(PositionDrift(follower['follower_id'], drift['symbol'],
+                                                         drift['cached'], drift['actual']))
                 
                 # Compare and reconcile
                 for master_pos in master_positions:
@@ -267,34 +626,29 @@ class TradeMirroringEngine:
             logger.error(f"Error syncing positions: {str(e)}")
             return False
 
-    def get_performance_report(self, follower_id: str) -> dict:
-        """Get performance report for follower"""
+    def get_performance_report(self, follower_id: str, start: str = None, end: str = None,
+                               include_archived: bool = False) -> dict:
+        """Get performance report for follower (optionally for an entry_time range)"""
+        reports = self.get_performance_reports(start, end, follower_id, include_archived)
+        return reports.get(follower_id, {
+            'follower_id': follower_id,
+            'total_trades': 0,
+            'winning_trades': 0,
+            'losing_trades': 0,
+            'total_pnl': 0,
+            'avg_pnl': 0,
+            'max_drawdown': 0,
+            'win_rate': 0,
+            'symbols': {},
+        })
+
+    def get_performance_reports(self, start: str = None, end: str = None, follower_id: str = None,
+                                include_archived: bool = False) -> Dict[str, dict]:
+        """Get performance reports for all followers, aggregated in one database pass"""
         try:
-            trades = self.db.get_recent_trades(follower_id, limit=100)
-            
-            total_pnl = 0
-            wins = 0
-            losses = 0
-            
-            for trade in trades:
-                pnl = trade.get('pnl', 0)
-                total_pnl += pnl
-                if pnl > 0:
-                    wins += 1
-                elif pnl < 0:
-                    losses += 1
-
-            report = {
-                'follower_id': follower_id,
-                'total_trades': len(trades),
-                'winning_trades': wins,
-                'losing_trades': losses,
-                'total_pnl': total_pnl,
-                'win_rate': (wins / len(trades) * 100) if trades else 0
-            }
-
-            return report
-
+            return self.db.get_performance_summary(
+                self.master_account_id, start, end, follower_id, include_archived
+            )
         except Exception as e:
             logger.error(f"Error generating report: {str(e)}")
             return {}
@@ -302,6 +656,9 @@ class TradeMirroringEngine:
 
 # Example Usage
 if __name__ == "__main__":
+    from logging_setup import setup_logging, shutdown_logging
+    setup_logging()
+
     # Initialize engine
     engine = TradeMirroringEngine(
         master_account_id="ALB123456",
@@ -329,3 +686,5 @@ if __name__ == "__main__":
             
             # Sync
             engine.sync_positions()
+
+    shutdown_logging()
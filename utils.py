@@ -4,11 +4,13 @@ Contains helper functions and utilities
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Dict, List, Tuple
 import csv
 import os
 
+import config
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,21 +83,41 @@ def get_trading_hours() -> Tuple[str, str]:
     return "09:15", "15:30"
 
 
+def is_trading_day(day: date = None) -> bool:
+    """Check if a date is an exchange trading day (weekday and not a listed holiday)"""
+    day = day or datetime.now().date()
+    # Check if weekday (0-4 = Monday-Friday)
+    if day.weekday() >= 5:  # Saturday or Sunday
+        return False
+    return day.isoformat() not in config.MARKET_HOLIDAYS
+
+
+def get_session_bounds(day: date = None) -> Tuple[datetime, datetime]:
+    """Get market open and close datetimes for a date"""
+    day = day or datetime.now().date()
+    open_str, close_str = get_trading_hours()
+    return (
+        datetime.combine(day, time.fromisoformat(open_str)),
+        datetime.combine(day, time.fromisoformat(close_str)),
+    )
+
+
+def next_trading_day(day: date = None) -> date:
+    """Get the first trading day after a date"""
+    day = (day or datetime.now().date()) + timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
 def is_market_open() -> bool:
     """Check if market is currently open"""
-    from datetime import datetime, time
-    
     now = datetime.now()
-    current_time = now.time()
-    
-    # Check if weekday (0-4 = Monday-Friday)
-    if now.weekday() >= 5:  # Saturday or Sunday
+    if not is_trading_day(now.date()):
         return False
-    
-    market_open = time(9, 15)
-    market_close = time(15, 30)
-    
-    return market_open <= current_time <= market_close
+
+    market_open, market_close = get_session_bounds(now.date())
+    return market_open <= now <= market_close
 
 
 def round_to_lot_size(quantity: float, lot_size: float = 1) -> int: